@@ -8,7 +8,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from sqlmodel import Session, select
 from app.core.database import engine
-from app.models.user_extended import Usuario
+from app.models.user_extended import Usuario, UsuarioCredenciales
 from app.core.security import get_password_hash
 import uuid
 from datetime import datetime
@@ -36,7 +36,7 @@ def add_gmail_admin():
             nombres="Admin",
             apellidos="Gmail",
             email="admin@gmail.com",
-            password_hash=get_password_hash("admin"),  # Same password as other admin
+            credenciales=UsuarioCredenciales(password_hash=get_password_hash("admin")),  # Same password as other admin
             activo=True,
             verificado=True,
             tipo_registro="app",
@@ -0,0 +1,52 @@
+"""store pagos amount as integer cents
+
+Revision ID: a3b4c5d6e7f8
+Revises: f2a3b4c5d6e7
+Create Date: 2026-10-17 01:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "a3b4c5d6e7f8"
+down_revision: Union[str, None] = "f2a3b4c5d6e7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "pagos" not in inspector.get_table_names():
+        return
+
+    cols = {c["name"] for c in inspector.get_columns("pagos")}
+    if "monto_centavos" not in cols:
+        op.add_column("pagos", sa.Column("monto_centavos", sa.BigInteger(), nullable=True))
+
+    op.execute("UPDATE pagos SET monto_centavos = ROUND(monto * 100) WHERE monto_centavos IS NULL")
+
+    with op.batch_alter_table("pagos") as batch:
+        batch.alter_column("monto_centavos", existing_type=sa.BigInteger(), nullable=False)
+        # DEPRECATED: se conserva durante la transición, ya no se escribe
+        batch.alter_column("monto", existing_type=sa.Numeric(10, 2), nullable=True)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "pagos" not in inspector.get_table_names():
+        return
+
+    cols = {c["name"] for c in inspector.get_columns("pagos")}
+    if "monto_centavos" not in cols:
+        return
+
+    op.execute("UPDATE pagos SET monto = monto_centavos / 100.0 WHERE monto IS NULL")
+    with op.batch_alter_table("pagos") as batch:
+        batch.alter_column("monto", existing_type=sa.Numeric(10, 2), nullable=False)
+    op.drop_column("pagos", "monto_centavos")
@@ -0,0 +1,41 @@
+"""partial unique index for wallet_txns idempotency keys
+
+Revision ID: a6b7c8d9e0f1
+Revises: f5a6b7c8d9e0
+Create Date: 2026-10-17 03:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "a6b7c8d9e0f1"
+down_revision: Union[str, None] = "f5a6b7c8d9e0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "wallet_txns" not in inspector.get_table_names():
+        return
+
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_wallet_txns_idem "
+        "ON wallet_txns (wallet_id, direction, idempotency_key) WHERE idempotency_key IS NOT NULL"
+    )
+    op.execute("DROP INDEX IF EXISTS ix_wallet_txns_idempotency_key")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "wallet_txns" not in inspector.get_table_names():
+        return
+
+    op.execute("CREATE INDEX IF NOT EXISTS ix_wallet_txns_idempotency_key ON wallet_txns (idempotency_key)")
+    op.execute("DROP INDEX IF EXISTS uq_wallet_txns_idem")
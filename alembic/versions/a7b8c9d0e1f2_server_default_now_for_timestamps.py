@@ -0,0 +1,52 @@
+"""server default now() for insert timestamps
+
+Revision ID: a7b8c9d0e1f2
+Revises: ab12cd34ef56, c2d3e4f5a6b7
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "a7b8c9d0e1f2"
+down_revision: Union[str, Sequence[str], None] = ("ab12cd34ef56", "c2d3e4f5a6b7")
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_COLUMNS = (
+    ("refresh_tokens", "issued_at"),
+    ("ventas", "fecha_hora"),
+    ("canjes", "fecha_canje"),
+    ("reglas_de_precio", "fecha_hora_inicio"),
+    ("reglas_de_precio", "creado_el"),
+)
+
+
+def _existing_columns(inspector):
+    tables = set(inspector.get_table_names())
+    for table, column in _COLUMNS:
+        if table not in tables:
+            continue
+        if column in {c["name"] for c in inspector.get_columns(table)}:
+            yield table, column
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    for table, column in _existing_columns(inspector):
+        op.alter_column(table, column, server_default=sa.text("now()"))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    for table, column in _existing_columns(inspector):
+        op.alter_column(table, column, server_default=None)
@@ -0,0 +1,54 @@
+"""server default now() for user and wallet timestamps
+
+Revision ID: a9b0c1d2e3f4
+Revises: f8a9b0c1d2e3
+Create Date: 2026-10-17 02:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "a9b0c1d2e3f4"
+down_revision: Union[str, None] = "f8a9b0c1d2e3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_COLUMNS = (
+    ("usuarios", "fecha_creacion"),
+    ("usuarios_roles", "fecha_asignacion"),
+    ("usuarios_niveles", "fecha_asignacion"),
+    ("usuarios_metodos_de_pago", "fecha_creacion"),
+    ("referidos", "fecha_registro"),
+    ("wallets", "created_at"),
+    ("wallet_txns", "created_at"),
+)
+
+
+def _existing_columns(inspector):
+    tables = set(inspector.get_table_names())
+    for table, column in _COLUMNS:
+        if table not in tables:
+            continue
+        if column in {c["name"] for c in inspector.get_columns(table)}:
+            yield table, column
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    for table, column in _existing_columns(inspector):
+        op.alter_column(table, column, server_default=sa.text("now()"))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    for table, column in _existing_columns(inspector):
+        op.alter_column(table, column, server_default=None)
@@ -0,0 +1,50 @@
+"""composite (wallet_id, created_at DESC) index on wallet_txns
+
+Revision ID: b0c1d2e3f4a5
+Revises: a9b0c1d2e3f4
+Create Date: 2026-10-17 02:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "b0c1d2e3f4a5"
+down_revision: Union[str, None] = "a9b0c1d2e3f4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (índice, columna) reemplazados por ix_wallet_txns_wallet_created
+_REPLACED = (
+    ("ix_wallet_txns_wallet_id", "wallet_id"),
+    ("ix_wallet_txns_created_at", "created_at"),
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "wallet_txns" not in set(inspector.get_table_names()):
+        return
+
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_wallet_txns_wallet_created "
+        "ON wallet_txns (wallet_id, created_at DESC)"
+    )
+    for index, _ in _REPLACED:
+        op.execute(f"DROP INDEX IF EXISTS {index}")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "wallet_txns" not in set(inspector.get_table_names()):
+        return
+
+    for index, column in _REPLACED:
+        op.execute(f"CREATE INDEX IF NOT EXISTS {index} ON wallet_txns ({column})")
+    op.execute("DROP INDEX IF EXISTS ix_wallet_txns_wallet_created")
@@ -0,0 +1,56 @@
+"""covering indexes on transacciones_puntos and pagos
+
+Revision ID: b4c5d6e7f8a9
+Revises: a3b4c5d6e7f8
+Create Date: 2026-10-17 01:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "b4c5d6e7f8a9"
+down_revision: Union[str, None] = "a3b4c5d6e7f8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if bind.dialect.name != "postgresql":
+        return
+
+    tables = set(inspector.get_table_names())
+    if "transacciones_puntos" in tables:
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS idx_transacciones_cover "
+            "ON transacciones_puntos (id_usuario, fecha DESC) INCLUDE (puntos_ganados, puntos_canjeados)"
+        )
+        # Mismo prefijo que el índice cubriente
+        op.execute("DROP INDEX IF EXISTS idx_transacciones_puntos_usuario_fecha")
+    if "pagos" in tables:
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS idx_pagos_cover "
+            "ON pagos (id_venta) INCLUDE (estado, monto_centavos, fecha_pago)"
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if bind.dialect.name != "postgresql":
+        return
+
+    tables = set(inspector.get_table_names())
+    if "pagos" in tables:
+        op.execute("DROP INDEX IF EXISTS idx_pagos_cover")
+    if "transacciones_puntos" in tables:
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS idx_transacciones_puntos_usuario_fecha "
+            "ON transacciones_puntos (id_usuario, fecha)"
+        )
+        op.execute("DROP INDEX IF EXISTS idx_transacciones_cover")
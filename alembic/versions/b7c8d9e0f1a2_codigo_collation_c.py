@@ -0,0 +1,46 @@
+"""collation C for usuarios.codigo_cliente and referidos.codigo
+
+Revision ID: b7c8d9e0f1a2
+Revises: a6b7c8d9e0f1
+Create Date: 2026-10-17 03:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "b7c8d9e0f1a2"
+down_revision: Union[str, None] = "a6b7c8d9e0f1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (tabla, columna): códigos ASCII generados por la app, solo se comparan por igualdad
+_COLUMNAS = (
+    ("usuarios", "codigo_cliente"),
+    ("referidos", "codigo"),
+)
+
+
+def _alter_collation(collation: str) -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    inspector = sa.inspect(bind)
+    tablas = set(inspector.get_table_names())
+    for tabla, columna in _COLUMNAS:
+        if tabla not in tablas:
+            continue
+        # Reescribe la columna y reconstruye sus índices (incluido el UNIQUE)
+        op.execute(f'ALTER TABLE {tabla} ALTER COLUMN {columna} TYPE varchar(20) COLLATE {collation}')
+
+
+def upgrade() -> None:
+    _alter_collation('"C"')
+
+
+def downgrade() -> None:
+    _alter_collation('"default"')
@@ -0,0 +1,64 @@
+"""store refresh token hash as raw bytes
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-17 00:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "b8c9d0e1f2a3"
+down_revision: Union[str, None] = "a7b8c9d0e1f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _refresh_token_columns(inspector):
+    if "refresh_tokens" not in inspector.get_table_names():
+        return {}
+    return {c["name"]: c for c in inspector.get_columns("refresh_tokens")}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    inspector = sa.inspect(bind)
+    columns = _refresh_token_columns(inspector)
+    if "token_hash" not in columns or isinstance(columns["token_hash"]["type"], sa.LargeBinary):
+        return
+
+    op.execute(
+        "ALTER TABLE refresh_tokens "
+        "ALTER COLUMN token_hash TYPE bytea USING decode(token_hash, 'hex'), "
+        "ALTER COLUMN replaced_by_token_hash TYPE bytea USING decode(replaced_by_token_hash, 'hex')"
+    )
+    op.create_check_constraint(
+        "ck_refresh_tokens_token_hash_len",
+        "refresh_tokens",
+        "length(token_hash) = 32",
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    inspector = sa.inspect(bind)
+    columns = _refresh_token_columns(inspector)
+    if "token_hash" not in columns or not isinstance(columns["token_hash"]["type"], sa.LargeBinary):
+        return
+
+    op.drop_constraint("ck_refresh_tokens_token_hash_len", "refresh_tokens", type_="check")
+    op.execute(
+        "ALTER TABLE refresh_tokens "
+        "ALTER COLUMN token_hash TYPE varchar(128) USING encode(token_hash, 'hex'), "
+        "ALTER COLUMN replaced_by_token_hash TYPE varchar(128) USING encode(replaced_by_token_hash, 'hex')"
+    )
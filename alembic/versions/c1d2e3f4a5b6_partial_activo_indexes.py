@@ -0,0 +1,50 @@
+"""partial activo indexes on usuarios and wallets
+
+Revision ID: c1d2e3f4a5b6
+Revises: b0c1d2e3f4a5
+Create Date: 2026-10-17 02:20:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "c1d2e3f4a5b6"
+down_revision: Union[str, None] = "b0c1d2e3f4a5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (tabla, índice parcial, columna, índice booleano reemplazado)
+_PARTIAL = (
+    ("usuarios", "ix_usuarios_activo_true", "id", "ix_usuarios_activo"),
+    ("wallets", "ix_wallets_activo_owner_user", "owner_user_id", "ix_wallets_activo"),
+    ("wallets", "ix_wallets_activo_owner_card", "owner_card_id", "ix_wallets_activo"),
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    for table, index, column, replaced in _PARTIAL:
+        if table not in tables:
+            continue
+        op.execute(f"CREATE INDEX IF NOT EXISTS {index} ON {table} ({column}) WHERE activo")
+        op.execute(f"DROP INDEX IF EXISTS {replaced}")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    for table, index, _, replaced in _PARTIAL:
+        if table not in tables:
+            continue
+        op.execute(f"CREATE INDEX IF NOT EXISTS {replaced} ON {table} (activo)")
+        op.execute(f"DROP INDEX IF EXISTS {index}")
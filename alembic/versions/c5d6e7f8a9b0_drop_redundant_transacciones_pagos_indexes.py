@@ -0,0 +1,57 @@
+"""drop redundant indexes on transacciones_puntos and pagos
+
+Revision ID: c5d6e7f8a9b0
+Revises: b4c5d6e7f8a9
+Create Date: 2026-10-17 01:20:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "c5d6e7f8a9b0"
+down_revision: Union[str, None] = "b4c5d6e7f8a9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (tabla, índice, columna) duplicados por otro índice o cubiertos por el prefijo de un compuesto
+_REDUNDANT = (
+    ("transacciones_puntos", "idx_transacciones_puntos_usuario", "id_usuario"),
+    ("transacciones_puntos", "ix_transacciones_puntos_id_usuario", "id_usuario"),
+    ("transacciones_puntos", "idx_transacciones_puntos_fecha", "fecha"),
+    ("pagos", "idx_pagos_venta", "id_venta"),
+    ("pagos", "ix_pagos_id_venta", "id_venta"),
+    ("pagos", "ix_pagos_id_metodo_pago", "id_metodo_pago"),
+    ("pagos", "ix_pagos_estado", "estado"),
+    ("pagos", "ix_pagos_fecha_pago", "fecha_pago"),
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # Los índices cubrientes que los reemplazan (b4c5d6e7f8a9) solo existen en PostgreSQL
+    if bind.dialect.name != "postgresql":
+        return
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    for table, index, _ in _REDUNDANT:
+        if table in tables:
+            op.execute(f"DROP INDEX IF EXISTS {index}")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    # Los índices cubrientes que los reemplazan (b4c5d6e7f8a9) solo existen en PostgreSQL
+    if bind.dialect.name != "postgresql":
+        return
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    for table, index, column in _REDUNDANT:
+        if table in tables:
+            op.execute(f"CREATE INDEX IF NOT EXISTS {index} ON {table} ({column})")
@@ -0,0 +1,52 @@
+"""index usuarios.registrado_por and make its FK ON DELETE SET NULL
+
+Revision ID: c8d9e0f1a2b3
+Revises: b7c8d9e0f1a2
+Create Date: 2026-10-17 03:20:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "c8d9e0f1a2b3"
+down_revision: Union[str, None] = "b7c8d9e0f1a2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_FK_NAME = "usuarios_registrado_por_fkey"
+
+
+def _recrear_fk(ondelete: Union[str, None]) -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    inspector = sa.inspect(bind)
+    for fk in inspector.get_foreign_keys("usuarios"):
+        if fk["constrained_columns"] == ["registrado_por"] and fk.get("name"):
+            op.drop_constraint(fk["name"], "usuarios", type_="foreignkey")
+    op.create_foreign_key(_FK_NAME, "usuarios", "usuarios", ["registrado_por"], ["id"], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "usuarios" not in inspector.get_table_names():
+        return
+
+    op.execute("CREATE INDEX IF NOT EXISTS ix_usuarios_registrado_por ON usuarios (registrado_por)")
+    _recrear_fk("SET NULL")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "usuarios" not in inspector.get_table_names():
+        return
+
+    _recrear_fk(None)
+    op.execute("DROP INDEX IF EXISTS ix_usuarios_registrado_por")
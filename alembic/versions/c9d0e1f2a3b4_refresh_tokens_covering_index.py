@@ -0,0 +1,56 @@
+"""refresh tokens covering index
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-17 00:20:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "c9d0e1f2a3b4"
+down_revision: Union[str, None] = "b8c9d0e1f2a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "refresh_tokens" not in inspector.get_table_names() or bind.dialect.name != "postgresql":
+        return
+
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_refresh_tokens_hash_covering "
+        "ON refresh_tokens (token_hash) INCLUDE (user_id, expires_at, revoked_at, jti)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_refresh_tokens_expires_at_active "
+        "ON refresh_tokens (expires_at) WHERE revoked_at IS NULL"
+    )
+    op.execute("ALTER TABLE refresh_tokens DROP CONSTRAINT IF EXISTS refresh_tokens_token_hash_key")
+    op.execute("DROP INDEX IF EXISTS ix_refresh_tokens_token_hash")
+    op.execute("DROP INDEX IF EXISTS ix_refresh_tokens_expires_at")
+    op.execute("DROP INDEX IF EXISTS ix_refresh_tokens_revoked_at")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "refresh_tokens" not in inspector.get_table_names() or bind.dialect.name != "postgresql":
+        return
+
+    op.execute("CREATE INDEX IF NOT EXISTS ix_refresh_tokens_revoked_at ON refresh_tokens (revoked_at)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_refresh_tokens_expires_at ON refresh_tokens (expires_at)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_refresh_tokens_token_hash ON refresh_tokens (token_hash)")
+    unique_names = {uc["name"] for uc in inspector.get_unique_constraints("refresh_tokens")}
+    if "refresh_tokens_token_hash_key" not in unique_names:
+        op.execute(
+            "ALTER TABLE refresh_tokens ADD CONSTRAINT refresh_tokens_token_hash_key UNIQUE (token_hash)"
+        )
+    op.execute("DROP INDEX IF EXISTS ix_refresh_tokens_expires_at_active")
+    op.execute("DROP INDEX IF EXISTS ix_refresh_tokens_hash_covering")
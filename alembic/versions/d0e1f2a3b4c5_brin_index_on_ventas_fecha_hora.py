@@ -0,0 +1,43 @@
+"""brin index on ventas fecha_hora
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-17 00:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "d0e1f2a3b4c5"
+down_revision: Union[str, None] = "c9d0e1f2a3b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "ventas" not in inspector.get_table_names() or bind.dialect.name != "postgresql":
+        return
+
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_ventas_fecha_hora_brin "
+        "ON ventas USING BRIN (fecha_hora) WITH (pages_per_range = 32)"
+    )
+    op.execute("DROP INDEX IF EXISTS idx_ventas_fecha_hora")
+    op.execute("DROP INDEX IF EXISTS ix_ventas_fecha_hora")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "ventas" not in inspector.get_table_names() or bind.dialect.name != "postgresql":
+        return
+
+    op.execute("CREATE INDEX IF NOT EXISTS ix_ventas_fecha_hora ON ventas (fecha_hora)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_ventas_fecha_hora ON ventas (fecha_hora)")
+    op.execute("DROP INDEX IF EXISTS idx_ventas_fecha_hora_brin")
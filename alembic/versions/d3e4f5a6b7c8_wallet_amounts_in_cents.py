@@ -0,0 +1,78 @@
+"""store wallet balances and ledger amounts as integer cents
+
+Revision ID: d3e4f5a6b7c8
+Revises: c1d2e3f4a5b6
+Create Date: 2026-10-17 02:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "d3e4f5a6b7c8"
+down_revision: Union[str, None] = "c1d2e3f4a5b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# tabla -> ((columna Numeric(12, 2), columna BIGINT en centavos), ...)
+_MONEY_COLUMNS = {
+    "wallets": (("balance", "balance_cents"),),
+    "wallet_txns": (
+        ("amount", "amount_cents"),
+        ("balance_before", "balance_before_cents"),
+        ("balance_after", "balance_after_cents"),
+    ),
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    for table, pairs in _MONEY_COLUMNS.items():
+        if table not in tables:
+            continue
+        cols = {c["name"] for c in inspector.get_columns(table)}
+        for old, new in pairs:
+            if new not in cols:
+                op.add_column(table, sa.Column(new, sa.BigInteger(), nullable=True))
+            if old in cols:
+                op.execute(f"UPDATE {table} SET {new} = ROUND({old} * 100) WHERE {new} IS NULL")
+
+        with op.batch_alter_table(table) as batch:
+            for old, new in pairs:
+                batch.alter_column(
+                    new,
+                    existing_type=sa.BigInteger(),
+                    nullable=False,
+                    server_default=sa.text("0") if table == "wallets" else None,
+                )
+                if old in cols:
+                    batch.drop_column(old)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    for table, pairs in _MONEY_COLUMNS.items():
+        if table not in tables:
+            continue
+        cols = {c["name"] for c in inspector.get_columns(table)}
+        for old, new in pairs:
+            if old not in cols:
+                op.add_column(table, sa.Column(old, sa.Numeric(12, 2), nullable=True))
+            if new in cols:
+                op.execute(f"UPDATE {table} SET {old} = {new} / 100.0 WHERE {old} IS NULL")
+
+        with op.batch_alter_table(table) as batch:
+            for old, new in pairs:
+                batch.alter_column(old, existing_type=sa.Numeric(12, 2), nullable=False)
+                if new in cols:
+                    batch.drop_column(new)
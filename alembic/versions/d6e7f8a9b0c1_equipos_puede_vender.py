@@ -0,0 +1,58 @@
+"""denormalize permite_ventas onto equipos.puede_vender
+
+Revision ID: d6e7f8a9b0c1
+Revises: c5d6e7f8a9b0
+Create Date: 2026-10-17 01:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "d6e7f8a9b0c1"
+down_revision: Union[str, None] = "c5d6e7f8a9b0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "equipos" not in inspector.get_table_names():
+        return
+
+    cols = {c["name"] for c in inspector.get_columns("equipos")}
+    if "puede_vender" not in cols:
+        op.add_column(
+            "equipos",
+            sa.Column("puede_vender", sa.Boolean(), nullable=False, server_default=sa.true()),
+        )
+
+    op.execute(
+        """
+        UPDATE equipos
+        SET puede_vender = COALESCE(
+            (SELECT t.permite_ventas FROM tipos_estado_equipo t WHERE t.id = equipos.id_estado_equipo),
+            false
+        )
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS equipos_disponibles "
+        "ON equipos (id_punto_de_venta) WHERE puede_vender AND activo"
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "equipos" not in inspector.get_table_names():
+        return
+
+    op.execute("DROP INDEX IF EXISTS equipos_disponibles")
+    cols = {c["name"] for c in inspector.get_columns("equipos")}
+    if "puede_vender" in cols:
+        op.drop_column("equipos", "puede_vender")
@@ -0,0 +1,70 @@
+"""move password_hash / password_salt to usuarios_credenciales
+
+Revision ID: d9e0f1a2b3c4
+Revises: c8d9e0f1a2b3
+Create Date: 2026-10-17 03:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "d9e0f1a2b3c4"
+down_revision: Union[str, None] = "c8d9e0f1a2b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "usuarios" not in inspector.get_table_names():
+        return
+
+    if "usuarios_credenciales" not in inspector.get_table_names():
+        op.create_table(
+            "usuarios_credenciales",
+            sa.Column("id_usuario", sa.Integer(), nullable=False),
+            sa.Column("password_hash", sa.String(), nullable=False),
+            sa.Column("password_salt", sa.String(), nullable=True),
+            sa.ForeignKeyConstraint(["id_usuario"], ["usuarios.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("id_usuario"),
+        )
+
+    cols = {c["name"] for c in inspector.get_columns("usuarios")}
+    if "password_hash" in cols:
+        bind.execute(
+            sa.text(
+                "INSERT INTO usuarios_credenciales (id_usuario, password_hash, password_salt) "
+                "SELECT id, password_hash, password_salt FROM usuarios WHERE password_hash IS NOT NULL"
+            )
+        )
+        op.drop_column("usuarios", "password_hash")
+    if "password_salt" in cols:
+        op.drop_column("usuarios", "password_salt")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "usuarios" not in inspector.get_table_names():
+        return
+
+    cols = {c["name"] for c in inspector.get_columns("usuarios")}
+    if "password_hash" not in cols:
+        op.add_column("usuarios", sa.Column("password_hash", sa.String(), nullable=True))
+    if "password_salt" not in cols:
+        op.add_column("usuarios", sa.Column("password_salt", sa.String(), nullable=True))
+
+    if "usuarios_credenciales" in inspector.get_table_names():
+        bind.execute(
+            sa.text(
+                "UPDATE usuarios SET "
+                "password_hash = (SELECT c.password_hash FROM usuarios_credenciales c WHERE c.id_usuario = usuarios.id), "
+                "password_salt = (SELECT c.password_salt FROM usuarios_credenciales c WHERE c.id_usuario = usuarios.id)"
+            )
+        )
+        op.drop_table("usuarios_credenciales")
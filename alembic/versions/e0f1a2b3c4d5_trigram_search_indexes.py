@@ -0,0 +1,54 @@
+"""pg_trgm GIN indexes for the admin user and tenant search
+
+Revision ID: e0f1a2b3c4d5
+Revises: d9e0f1a2b3c4
+Create Date: 2026-10-17 03:40:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "e0f1a2b3c4d5"
+down_revision: Union[str, None] = "d9e0f1a2b3c4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (tabla, índice, columna): uno por columna para que el OR de la búsqueda se
+# resuelva con BitmapOr sobre los cuatro (o dos) índices
+_INDEXES = (
+    ("usuarios", "ix_usuarios_email_trgm", "email"),
+    ("usuarios", "ix_usuarios_nombre_usuario_trgm", "nombre_usuario"),
+    ("usuarios", "ix_usuarios_nombres_trgm", "nombres"),
+    ("usuarios", "ix_usuarios_apellidos_trgm", "apellidos"),
+    ("tenants", "ix_tenants_nombre_trgm", "nombre"),
+    ("tenants", "ix_tenants_slug_trgm", "slug"),
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, index, column in _INDEXES:
+        if table in tables:
+            op.execute(
+                f"CREATE INDEX IF NOT EXISTS {index} ON {table} USING gin (lower({column}) gin_trgm_ops)"
+            )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    for _table, index, _column in _INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {index}")
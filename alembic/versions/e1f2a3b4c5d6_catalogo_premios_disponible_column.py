@@ -0,0 +1,54 @@
+"""catalogo premios disponible generated column
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-10-17 00:40:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "e1f2a3b4c5d6"
+down_revision: Union[str, None] = "d0e1f2a3b4c5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "catalogo_premios" not in inspector.get_table_names():
+        return
+
+    cols = {c["name"] for c in inspector.get_columns("catalogo_premios")}
+    if "disponible" not in cols:
+        op.add_column(
+            "catalogo_premios",
+            sa.Column(
+                "disponible",
+                sa.Boolean(),
+                sa.Computed("activo AND (stock_disponible IS NULL OR stock_disponible > 0)", persisted=True),
+            ),
+        )
+
+    if bind.dialect.name == "postgresql":
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS idx_catalogo_premios_disponibles "
+            "ON catalogo_premios (puntos_requeridos, nombre) INCLUDE (fecha_vencimiento) WHERE disponible"
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "catalogo_premios" not in inspector.get_table_names():
+        return
+
+    op.execute("DROP INDEX IF EXISTS idx_catalogo_premios_disponibles")
+    cols = {c["name"] for c in inspector.get_columns("catalogo_premios")}
+    if "disponible" in cols:
+        op.drop_column("catalogo_premios", "disponible")
@@ -0,0 +1,74 @@
+"""current level and points cache columns on usuarios
+
+Revision ID: e4f5a6b7c8d9
+Revises: d3e4f5a6b7c8
+Create Date: 2026-10-17 02:40:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "e4f5a6b7c8d9"
+down_revision: Union[str, None] = "d3e4f5a6b7c8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "usuarios" not in inspector.get_table_names():
+        return
+
+    cols = {c["name"] for c in inspector.get_columns("usuarios")}
+    if "id_nivel_actual" not in cols:
+        op.add_column("usuarios", sa.Column("id_nivel_actual", sa.Integer(), nullable=True))
+        op.create_foreign_key(
+            "fk_usuarios_id_nivel_actual_tipo_nivel_usuario",
+            "usuarios",
+            "tipo_nivel_usuario",
+            ["id_nivel_actual"],
+            ["id"],
+        )
+        op.create_index("ix_usuarios_id_nivel_actual", "usuarios", ["id_nivel_actual"], unique=False)
+    if "puntaje_cache" not in cols:
+        op.add_column(
+            "usuarios",
+            sa.Column("puntaje_cache", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        )
+
+    if "usuarios_niveles" in inspector.get_table_names():
+        bind.execute(
+            sa.text(
+                "UPDATE usuarios SET "
+                "id_nivel_actual = (SELECT un.id_nivel FROM usuarios_niveles un WHERE un.id_usuario = usuarios.id), "
+                "puntaje_cache = COALESCE("
+                "(SELECT un.puntaje_actual FROM usuarios_niveles un WHERE un.id_usuario = usuarios.id), 0)"
+            )
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "usuarios" not in inspector.get_table_names():
+        return
+
+    cols = {c["name"] for c in inspector.get_columns("usuarios")}
+    if "puntaje_cache" in cols and "usuarios_niveles" in inspector.get_table_names():
+        bind.execute(
+            sa.text(
+                "UPDATE usuarios_niveles SET puntaje_actual = "
+                "(SELECT u.puntaje_cache FROM usuarios u WHERE u.id = usuarios_niveles.id_usuario)"
+            )
+        )
+    if "id_nivel_actual" in cols:
+        op.drop_index("ix_usuarios_id_nivel_actual", table_name="usuarios")
+        op.drop_constraint("fk_usuarios_id_nivel_actual_tipo_nivel_usuario", "usuarios", type_="foreignkey")
+        op.drop_column("usuarios", "id_nivel_actual")
+    if "puntaje_cache" in cols:
+        op.drop_column("usuarios", "puntaje_cache")
@@ -0,0 +1,44 @@
+"""partial indexes for earned/redeemed points filters
+
+Revision ID: e7f8a9b0c1d2
+Revises: d6e7f8a9b0c1
+Create Date: 2026-10-17 01:40:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "e7f8a9b0c1d2"
+down_revision: Union[str, None] = "d6e7f8a9b0c1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "transacciones_puntos" not in inspector.get_table_names() or bind.dialect.name != "postgresql":
+        return
+
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_trans_solo_ganados "
+        "ON transacciones_puntos (id_usuario, fecha) WHERE puntos_ganados > 0"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_trans_solo_canjeados "
+        "ON transacciones_puntos (id_usuario, fecha) WHERE puntos_canjeados > 0"
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "transacciones_puntos" not in inspector.get_table_names() or bind.dialect.name != "postgresql":
+        return
+
+    op.execute("DROP INDEX IF EXISTS idx_trans_solo_canjeados")
+    op.execute("DROP INDEX IF EXISTS idx_trans_solo_ganados")
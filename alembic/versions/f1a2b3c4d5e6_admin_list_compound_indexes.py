@@ -0,0 +1,60 @@
+"""compound indexes for the admin user, tenant and payment listings
+
+Revision ID: f1a2b3c4d5e6
+Revises: e0f1a2b3c4d5
+Create Date: 2026-10-17 03:50:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "f1a2b3c4d5e6"
+down_revision: Union[str, None] = "e0f1a2b3c4d5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (tabla, índice, columnas, predicado parcial, índice simple reemplazado)
+_INDEXES = (
+    ("usuarios", "ix_usuarios_activo_verificado_id", "activo, verificado, id", "email IS NOT NULL", None),
+    ("tenants", "ix_tenants_activo_nombre_id", "activo, nombre, id", None, None),
+    (
+        "tenant_payments",
+        "ix_tenant_payments_tenant_paid_at_id",
+        "tenant_id, paid_at, id",
+        None,
+        ("ix_tenant_payments_tenant_id", "tenant_id"),
+    ),
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    for table, index, columns, where, replaced in _INDEXES:
+        if table not in tables:
+            continue
+        predicate = f" WHERE {where}" if where else ""
+        op.execute(f"CREATE INDEX IF NOT EXISTS {index} ON {table} ({columns}){predicate}")
+        if replaced is not None:
+            op.execute(f"DROP INDEX IF EXISTS {replaced[0]}")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    for table, index, _columns, _where, replaced in _INDEXES:
+        if table not in tables:
+            continue
+        if replaced is not None:
+            replaced_index, replaced_column = replaced
+            op.execute(f"CREATE INDEX IF NOT EXISTS {replaced_index} ON {table} ({replaced_column})")
+        op.execute(f"DROP INDEX IF EXISTS {index}")
@@ -0,0 +1,53 @@
+"""add premio snapshot to canjes
+
+Revision ID: f2a3b4c5d6e7
+Revises: e1f2a3b4c5d6
+Create Date: 2026-10-17 00:50:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "f2a3b4c5d6e7"
+down_revision: Union[str, None] = "e1f2a3b4c5d6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "canjes" not in inspector.get_table_names():
+        return
+
+    cols = {c["name"] for c in inspector.get_columns("canjes")}
+    if "premio_nombre_snapshot" not in cols:
+        op.add_column("canjes", sa.Column("premio_nombre_snapshot", sa.String(length=100), nullable=True))
+    if "premio_descripcion_snapshot" not in cols:
+        op.add_column("canjes", sa.Column("premio_descripcion_snapshot", sa.String(), nullable=True))
+
+    op.execute(
+        """
+        UPDATE canjes
+        SET premio_nombre_snapshot = (SELECT p.nombre FROM catalogo_premios p WHERE p.id = canjes.id_premio),
+            premio_descripcion_snapshot = (SELECT p.descripcion FROM catalogo_premios p WHERE p.id = canjes.id_premio)
+        WHERE premio_nombre_snapshot IS NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "canjes" not in inspector.get_table_names():
+        return
+
+    cols = {c["name"] for c in inspector.get_columns("canjes")}
+    if "premio_descripcion_snapshot" in cols:
+        op.drop_column("canjes", "premio_descripcion_snapshot")
+    if "premio_nombre_snapshot" in cols:
+        op.drop_column("canjes", "premio_nombre_snapshot")
@@ -0,0 +1,50 @@
+"""make the ventas/referidos user FKs ON DELETE SET NULL
+
+Revision ID: f3a4b5c6d7e8
+Revises: f1a2b3c4d5e6
+Create Date: 2026-10-17 14:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "f3a4b5c6d7e8"
+down_revision: Union[str, None] = "f1a2b3c4d5e6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (tabla, columna): las colecciones de Usuario son write_only con passive_deletes,
+# así que al borrar un usuario es la base la que deja estas FK en NULL
+_FKS = (
+    ("ventas", "id_usuario"),
+    ("referidos", "id_usuario_generador"),
+    ("referidos", "id_usuario_referido"),
+)
+
+
+def _recrear_fks(ondelete: Union[str, None]) -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    inspector = sa.inspect(bind)
+    tablas = set(inspector.get_table_names())
+    for tabla, columna in _FKS:
+        if tabla not in tablas:
+            continue
+        for fk in inspector.get_foreign_keys(tabla):
+            if fk["constrained_columns"] == [columna] and fk.get("name"):
+                op.drop_constraint(fk["name"], tabla, type_="foreignkey")
+        op.create_foreign_key(f"{tabla}_{columna}_fkey", tabla, "usuarios", [columna], ["id"], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    _recrear_fks("SET NULL")
+
+
+def downgrade() -> None:
+    _recrear_fks(None)
@@ -0,0 +1,45 @@
+"""drop unused timestamp indexes on usuarios and wallets
+
+Revision ID: f5a6b7c8d9e0
+Revises: e4f5a6b7c8d9
+Create Date: 2026-10-17 02:50:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "f5a6b7c8d9e0"
+down_revision: Union[str, None] = "e4f5a6b7c8d9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (tabla, índice, columna) sin consultas que filtren u ordenen solo por la fecha
+_UNUSED = (
+    ("usuarios", "ix_usuarios_fecha_creacion", "fecha_creacion"),
+    ("wallets", "ix_wallets_created_at", "created_at"),
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    for table, index, _ in _UNUSED:
+        if table in tables:
+            op.execute(f"DROP INDEX IF EXISTS {index}")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    for table, index, column in _UNUSED:
+        if table in tables:
+            op.execute(f"CREATE INDEX IF NOT EXISTS {index} ON {table} ({column})")
@@ -0,0 +1,52 @@
+"""server default now() for more insert timestamps
+
+Revision ID: f8a9b0c1d2e3
+Revises: e7f8a9b0c1d2
+Create Date: 2026-10-17 01:50:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "f8a9b0c1d2e3"
+down_revision: Union[str, None] = "e7f8a9b0c1d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_COLUMNS = (
+    ("equipos", "creado_el"),
+    ("transacciones_puntos", "fecha"),
+    ("pagos", "fecha_pago"),
+    ("tenant_users", "creado_el"),
+    ("user_preferences", "updated_at"),
+)
+
+
+def _existing_columns(inspector):
+    tables = set(inspector.get_table_names())
+    for table, column in _COLUMNS:
+        if table not in tables:
+            continue
+        if column in {c["name"] for c in inspector.get_columns(table)}:
+            yield table, column
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    for table, column in _existing_columns(inspector):
+        op.alter_column(table, column, server_default=sa.text("now()"))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    for table, column in _existing_columns(inspector):
+        op.alter_column(table, column, server_default=None)
@@ -0,0 +1,65 @@
+"""
+Caché en memoria con expiración por tiempo (TTL), local a cada proceso
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+_SIN_VALOR = object()
+
+
+class TTLCache:
+    """
+    Diccionario con expiración por entrada y tamaño máximo opcional.
+
+    Pensado para datos pequeños y casi inmutables (tablas de referencia, roles):
+    cada worker mantiene su propia copia, por lo que las invalidaciones solo
+    afectan al proceso que las ejecuta; el TTL acota la desactualización en el resto.
+    """
+
+    def __init__(self, ttl_seconds: float, maxsize: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._datos: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, clave: Hashable, default: Any = None) -> Any:
+        entrada = self._datos.get(clave)
+        if entrada is None:
+            return default
+        expira, valor = entrada
+        if expira < time.monotonic():
+            self._datos.pop(clave, None)
+            return default
+        return valor
+
+    def set(self, clave: Hashable, valor: Any) -> None:
+        with self._lock:
+            if self.maxsize is not None and len(self._datos) >= self.maxsize and clave not in self._datos:
+                # Descartar la entrada más antigua (orden de inserción del dict)
+                self._datos.pop(next(iter(self._datos)), None)
+            self._datos[clave] = (time.monotonic() + self.ttl_seconds, valor)
+
+    def get_or_set(self, clave: Hashable, cargar: Callable[[], Any]) -> Any:
+        """
+        Devuelve el valor cacheado o lo calcula con ``cargar`` y lo guarda.
+        ``None`` no se cachea para que las filas creadas después se encuentren.
+        """
+        valor = self.get(clave, _SIN_VALOR)
+        if valor is _SIN_VALOR:
+            valor = cargar()
+            if valor is not None:
+                self.set(clave, valor)
+        return valor
+
+    def pop(self, clave: Hashable) -> None:
+        with self._lock:
+            self._datos.pop(clave, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._datos.clear()
+
+    def __len__(self) -> int:
+        return len(self._datos)
@@ -16,6 +16,14 @@ class Settings(BaseSettings):
     app_version: str = "1.0.0"
     debug: bool = False
     sql_echo: bool = False
+    sql_query_cache_size: int = 1200  # Sentencias compiladas que guarda el engine
+    admin_count_timeout_ms: int = 500  # Tope del COUNT opcional de los listados de admin
+    # Hilos del threadpool donde FastAPI corre los endpoints ``def`` (anyio usa 40 por defecto)
+    sync_worker_threads: int = 40
+    # Pool de conexiones (PostgreSQL): pool_size + max_overflow cubre un hilo por conexión
+    db_pool_size: int = 20
+    db_max_overflow: int = 20
+    db_pool_recycle: int = 3600  # Segundos antes de reciclar una conexión
     auto_create_db: bool = False
 
     # Configuración del servidor
@@ -51,6 +59,7 @@ class Settings(BaseSettings):
     device_uid_hmac_secret: Optional[str] = None
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
+    token_cache_ttl_seconds: int = 30  # Reuso del payload de un access token ya verificado
     algorithm: str = "HS256"
     jwt_issuer: Optional[str] = None
     jwt_audience: Optional[str] = None
@@ -91,6 +100,8 @@ class Settings(BaseSettings):
     )
     smtp_use_tls: bool = True
     smtp_use_ssl: bool = False
+    # Enviar los emails de verificación/reset después de responder (BackgroundTasks)
+    email_send_in_background: bool = True
 
     @field_validator("cors_origins", mode="before")
     @classmethod
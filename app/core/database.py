@@ -32,10 +32,23 @@ from app.models.cards import Card, CardAssignment
 from app.models.wallet import Wallet, WalletTxn
 
 # Crear el motor de la base de datos
+_engine_kwargs = {}
+if settings.database_url.startswith("postgresql"):
+    # psycopg2: executemany de UPDATE/DELETE vía execute_batch (los INSERT ya usan insertmanyvalues)
+    _engine_kwargs["executemany_mode"] = "values_plus_batch"
+    # Cada request síncrono retiene una conexión mientras dura su hilo: con el pool
+    # por defecto (5 + 10) los hilos restantes quedan esperando en QueuePool
+    _engine_kwargs["pool_size"] = settings.db_pool_size
+    _engine_kwargs["max_overflow"] = settings.db_max_overflow
+    _engine_kwargs["pool_recycle"] = settings.db_pool_recycle
+
 engine = create_engine(
     settings.database_url,
     echo=settings.sql_echo,
     pool_pre_ping=True,   # Verificar conexiones antes de usarlas
+    query_cache_size=settings.sql_query_cache_size,  # Caché de SQL compilado por engine
+    insertmanyvalues_page_size=10_000,  # Filas por INSERT ... VALUES en inserciones masivas
+    **_engine_kwargs,
 )
 
 
@@ -0,0 +1,45 @@
+"""
+Respuestas JSON serializadas directamente con pydantic-core
+
+FastAPI 0.104 vuelve a validar el valor devuelto contra ``response_model`` y lo
+pasa por ``jsonable_encoder`` antes de codificarlo. Para listados de esquemas de
+lectura ya construidos desde la base de datos ese trabajo es redundante: estos
+helpers serializan en Rust con ``model_dump_json`` / ``TypeAdapter.dump_json`` y
+devuelven un ``Response`` que FastAPI envía tal cual. Conservar ``response_model``
+en el decorador para la documentación OpenAPI.
+
+``PydanticJSONResponse`` también sirve como ``default_response_class`` de un
+router: el resto de los endpoints (dicts) se codifican con ``pydantic_core.to_json``
+en lugar del ``json`` de la stdlib.
+"""
+from functools import lru_cache
+from typing import Any, List, Sequence, Type
+
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+
+
+class PydanticJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        # Los helpers de abajo entregan bytes ya serializados
+        if isinstance(content, bytes):
+            return content
+        return to_json(content)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def model_response(obj: BaseModel, status_code: int = 200) -> PydanticJSONResponse:
+    """Serializa un modelo ya validado sin revalidarlo"""
+    return PydanticJSONResponse(content=to_json(obj), status_code=status_code)
+
+
+def list_response(model: Type[BaseModel], items: Sequence[Any], status_code: int = 200) -> PydanticJSONResponse:
+    """Serializa una lista de ``model`` en una sola pasada de pydantic-core"""
+    return PydanticJSONResponse(content=_list_adapter(model).dump_json(list(items)), status_code=status_code)
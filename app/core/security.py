@@ -1,18 +1,41 @@
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 from uuid import uuid4
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
 import bcrypt
+import hashlib
+import hmac
 import logging
+import re
+import time
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.models.base import utcnow
 
 # Configurar logging
 logger = logging.getLogger(__name__)
 
-def hmac_sha256_hex(value: str, *, secret: str) -> str:
-    import hmac
-    import hashlib
+# Payloads de tokens ya verificados, por sha256 del token: los clientes repiten
+# el mismo access token en cada request durante su vigencia. La clave es el
+# digest para no dejar tokens válidos en memoria del proceso.
+_verified_tokens = TTLCache(ttl_seconds=settings.token_cache_ttl_seconds, maxsize=10_000)
+
+# Hash legado: sha256 hexadecimal de 64 caracteres (semillas antiguas)
+_RE_SHA256_HEX = re.compile(r"[0-9a-fA-F]{64}")
+
+
+@lru_cache(maxsize=4)
+def _jwt_key(secret: str, algorithm: str):
+    """
+    Clave JWK construida una vez por (secreto, algoritmo). Con el secreto como
+    ``str`` python-jose intenta parsearlo como JSON y arma la clave en cada
+    firma/verificación; un objeto ``Key`` se usa directamente.
+    """
+    return jwk.construct(secret, algorithm)
 
+
+def hmac_sha256_hex(value: str, *, secret: str) -> str:
     return hmac.new(secret.encode("utf-8"), value.encode("utf-8"), hashlib.sha256).hexdigest()
 
 def _truncate_password_safely(password: str) -> bytes:
@@ -42,8 +65,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
             return bcrypt.checkpw(safe_password_bytes, hashed_password.encode('utf-8'))
         
         # Fallback legado: hash sha256 hexadecimal de 64 caracteres
-        import re, hashlib
-        if isinstance(hashed_password, str) and re.fullmatch(r"[0-9a-fA-F]{64}", hashed_password):
+        if isinstance(hashed_password, str) and _RE_SHA256_HEX.fullmatch(hashed_password):
             return hashlib.sha256(plain_password.encode('utf-8')).hexdigest() == hashed_password
         
         return False
@@ -72,7 +94,7 @@ def get_password_hash(password: str) -> str:
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Crear token JWT de acceso"""
     to_encode = data.copy()
-    now = datetime.utcnow()
+    now = utcnow()
     
     if expires_delta:
         expire = now + expires_delta
@@ -92,7 +114,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         to_encode["iss"] = settings.jwt_issuer
     if settings.jwt_audience:
         to_encode["aud"] = settings.jwt_audience
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+    encoded_jwt = jwt.encode(to_encode, _jwt_key(settings.secret_key, settings.algorithm), algorithm=settings.algorithm)
     return encoded_jwt
 
 
@@ -105,7 +127,9 @@ def verify_token(token: str, expected_type: Optional[str] = None) -> Optional[di
         if settings.jwt_audience:
             decode_kwargs["audience"] = settings.jwt_audience
 
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm], **decode_kwargs)
+        payload = jwt.decode(
+            token, _jwt_key(settings.secret_key, settings.algorithm), algorithms=[settings.algorithm], **decode_kwargs
+        )
         token_type = payload.get("type") or "access"
         payload["type"] = token_type
         if expected_type and token_type != expected_type:
@@ -115,10 +139,33 @@ def verify_token(token: str, expected_type: Optional[str] = None) -> Optional[di
         return None
 
 
+def verify_token_cached(token: str, expected_type: Optional[str] = None) -> Optional[dict]:
+    """
+    Igual que ``verify_token`` pero reutiliza el payload de una verificación
+    reciente del mismo token (``token_cache_ttl_seconds``) sin volver a
+    decodificar ni validar la firma. Los tokens inválidos no se cachean y
+    ``exp`` se revisa en cada uso, así un token no sobrevive a su vencimiento
+    por estar en caché.
+    """
+    clave = hashlib.sha256(token.encode("utf-8")).digest()
+    payload = _verified_tokens.get(clave)
+    if payload is None:
+        payload = verify_token(token)
+        if payload is None:
+            return None
+        _verified_tokens.set(clave, payload)
+    elif payload.get("exp") is not None and payload["exp"] <= time.time():
+        _verified_tokens.pop(clave)
+        return None
+    if expected_type and payload["type"] != expected_type:
+        return None
+    return payload
+
+
 def create_refresh_token(data: dict) -> tuple[str, str, datetime]:
     """Crear token de refresh"""
     to_encode = data.copy()
-    now = datetime.utcnow()
+    now = utcnow()
     expire = now + timedelta(days=settings.refresh_token_expire_days)
     jti = str(uuid4())
     to_encode.update(
@@ -134,5 +181,5 @@ def create_refresh_token(data: dict) -> tuple[str, str, datetime]:
         to_encode["iss"] = settings.jwt_issuer
     if settings.jwt_audience:
         to_encode["aud"] = settings.jwt_audience
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+    encoded_jwt = jwt.encode(to_encode, _jwt_key(settings.secret_key, settings.algorithm), algorithm=settings.algorithm)
     return encoded_jwt, jti, expire
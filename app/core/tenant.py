@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from datetime import datetime
 from typing import Optional
 
 from fastapi import Depends, Header, HTTPException, Request, status
@@ -9,6 +8,7 @@ from sqlmodel import Session
 from app.core.database import get_session
 from app.models.tenant import Tenant
 from app.models.user_extended import Usuario
+from app.models.base import utcnow
 from app.routers.auth import get_current_active_user
 from app.services.tenants import TenantService
 
@@ -61,7 +61,7 @@ def get_current_tenant(
     if tenant is None or not tenant.activo:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tenant no encontrado")
 
-    now = datetime.utcnow()
+    now = utcnow()
     if tenant.suscripcion_hasta is not None and now > tenant.suscripcion_hasta:
         if tenant.suscripcion_gracia_hasta is None or now > tenant.suscripcion_gracia_hasta:
             raise HTTPException(status_code=status.HTTP_402_PAYMENT_REQUIRED, detail="Suscripción vencida")
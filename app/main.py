@@ -1,3 +1,4 @@
+import anyio.to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi.errors import RateLimitExceeded
@@ -71,6 +72,8 @@ app.include_router(sales.router, prefix="/api/v1")
 @app.on_event("startup")
 def on_startup():
     """Eventos que se ejecutan al iniciar la aplicación"""
+    # Los endpoints son síncronos: cada request ocupa un hilo mientras espera a la base
+    anyio.to_thread.current_default_thread_limiter().total_tokens = app_settings.sync_worker_threads
     if app_settings.auto_create_db or app_settings.environment == "development":
         create_db_and_tables()
         if app_settings.subscription_sweep_on_startup:
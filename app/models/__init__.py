@@ -22,6 +22,7 @@ from .user_extended import (
     UsuarioRol,
     UsuarioNivel,
     UsuarioMetodoPago,
+    UsuarioCredenciales,
     Referido,
 
     UsuarioBase,
@@ -102,6 +103,7 @@ from .pricing import (
     ReglaDePrecioUpdate,
     CalculoPrecio,
     ConsultaPrecio,
+    LoteReglasPrecio,
     CalculadoraPrecios
 )
 
@@ -148,7 +150,8 @@ from .transactions import (
     PagoRead,
     PagoUpdate,
     PagoResumen,
-    GestorTransaccionesPuntos
+    GestorTransaccionesPuntos,
+    ParticionTransacciones
 )
 
 # Exportar todos los modelos para facilitar las importaciones
@@ -170,6 +173,7 @@ __all__ = [
     "UsuarioRol",
     "UsuarioNivel",
     "UsuarioMetodoPago",
+    "UsuarioCredenciales",
     "Referido",
 
     "UsuarioBase",
@@ -239,6 +243,7 @@ __all__ = [
     "ReglaDePrecioUpdate",
     "CalculoPrecio",
     "ConsultaPrecio",
+    "LoteReglasPrecio",
     "CalculadoraPrecios",
     
     # Points
@@ -280,4 +285,5 @@ __all__ = [
     "PagoUpdate",
     "PagoResumen",
     "GestorTransaccionesPuntos",
+    "ParticionTransacciones",
 ]
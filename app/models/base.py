@@ -2,12 +2,22 @@
 Modelos base y enums para la API BeCard
 """
 from enum import Enum
+from operator import attrgetter
 from sqlmodel import SQLModel, Field
-from typing import Optional
-from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+from datetime import datetime, timezone
 import uuid
 
 
+def utcnow() -> datetime:
+    """
+    Instante actual en UTC como datetime naive, el formato de las columnas
+    TIMESTAMP existentes. Reemplaza a ``datetime.utcnow`` (deprecado desde
+    Python 3.12) en los defaults de los modelos.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class TipoPrioridadRegla(str, Enum):
     """Enum para prioridad de reglas de precio"""
     BAJA = "baja"
@@ -35,6 +45,86 @@ class TipoAlcanceRegla(str, Enum):
     EQUIPO = "equipo"
 
 
+class TrustedReadMixin:
+    """
+    Mixin para esquemas de lectura construidos desde filas ORM.
+
+    Los datos ya fueron validados al escribirse, por lo que ``from_orm_trusted``
+    usa ``model_construct`` y no vuelve a ejecutar los validadores de cada campo.
+    Usar solo con objetos leídos de la base de datos; los payloads entrantes
+    (``*Create``/``*Update``) se siguen validando normalmente.
+    """
+
+    @classmethod
+    def from_orm_trusted(cls, obj):
+        lector = _LECTORES.get((cls, type(obj)))
+        if lector is None:
+            lector = _LECTORES[(cls, type(obj))] = make_fast_reader(cls, type(obj))
+        return lector(obj)
+
+    @classmethod
+    def from_row_trusted(cls, fila):
+        """
+        Igual que ``from_orm_trusted`` pero para filas de Core (``.mappings()``),
+        sin hidratar entidades ORM: solo los UUID se convierten a ``str``.
+        """
+        return cls.model_construct(**{
+            clave: str(valor) if isinstance(valor, uuid.UUID) else valor
+            for clave, valor in fila.items()
+        })
+
+
+# Lectores por (esquema de lectura, clase de origen), construidos una sola vez
+_LECTORES: Dict[Tuple[type, type], Callable[[Any], Any]] = {}
+
+
+def _es_uuid(origen: type, campo: str) -> bool:
+    info = getattr(origen, "model_fields", {}).get(campo)
+    if info is None:
+        return True  # origen sin metadatos: revisar el valor en cada lectura
+    anotacion = info.annotation
+    return anotacion is uuid.UUID or uuid.UUID in getattr(anotacion, "__args__", ())
+
+
+def make_fast_reader(cls, origen: type) -> Callable[[Any], Any]:
+    """
+    Construye una función ``obj -> cls`` para objetos de la clase ``origen``.
+
+    Los campos presentes en el origen se resuelven una vez y se leen con un único
+    ``attrgetter`` (en C); solo los campos UUID se convierten a ``str``. Un
+    modelo pydantic sin columnas mapeadas no expone sus campos como atributos de
+    clase, por eso también se consulta ``origen.model_fields``.
+
+    Raises:
+        TypeError: Si ``origen`` no comparte ningún campo con ``cls``
+    """
+    campos_origen = getattr(origen, "model_fields", {})
+    campos = tuple(
+        campo for campo in cls.model_fields
+        if campo in campos_origen or hasattr(origen, campo)
+    )
+    if not campos:
+        raise TypeError(f"{origen.__name__} no tiene ningún campo de {cls.__name__}")
+
+    getter = attrgetter(*campos)
+    uuids = tuple(i for i, campo in enumerate(campos) if _es_uuid(origen, campo))
+    construir = cls.model_construct
+    un_campo = len(campos) == 1
+
+    def leer(obj):
+        valores = getter(obj)
+        if un_campo:
+            valores = (valores,)
+        if uuids:
+            valores = list(valores)
+            for i in uuids:
+                if isinstance(valores[i], uuid.UUID):
+                    valores[i] = str(valores[i])
+        return construir(**dict(zip(campos, valores)))
+
+    return leer
+
+
 class BaseModel(SQLModel):
     """Modelo base con campos comunes para todas las entidades"""
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -43,7 +133,7 @@ class BaseModel(SQLModel):
 
 class TimestampMixin(SQLModel):
     """Mixin para campos de timestamp comunes"""
-    creado_el: datetime = Field(default_factory=datetime.utcnow, index=True)
+    creado_el: datetime = Field(default_factory=utcnow, index=True)
     creado_por: Optional[int] = Field(default=None, foreign_key="usuarios.id")
 
 
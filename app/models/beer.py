@@ -6,7 +6,7 @@ from sqlalchemy import Numeric
 from typing import Optional, List, TYPE_CHECKING
 from datetime import datetime
 from decimal import Decimal
-from .base import BaseModel, TimestampMixin
+from .base import BaseModel, TimestampMixin, utcnow
 
 # Importaciones para evitar referencias circulares
 if TYPE_CHECKING:
@@ -85,7 +85,7 @@ class PrecioCerveza(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     id_cerveza: int = Field(foreign_key="cervezas.id", index=True)
     precio: Decimal = Field(sa_column=Column(Numeric(10, 2), nullable=False))
-    fecha_inicio: datetime = Field(default_factory=datetime.utcnow, index=True)
+    fecha_inicio: datetime = Field(default_factory=utcnow, index=True)
     fecha_fin: Optional[datetime] = Field(
         default=None,
         description="NULL significa que es el precio actual"
@@ -5,7 +5,7 @@ from typing import Optional
 
 from sqlmodel import Field
 
-from .base import BaseModel
+from .base import BaseModel, utcnow
 
 
 class Card(BaseModel, table=True):
@@ -14,7 +14,7 @@ class Card(BaseModel, table=True):
     tenant_id: Optional[int] = Field(foreign_key="tenants.id", default=None, index=True)
     uid_hash: str = Field(max_length=128, unique=True, index=True)
     activo: bool = Field(default=True, index=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    created_at: datetime = Field(default_factory=utcnow, index=True)
 
 
 class CardAssignment(BaseModel, table=True):
@@ -25,7 +25,7 @@ class CardAssignment(BaseModel, table=True):
     user_id: Optional[int] = Field(foreign_key="usuarios.id", default=None, index=True)
     assignment_type: str = Field(max_length=30, index=True)
     activo: bool = Field(default=True, index=True)
-    assigned_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    assigned_at: datetime = Field(default_factory=utcnow, index=True)
     assigned_by: Optional[int] = Field(foreign_key="usuarios.id", default=None, index=True)
     unassigned_at: Optional[datetime] = Field(default=None, index=True)
 
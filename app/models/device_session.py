@@ -7,7 +7,7 @@ from typing import Optional
 from sqlalchemy import Column, Numeric
 from sqlmodel import Field
 
-from .base import BaseModel
+from .base import BaseModel, utcnow
 
 
 class DeviceSession(BaseModel, table=True):
@@ -37,5 +37,5 @@ class DeviceSession(BaseModel, table=True):
     payment_mode: str = Field(default="wallet", max_length=20, index=True)
     idempotency_key: Optional[str] = Field(default=None, max_length=80, index=True)
 
-    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    created_at: datetime = Field(default_factory=utcnow, index=True)
     completed_at: Optional[datetime] = Field(default=None, index=True)
@@ -3,6 +3,8 @@ from typing import Optional
 
 from sqlmodel import SQLModel, Field
 
+from .base import utcnow
+
 
 class EmailVerificationToken(SQLModel, table=True):
     __tablename__ = "email_verification_tokens"
@@ -10,7 +12,7 @@ class EmailVerificationToken(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="usuarios.id", index=True)
     token_hash: str = Field(index=True, unique=True, max_length=64)
-    issued_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    issued_at: datetime = Field(default_factory=utcnow, index=True)
     expires_at: datetime = Field(index=True)
     used_at: Optional[datetime] = Field(default=None, index=True)
 
@@ -6,6 +6,7 @@ from sqlalchemy import Numeric
 from typing import Optional
 from datetime import datetime
 from decimal import Decimal
+from .base import utcnow
 
 
 class ReglaConversionPuntos(SQLModel, table=True):
@@ -25,7 +26,7 @@ class ReglaConversionPuntos(SQLModel, table=True):
         description="Cantidad de puntos otorgados por cada peso gastado"
     )
     activo: bool = Field(default=False, index=True)
-    fecha_inicio: datetime = Field(default_factory=datetime.utcnow)
+    fecha_inicio: datetime = Field(default_factory=utcnow)
     fecha_fin: Optional[datetime] = Field(default=None)
     descripcion: Optional[str] = Field(default=None, description="Descripción de la regla")
     prioridad: int = Field(default=1, description="Prioridad para múltiples reglas")
@@ -38,7 +39,7 @@ class ReglaConversionPuntosBase(SQLModel):
     monto_minimo: Decimal
     puntos_por_peso: Decimal
     activo: bool = Field(default=False)
-    fecha_inicio: datetime = Field(default_factory=datetime.utcnow)
+    fecha_inicio: datetime = Field(default_factory=utcnow)
     fecha_fin: Optional[datetime] = None
     descripcion: Optional[str] = None
     prioridad: int = Field(default=1)
@@ -2,11 +2,11 @@
 Modelos de reglas de precios y alcances para la API BeCard
 """
 from sqlmodel import SQLModel, Field, Relationship, Column
-from sqlalchemy import Numeric
-from typing import Optional, List, TYPE_CHECKING
+from sqlalchemy import Numeric, func
+from typing import Optional, List, Union, TYPE_CHECKING
 from datetime import datetime
 from decimal import Decimal, ROUND_HALF_UP
-from .base import BaseModel, TipoPrioridadRegla, TipoAlcanceRegla
+from .base import BaseModel, TipoPrioridadRegla, TipoAlcanceRegla, utcnow
 
 # Importaciones para evitar referencias circulares
 if TYPE_CHECKING:
@@ -45,10 +45,12 @@ class ReglaDePrecio(BaseModel, table=True):
         sa_column=Column(Numeric(5, 2), nullable=False),
         description="Multiplicador para cálculo de precio"
     )
-    fecha_hora_inicio: datetime = Field(default_factory=datetime.utcnow, index=True)
+    fecha_hora_inicio: datetime = Field(
+        default=None, nullable=False, index=True, sa_column_kwargs={"server_default": func.now()}
+    )
     fecha_hora_fin: Optional[datetime] = Field(default=None, index=True)
     creado_por: int = Field(foreign_key="usuarios.id")
-    creado_el: datetime = Field(default_factory=datetime.utcnow)
+    creado_el: datetime = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
     dias_semana: Optional[str] = Field(default=None, description="Días de la semana aplicables (JSON array)")
     
     # Relaciones
@@ -61,7 +63,7 @@ class ReglaDePrecio(BaseModel, table=True):
     def esta_vigente(self, fecha: Optional[datetime] = None) -> bool:
         """Verifica si la regla está vigente en una fecha específica"""
         if fecha is None:
-            fecha = datetime.utcnow()
+            fecha = utcnow()
         return (
             self.esta_activo and
             self.fecha_hora_inicio <= fecha <= self.fecha_hora_fin
@@ -180,6 +182,63 @@ class ConsultaPrecio(SQLModel):
 
 # Funciones auxiliares para cálculo de precios
 
+ORDEN_PRIORIDAD = {
+    TipoPrioridadRegla.ALTA: 3,
+    TipoPrioridadRegla.MEDIA: 2,
+    TipoPrioridadRegla.BAJA: 1
+}
+
+
+def _a_centesimas(valor: Decimal) -> int:
+    """Convierte un Decimal a entero escalado x100 (centavos / centésimas)"""
+    return int((valor * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def _dividir_redondeando(numerador: int, denominador: int) -> int:
+    """División entera con redondeo ROUND_HALF_UP (denominador positivo)"""
+    cociente, resto = divmod(abs(numerador), denominador)
+    if resto * 2 >= denominador:
+        cociente += 1
+    return cociente if numerador >= 0 else -cociente
+
+
+class LoteReglasPrecio:
+    """
+    Reglas de precio almacenadas en columnas paralelas (estructura de arreglos).
+
+    Se construye una sola vez al cargar las reglas desde la base de datos y puede
+    reutilizarse para calcular el precio de muchas cervezas sin volver a recorrer
+    los objetos ORM. Las reglas quedan ordenadas por prioridad (alta > media > baja).
+
+    Los montos se guardan como enteros: precios en centavos (Numeric(10,2)) y
+    multiplicadores en centésimas (Numeric(5,2), ej. 0.90 -> 90).
+    """
+
+    __slots__ = ("nombres", "precios_centavos", "multiplicadores_x100", "inicios", "fines", "activos")
+
+    def __init__(self, reglas: List[ReglaDePrecio]):
+        ordenadas = sorted(reglas, key=lambda r: ORDEN_PRIORIDAD[r.prioridad], reverse=True)
+        self.nombres = tuple(r.nombre for r in ordenadas)
+        self.precios_centavos = tuple(
+            _a_centesimas(r.precio) if r.precio is not None else None for r in ordenadas
+        )
+        self.multiplicadores_x100 = tuple(_a_centesimas(r.multiplicador) for r in ordenadas)
+        self.inicios = tuple(r.fecha_hora_inicio for r in ordenadas)
+        self.fines = tuple(r.fecha_hora_fin for r in ordenadas)
+        self.activos = tuple(bool(r.esta_activo) for r in ordenadas)
+
+    def __len__(self) -> int:
+        return len(self.nombres)
+
+    def indices_vigentes(self, fecha: datetime) -> List[int]:
+        """Índices (en orden de prioridad) de las reglas vigentes en la fecha dada"""
+        return [
+            i
+            for i, (activo, inicio, fin) in enumerate(zip(self.activos, self.inicios, self.fines))
+            if activo and fin is not None and inicio <= fecha <= fin
+        ]
+
+
 class CalculadoraPrecios:
     """
     Clase auxiliar para cálculo de precios con reglas
@@ -188,60 +247,55 @@ class CalculadoraPrecios:
     @staticmethod
     def aplicar_reglas(
         precio_base: Decimal,
-        reglas: List[ReglaDePrecio],
+        reglas: Union[List[ReglaDePrecio], LoteReglasPrecio],
         fecha: Optional[datetime] = None
     ) -> CalculoPrecio:
         """
         Aplica las reglas de precio en orden de prioridad
         """
+        lote = reglas if isinstance(reglas, LoteReglasPrecio) else LoteReglasPrecio(reglas)
+        return CalculadoraPrecios.aplicar_reglas_lote(precio_base, lote, fecha)
+
+    @staticmethod
+    def aplicar_reglas_lote(
+        precio_base: Decimal,
+        lote: LoteReglasPrecio,
+        fecha: Optional[datetime] = None
+    ) -> CalculoPrecio:
+        """
+        Aplica un lote de reglas ya ordenado por prioridad
+        """
         if fecha is None:
-            fecha = datetime.utcnow()
-        
-        # Filtrar reglas vigentes
-        reglas_vigentes = [
-            regla for regla in reglas 
-            if regla.esta_vigente(fecha)
-        ]
-        
-        # Ordenar por prioridad (alta > media > baja)
-        orden_prioridad = {
-            TipoPrioridadRegla.ALTA: 3,
-            TipoPrioridadRegla.MEDIA: 2,
-            TipoPrioridadRegla.BAJA: 1
-        }
-        
-        reglas_ordenadas = sorted(
-            reglas_vigentes,
-            key=lambda r: orden_prioridad[r.prioridad],
-            reverse=True
-        )
+            fecha = utcnow()
         
-        precio_final = precio_base
-        multiplicador_total = 1
+        # Aritmética entera: centavos x centésimas; Decimal solo en el resultado
+        base_centavos = _a_centesimas(precio_base)
+        final_centavos = base_centavos
+        multiplicador_x100 = 1
+        decimales = 0
         reglas_aplicadas = []
         
-        for regla in reglas_ordenadas:
-            if regla.precio is not None:
+        for i in lote.indices_vigentes(fecha):
+            precio_centavos = lote.precios_centavos[i]
+            if precio_centavos is not None:
                 # Precio fijo
-                precio_final = regla.precio
+                final_centavos = precio_centavos
             else:
                 # Aplicar multiplicador
-                multiplicador_total *= regla.multiplicador
-                precio_final = precio_base * multiplicador_total
+                multiplicador_x100 *= lote.multiplicadores_x100[i]
+                decimales += 2
+                final_centavos = _dividir_redondeando(base_centavos * multiplicador_x100, 10 ** decimales)
             
-            reglas_aplicadas.append(regla.nombre)
+            reglas_aplicadas.append(lote.nombres[i])
         
-        q = Decimal("0.01")
-        precio_base_out = precio_base.quantize(q, rounding=ROUND_HALF_UP)
-        precio_final_out = precio_final.quantize(q, rounding=ROUND_HALF_UP)
-        descuento = precio_base_out - precio_final_out if precio_final_out < precio_base_out else None
+        descuento = base_centavos - final_centavos if final_centavos < base_centavos else None
         
         return CalculoPrecio(
-            precio_base=precio_base_out,
-            precio_final=precio_final_out,
+            precio_base=Decimal(base_centavos).scaleb(-2),
+            precio_final=Decimal(final_centavos).scaleb(-2),
             reglas_aplicadas=reglas_aplicadas,
-            multiplicador_total=multiplicador_total,
-            descuento_aplicado=descuento.quantize(q, rounding=ROUND_HALF_UP) if descuento is not None else None
+            multiplicador_total=Decimal(multiplicador_x100).scaleb(-decimales),
+            descuento_aplicado=Decimal(descuento).scaleb(-2) if descuento is not None else None
         )
     
     @staticmethod
@@ -3,6 +3,8 @@ from typing import Optional
 
 from sqlmodel import Field, SQLModel
 
+from .base import utcnow
+
 
 class UserProfessionalInfo(SQLModel, table=True):
     __tablename__ = "user_professional_info"
@@ -15,5 +17,5 @@ class UserProfessionalInfo(SQLModel, table=True):
     fecha_ingreso: Optional[date] = Field(default=None)
     id_empleado: Optional[str] = Field(default=None, max_length=50)
 
-    updated_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    updated_at: datetime = Field(default_factory=utcnow, index=True)
 
@@ -1,19 +1,40 @@
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import CheckConstraint, Column, Index, LargeBinary, func, text
 from sqlmodel import SQLModel, Field
 
 
 class RefreshToken(SQLModel, table=True):
     __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        CheckConstraint("length(token_hash) = 32", name="ck_refresh_tokens_token_hash_len"),
+        # La validación del refresh busca por hash y revisa expiración/revocación:
+        # index-only scan sobre un único índice cubriente.
+        Index(
+            "ix_refresh_tokens_hash_covering",
+            "token_hash",
+            unique=True,
+            postgresql_include=["user_id", "expires_at", "revoked_at", "jti"],
+        ),
+        # Solo lo usan los jobs de limpieza de tokens vigentes
+        Index(
+            "ix_refresh_tokens_expires_at_active",
+            "expires_at",
+            postgresql_where=text("revoked_at IS NULL"),
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="usuarios.id", index=True)
-    token_hash: str = Field(index=True, unique=True, max_length=128)
+    # HMAC-SHA256 crudo (32 bytes) del refresh token
+    token_hash: bytes = Field(sa_column=Column(LargeBinary(32), nullable=False))
     jti: str = Field(index=True, unique=True, max_length=64)
-    issued_at: datetime = Field(default_factory=datetime.utcnow, index=True)
-    expires_at: datetime = Field(index=True)
-    revoked_at: Optional[datetime] = Field(default=None, index=True)
-    replaced_by_token_hash: Optional[str] = Field(default=None, max_length=128)
+    issued_at: datetime = Field(
+        default=None, nullable=False, index=True, sa_column_kwargs={"server_default": func.now()}
+    )
+    expires_at: datetime
+    revoked_at: Optional[datetime] = None
+    replaced_by_token_hash: Optional[bytes] = Field(default=None, sa_column=Column(LargeBinary(32), nullable=True))
     user_agent: Optional[str] = Field(default=None, max_length=512)
     ip_address: Optional[str] = Field(default=None, max_length=64)
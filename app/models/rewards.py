@@ -1,9 +1,11 @@
 """
 Modelos de sistema de recompensas (premios y canjes) para la API BeCard
 """
-from sqlmodel import SQLModel, Field, Relationship
+from sqlmodel import SQLModel, Field, Relationship, Column, Index
+from sqlalchemy import Boolean, Computed, func, text
 from typing import Optional, List, TYPE_CHECKING
 from datetime import datetime, date
+from .base import utcnow
 
 # Importaciones para evitar referencias circulares
 if TYPE_CHECKING:
@@ -15,6 +17,16 @@ class CatalogoPremio(SQLModel, table=True):
     Catálogo de premios canjeables por puntos
     """
     __tablename__ = "catalogo_premios"
+    __table_args__ = (
+        # Listado de premios disponibles ordenado por puntos
+        Index(
+            "idx_catalogo_premios_disponibles",
+            "puntos_requeridos",
+            "nombre",
+            postgresql_where=text("disponible"),
+            postgresql_include=["fecha_vencimiento"],
+        ),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     nombre: str = Field(max_length=100, description="Nombre del premio")
@@ -24,8 +36,18 @@ class CatalogoPremio(SQLModel, table=True):
     stock_disponible: Optional[int] = Field(default=None, ge=0, description="Stock disponible del premio")
     imagen: Optional[str] = Field(default=None, description="URL de la imagen del premio")
     categoria: Optional[str] = Field(default=None, max_length=50, description="Categoría del premio")
-    fecha_creacion: datetime = Field(default_factory=datetime.utcnow)
+    fecha_creacion: datetime = Field(default_factory=utcnow)
     fecha_vencimiento: Optional[date] = Field(default=None, description="Fecha de vencimiento del premio")
+    # Columna generada: activo y con stock. El vencimiento depende de la fecha actual
+    # (no inmutable), por lo que se sigue filtrando en la consulta.
+    disponible: Optional[bool] = Field(
+        default=None,
+        sa_column=Column(
+            Boolean,
+            Computed("activo AND (stock_disponible IS NULL OR stock_disponible > 0)", persisted=True),
+        ),
+        description="Premio activo y con stock (calculado por la base de datos)"
+    )
     
     # Relaciones
     canjes: List["Canje"] = Relationship(back_populates="premio")
@@ -41,9 +63,14 @@ class Canje(SQLModel, table=True):
     id_usuario: int = Field(foreign_key="usuarios.id", index=True)
     id_premio: int = Field(foreign_key="catalogo_premios.id", index=True)
     puntos_utilizados: int = Field(gt=0, description="Puntos utilizados en el canje")
-    fecha_canje: datetime = Field(default_factory=datetime.utcnow, index=True)
+    fecha_canje: datetime = Field(
+        default=None, nullable=False, index=True, sa_column_kwargs={"server_default": func.now()}
+    )
     estado: str = Field(default="pendiente", max_length=20, description="pendiente, procesado, entregado, cancelado")
     notas: Optional[str] = Field(default=None, description="Notas adicionales del canje")
+    # Copia del premio al momento del canje (el historial no cambia si el catálogo se edita)
+    premio_nombre_snapshot: Optional[str] = Field(default=None, max_length=100)
+    premio_descripcion_snapshot: Optional[str] = Field(default=None)
     
     # Relaciones
     usuario: "Usuario" = Relationship(back_populates="canjes")
@@ -139,7 +166,7 @@ class ValidadorCanjes:
         Returns:
             Tupla (es_valido, mensaje_error)
         """
-        if not premio.activo:
+        if not premio.activo or (premio.stock_disponible is not None and premio.stock_disponible <= 0):
             return False, "El premio no está disponible actualmente"
         
         if puntos_usuario < premio.puntos_requeridos:
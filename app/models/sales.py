@@ -3,11 +3,13 @@ Modelos de ventas y transacciones para la API BeCard
 Incluye soporte para particionamiento por fecha
 """
 from sqlmodel import SQLModel, Field, Relationship, Index, Column
-from sqlalchemy import Integer, Numeric
-from typing import Optional, TYPE_CHECKING
-from datetime import datetime
+from sqlalchemy import ForeignKey, Integer, Numeric, func
+from typing import Iterator, Optional, TYPE_CHECKING
+from datetime import date, datetime
 from decimal import Decimal
 
+from dateutil.relativedelta import relativedelta
+
 # Importaciones para evitar referencias circulares
 if TYPE_CHECKING:
     from .user_extended import Usuario
@@ -27,7 +29,9 @@ class Venta(SQLModel, table=True):
     
     id: Optional[int] = Field(sa_column=Column(Integer, primary_key=True, autoincrement=True), default=None)
     id_ext: str = Field(unique=True, index=True)
-    fecha_hora: datetime = Field(default_factory=datetime.utcnow, index=True)
+    fecha_hora: datetime = Field(
+        default=None, nullable=False, sa_column_kwargs={"server_default": func.now()}
+    )
     cantidad_ml: int = Field(gt=0, description="Cantidad en mililitros")
     monto_total: Decimal = Field(
         sa_column=Column(Numeric(10, 2), nullable=False),
@@ -41,7 +45,10 @@ class Venta(SQLModel, table=True):
     notas: Optional[str] = Field(default=None, description="Notas adicionales")
     
     # Claves foráneas
-    id_usuario: Optional[int] = Field(foreign_key="usuarios.id", default=None, index=True)
+    # Borrar el usuario conserva la venta sin cliente (Usuario.ventas es write_only)
+    id_usuario: Optional[int] = Field(
+        default=None, index=True, sa_column_args=(ForeignKey("usuarios.id", ondelete="SET NULL"),)
+    )
     id_cerveza: Optional[int] = Field(foreign_key="cervezas.id", default=None, index=True)
     id_equipo: Optional[int] = Field(foreign_key="equipos.id", default=None, index=True)
     
@@ -55,7 +62,12 @@ class Venta(SQLModel, table=True):
         Index('idx_ventas_usuario', 'id_usuario'),
         Index('idx_ventas_cerveza', 'id_cerveza'),
         Index('idx_ventas_equipo', 'id_equipo'),
-        Index('idx_ventas_fecha_hora', 'fecha_hora'),
+        # fecha_hora crece con el orden de inserción: BRIN cubre los rangos
+        # de analítica con un índice mínimo; los btree compuestos quedan para búsquedas puntuales
+        Index(
+            'idx_ventas_fecha_hora_brin', 'fecha_hora',
+            postgresql_using='brin', postgresql_with={'pages_per_range': 32}
+        ),
         Index('idx_ventas_fecha_usuario', 'fecha_hora', 'id_usuario'),
         Index('idx_ventas_fecha_cerveza', 'fecha_hora', 'id_cerveza'),
     )
@@ -135,26 +147,24 @@ class ParticionVentas:
     """
     
     @staticmethod
-    def generar_nombre_particion(fecha: datetime) -> str:
+    def generar_nombre_particion(fecha: date) -> str:
         """Genera el nombre de la partición basado en la fecha"""
-        return f"ventas_{fecha.year}_{fecha.month:02d}"
+        return f"ventas_{fecha:%Y_%m}"
     
     @staticmethod
-    def obtener_rango_particion(fecha: datetime) -> tuple[str, str]:
+    def obtener_rango_particion(fecha: date) -> tuple[str, str]:
         """Obtiene el rango de fechas para una partición mensual"""
-        año = fecha.year
-        mes = fecha.month
-        
-        # Primer día del mes
-        fecha_inicio = f"{año}-{mes:02d}-01"
-        
-        # Primer día del siguiente mes
-        if mes == 12:
-            fecha_fin = f"{año + 1}-01-01"
-        else:
-            fecha_fin = f"{año}-{mes + 1:02d}-01"
-        
-        return fecha_inicio, fecha_fin
+        inicio = date(fecha.year, fecha.month, 1)
+        return inicio.isoformat(), (inicio + relativedelta(months=1)).isoformat()
+    
+    @staticmethod
+    def meses(desde: date, hasta: date) -> Iterator[date]:
+        """Primer día de cada mes entre ``desde`` y ``hasta`` (ambos meses incluidos)"""
+        mes = date(desde.year, desde.month, 1)
+        ultimo = date(hasta.year, hasta.month, 1)
+        while mes <= ultimo:
+            yield mes
+            mes += relativedelta(months=1)
     
     @staticmethod
     def crear_sql_particion(fecha: datetime) -> str:
@@ -170,6 +180,33 @@ class ParticionVentas:
         CREATE TABLE {nombre_particion} PARTITION OF ventas
         FOR VALUES FROM ('{fecha_inicio}') TO ('{fecha_fin}');
         """
+    
+    @staticmethod
+    def crear_sql_particiones(desde: datetime, hasta: datetime) -> str:
+        """
+        Genera en un solo script el SQL de todas las particiones mensuales
+        entre ``desde`` y ``hasta`` (ambos meses incluidos) junto con sus índices.
+        
+        Pensado para aprovisionar un año por adelantado con un único
+        ``conn.execute(text(sql))``. Los índices se crean sin CONCURRENTLY:
+        las particiones nuevas están vacías y CONCURRENTLY no puede ejecutarse
+        dentro de un bloque de varias sentencias.
+        """
+        sentencias: list[str] = []
+        
+        for mes in ParticionVentas.meses(desde, hasta):
+            tabla = ParticionVentas.generar_nombre_particion(mes)
+            fecha_inicio, fecha_fin = ParticionVentas.obtener_rango_particion(mes)
+            sentencias.append(
+                f"CREATE TABLE IF NOT EXISTS {tabla} PARTITION OF ventas "
+                f"FOR VALUES FROM ('{fecha_inicio}') TO ('{fecha_fin}');"
+            )
+            sentencias.extend(
+                indice.replace("CONCURRENTLY ", "").format(tabla=tabla)
+                for indice in INDICES_PARTICION
+            )
+        
+        return "\n".join(sentencias)
 
 
 # Configuración de índices adicionales para particiones
@@ -177,7 +214,7 @@ INDICES_PARTICION = [
     "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_{tabla}_usuario ON {tabla}(id_usuario);",
     "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_{tabla}_cerveza ON {tabla}(id_cerveza);",
     "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_{tabla}_equipo ON {tabla}(id_equipo);",
-    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_{tabla}_fecha_hora ON {tabla}(fecha_hora DESC);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_{tabla}_fecha_hora_brin ON {tabla} USING BRIN (fecha_hora) WITH (pages_per_range = 32);",
     "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_{tabla}_fecha_usuario ON {tabla}(fecha_hora, id_usuario);",
     "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_{tabla}_fecha_cerveza ON {tabla}(fecha_hora, id_cerveza);",
 ]
@@ -2,11 +2,11 @@
 Modelos de puntos de venta, equipos y barriles para la API BeCard
 """
 from sqlmodel import SQLModel, Field, Relationship, Column, Index
-from sqlalchemy import Numeric
+from sqlalchemy import Numeric, func, text, true
 from typing import Optional, List, TYPE_CHECKING
 from datetime import datetime, date
 from decimal import Decimal
-from .base import BaseModel, TimestampMixin
+from .base import BaseModel, TimestampMixin, TrustedReadMixin
 
 # Importaciones para evitar referencias circulares
 if TYPE_CHECKING:
@@ -72,7 +72,16 @@ class PuntoVenta(BaseModel, TimestampMixin, table=True):
 class Equipo(BaseModel, table=True):
     """Equipos de dispensado de cerveza"""
     __tablename__ = "equipos"
-    __table_args__ = (Index("ux_equipos_tenant_codigo", "tenant_id", "codigo_equipo", unique=True),)
+    __table_args__ = (
+        Index("ux_equipos_tenant_codigo", "tenant_id", "codigo_equipo", unique=True),
+        # Equipos habilitados para vender por punto de venta, sin join a tipos_estado_equipo
+        Index(
+            "equipos_disponibles",
+            "id_punto_de_venta",
+            postgresql_where=text("puede_vender AND activo"),
+            sqlite_where=text("puede_vender AND activo"),
+        ),
+    )
     
     id_estado_equipo: int = Field(foreign_key="tipos_estado_equipo.id")
     id_barril: int = Field(foreign_key="tipos_barril.id")
@@ -87,10 +96,16 @@ class Equipo(BaseModel, table=True):
     )
     ultima_limpieza: Optional[date] = Field(default=None, description="Fecha de última limpieza")
     proxima_limpieza: Optional[date] = Field(default=None, description="Fecha de próxima limpieza")
-    creado_el: datetime = Field(default_factory=datetime.utcnow)
+    creado_el: datetime = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
     id_punto_de_venta: Optional[int] = Field(foreign_key="puntos_de_venta.id", default=None)
     id_cerveza: Optional[int] = Field(foreign_key="cervezas.id", default=None)
     activo: bool = Field(default=True, index=True, description="Si el equipo está activo")
+    # Copia de estado_equipo.permite_ventas; EquipoService la actualiza al cambiar id_estado_equipo
+    puede_vender: bool = Field(
+        default=True,
+        sa_column_kwargs={"server_default": true()},
+        description="Si el estado actual del equipo permite ventas"
+    )
     
     # Relaciones
     estado_equipo: TipoEstadoEquipo = Relationship(back_populates="equipos")
@@ -117,10 +132,12 @@ class TipoEstadoEquipoCreate(TipoEstadoEquipoBase):
     pass
 
 
-class TipoEstadoEquipoRead(TipoEstadoEquipoBase):
-    """Esquema para leer tipo de estado de equipo"""
+class TipoEstadoEquipoRead(TrustedReadMixin, SQLModel):
+    """Esquema para leer tipo de estado de equipo (sin restricciones: datos ya validados)"""
     id: int
     id_ext: str
+    estado: str
+    permite_ventas: bool = True
 
 
 class TipoBarrilBase(SQLModel):
@@ -134,10 +151,12 @@ class TipoBarrilCreate(TipoBarrilBase):
     pass
 
 
-class TipoBarrilRead(TipoBarrilBase):
-    """Esquema para leer tipo de barril"""
+class TipoBarrilRead(TrustedReadMixin, SQLModel):
+    """Esquema para leer tipo de barril (sin restricciones: datos ya validados)"""
     id: int
     id_ext: str
+    capacidad: int
+    nombre: Optional[str] = None
 
 
 class PuntoVentaBase(SQLModel):
@@ -161,10 +180,22 @@ class PuntoVentaCreate(PuntoVentaBase):
     id_usuario_socio: Optional[int] = None
 
 
-class PuntoVentaRead(PuntoVentaBase):
-    """Esquema para leer punto de venta"""
+class PuntoVentaRead(TrustedReadMixin, SQLModel):
+    """Esquema para leer punto de venta (sin restricciones: datos ya validados)"""
     id: int
     id_ext: str
+    nombre: str
+    calle: str
+    altura: int
+    localidad: str
+    provincia: str
+    codigo_postal: Optional[str] = None
+    telefono: Optional[str] = None
+    email: Optional[str] = None
+    horario_apertura: Optional[str] = None
+    horario_cierre: Optional[str] = None
+    codigo_punto_venta: Optional[str] = None
+    activo: bool = True
     creado_el: datetime
     creado_por: Optional[int]
     id_usuario_socio: Optional[int]
@@ -207,10 +238,22 @@ class EquipoCreate(EquipoBase):
     pass
 
 
-class EquipoRead(EquipoBase):
-    """Esquema para leer equipo"""
+class EquipoRead(TrustedReadMixin, SQLModel):
+    """Esquema para leer equipo (sin restricciones: datos ya validados)"""
     id: int
     id_ext: str
+    nombre_equipo: Optional[str] = None
+    codigo_equipo: Optional[str] = None
+    id_barril: int
+    capacidad_actual: int
+    temperatura_actual: Optional[Decimal] = None
+    ultima_limpieza: Optional[date] = None
+    proxima_limpieza: Optional[date] = None
+    id_estado_equipo: int
+    id_punto_de_venta: Optional[int] = None
+    id_cerveza: Optional[int] = None
+    tenant_id: Optional[int] = None
+    puede_vender: bool = True
     creado_el: datetime
 
 
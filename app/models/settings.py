@@ -1,3 +1,4 @@
+from sqlalchemy import func
 from sqlmodel import Field, SQLModel
 from typing import Optional
 from datetime import datetime
@@ -19,5 +20,10 @@ class UserPreferencesDB(SQLModel, table=True):
     date_format: str = Field(default="YYYY-MM-DD", max_length=20)
     theme: str = Field(default="dark", max_length=20)
 
-    updated_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    updated_at: datetime = Field(
+        default=None,
+        nullable=False,
+        index=True,
+        sa_column_kwargs={"server_default": func.now(), "onupdate": func.now()},
+    )
 
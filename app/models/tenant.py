@@ -3,9 +3,10 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import Index, func
 from sqlmodel import Field, SQLModel
 
-from .base import BaseModel, TimestampMixin
+from .base import BaseModel, TimestampMixin, utcnow
 
 
 class Tenant(BaseModel, TimestampMixin, table=True):
@@ -23,6 +24,11 @@ class Tenant(BaseModel, TimestampMixin, table=True):
     suscripcion_moneda: str = Field(default="ARS", max_length=10)
     suscripcion_periodo_dias: int = Field(default=30)
 
+    __table_args__ = (
+        # Listado admin: WHERE activo = ? ORDER BY nombre, id sin paso de ordenamiento
+        Index("ix_tenants_activo_nombre_id", "activo", "nombre", "id"),
+    )
+
 
 class TenantUser(SQLModel, table=True):
     __tablename__ = "tenant_users"
@@ -30,17 +36,17 @@ class TenantUser(SQLModel, table=True):
     tenant_id: int = Field(foreign_key="tenants.id", primary_key=True)
     user_id: int = Field(foreign_key="usuarios.id", primary_key=True)
     rol: str = Field(max_length=30, default="member")
-    creado_el: datetime = Field(default_factory=datetime.utcnow)
+    creado_el: datetime = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
 
 
 class TenantPayment(BaseModel, TimestampMixin, table=True):
     __tablename__ = "tenant_payments"
 
-    tenant_id: int = Field(foreign_key="tenants.id", index=True)
+    tenant_id: int = Field(foreign_key="tenants.id")
     amount_centavos: int = Field(default=0)
     currency: str = Field(default="ARS", max_length=10)
     status: str = Field(default="paid", max_length=20, index=True)
-    paid_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    paid_at: datetime = Field(default_factory=utcnow, index=True)
     payment_method: Optional[str] = Field(default=None, max_length=30)
     notes: Optional[str] = Field(default=None, max_length=500)
     failure_reason: Optional[str] = Field(default=None, max_length=200)
@@ -49,3 +55,9 @@ class TenantPayment(BaseModel, TimestampMixin, table=True):
     period_end: Optional[datetime] = Field(default=None, index=True)
     provider: Optional[str] = Field(default=None, max_length=30)
     provider_payment_id: Optional[str] = Field(default=None, max_length=120, index=True)
+
+    __table_args__ = (
+        # Cubre el filtro por tenant (reemplaza al índice simple) y el ORDER BY
+        # paid_at DESC, id DESC del listado: PostgreSQL lo recorre hacia atrás
+        Index("ix_tenant_payments_tenant_paid_at_id", "tenant_id", "paid_at", "id"),
+    )
@@ -1,12 +1,18 @@
 """
 Modelos de transacciones de puntos y pagos para la API BeCard
 """
-from sqlmodel import SQLModel, Field, Relationship, Index, Column
-from sqlalchemy import Numeric
-from typing import Optional, List, TYPE_CHECKING
-from datetime import datetime
-from decimal import Decimal
+from sqlmodel import SQLModel, Field, Relationship, Index, Column, Session, select
+from sqlalchemy import BigInteger, Enum as SAEnum, Numeric, func, insert, literal_column, text
+from typing import Iterable, Optional, List, TYPE_CHECKING
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 from enum import Enum
+from operator import attrgetter
+
+from pydantic import model_validator
+
+from .base import TrustedReadMixin
+from .sales import ParticionVentas
 
 # Importaciones para evitar referencias circulares
 if TYPE_CHECKING:
@@ -30,7 +36,7 @@ class TransaccionPuntos(SQLModel, table=True):
     __tablename__ = "transacciones_puntos"
     
     id: Optional[int] = Field(default=None, primary_key=True)
-    id_usuario: int = Field(foreign_key="usuarios.id", index=True)
+    id_usuario: int = Field(foreign_key="usuarios.id")
     puntos_ganados: int = Field(default=0, ge=0, description="Puntos ganados en esta transacción")
     puntos_canjeados: int = Field(default=0, ge=0, description="Puntos canjeados en esta transacción")
     saldo_anterior: int = Field(ge=0, description="Saldo antes de la transacción")
@@ -41,7 +47,9 @@ class TransaccionPuntos(SQLModel, table=True):
         foreign_key="canjes.id",
         description="Canje que usó los puntos"
     )
-    fecha: datetime = Field(default_factory=datetime.utcnow, index=True)
+    fecha: datetime = Field(
+        default=None, nullable=False, index=True, sa_column_kwargs={"server_default": func.now()}
+    )
     descripcion: Optional[str] = Field(default=None, description="Descripción de la transacción")
     tipo_transaccion: str = Field(max_length=20, description="venta, canje, ajuste, bono, referido")
     
@@ -51,9 +59,17 @@ class TransaccionPuntos(SQLModel, table=True):
     
     # Índices
     __table_args__ = (
-        Index('idx_transacciones_puntos_usuario', 'id_usuario'),
-        Index('idx_transacciones_puntos_fecha', 'fecha'),
-        Index('idx_transacciones_puntos_usuario_fecha', 'id_usuario', 'fecha'),
+        # Saldo y últimos N movimientos por usuario: index-only scan en Postgres
+        Index(
+            'idx_transacciones_cover',
+            'id_usuario',
+            literal_column('fecha').desc(),
+            postgresql_include=['puntos_ganados', 'puntos_canjeados'],
+        ),
+        # Filtros solo_ganados / solo_canjeados: el predicado de la consulta debe
+        # coincidir literalmente con el WHERE del índice parcial
+        Index('idx_trans_solo_ganados', 'id_usuario', 'fecha', postgresql_where=text('puntos_ganados > 0')),
+        Index('idx_trans_solo_canjeados', 'id_usuario', 'fecha', postgresql_where=text('puntos_canjeados > 0')),
     )
 
 
@@ -65,22 +81,32 @@ class Pago(SQLModel, table=True):
     __tablename__ = "pagos"
     
     id: Optional[int] = Field(default=None, primary_key=True)
-    id_venta: int = Field(index=True, description="ID de la venta asociada")
+    id_venta: int = Field(description="ID de la venta asociada")
     fecha_venta: datetime = Field(
         index=True,
         description="Fecha de la venta (para FK a tabla particionada)"
     )
-    id_metodo_pago: int = Field(foreign_key="tipos_metodo_pago.id", index=True)
-    monto: Decimal = Field(
-        sa_column=Column(Numeric(10, 2), nullable=False),
-        description="Monto del pago"
+    id_metodo_pago: int = Field(foreign_key="tipos_metodo_pago.id")
+    monto_centavos: int = Field(
+        sa_column=Column(BigInteger, nullable=False),
+        description="Monto del pago en centavos"
+    )
+    # DEPRECATED: reemplazado por monto_centavos, ya no se escribe
+    monto: Optional[Decimal] = Field(
+        default=None,
+        sa_column=Column(Numeric(10, 2), nullable=True),
+        description="Monto del pago (obsoleto)"
+    )
+    # ENUM nativo de Postgres (4 bytes por fila), creado en la migración inicial
+    estado: TipoEstadoPago = Field(
+        sa_column=Column(SAEnum(TipoEstadoPago, name="tipoestadopago"), nullable=False),
+        description="Estado del pago"
     )
-    estado: TipoEstadoPago = Field(index=True, description="Estado del pago")
     id_transaccion_proveedor: Optional[str] = Field(
         default=None,
         description="ID de transacción del proveedor de pago"
     )
-    fecha_pago: datetime = Field(default_factory=datetime.utcnow, index=True)
+    fecha_pago: datetime = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
     fecha_actualizacion: Optional[datetime] = Field(default=None, description="Última actualización del estado")
     motivo_rechazo: Optional[str] = Field(default=None, description="Razón si fue rechazado")
     
@@ -89,11 +115,12 @@ class Pago(SQLModel, table=True):
     
     # Índices
     __table_args__ = (
-        Index('idx_pagos_venta', 'id_venta'),
         Index('idx_pagos_metodo', 'id_metodo_pago'),
         Index('idx_pagos_estado', 'estado'),
         Index('idx_pagos_fecha', 'fecha_pago'),
         Index('idx_pagos_transaccion', 'id_transaccion_proveedor'),
+        # Pagos por venta (resúmenes de órdenes) sin visitar el heap
+        Index('idx_pagos_cover', 'id_venta', postgresql_include=['estado', 'monto_centavos', 'fecha_pago']),
     )
 
 
@@ -117,9 +144,18 @@ class TransaccionPuntosCreate(TransaccionPuntosBase):
     pass
 
 
-class TransaccionPuntosRead(TransaccionPuntosBase):
-    """Esquema para leer transacción de puntos"""
+class TransaccionPuntosRead(TrustedReadMixin, SQLModel):
+    """Esquema para leer transacción de puntos (sin restricciones: datos ya validados)"""
     id: int
+    id_usuario: int
+    puntos_ganados: int = 0
+    puntos_canjeados: int = 0
+    saldo_anterior: int
+    saldo_posterior: int
+    id_venta: Optional[int] = None
+    id_canje: Optional[int] = None
+    descripcion: Optional[str] = None
+    tipo_transaccion: str
     fecha: datetime
 
 
@@ -148,7 +184,7 @@ class PagoBase(SQLModel):
     id_venta: int
     fecha_venta: datetime
     id_metodo_pago: int
-    monto: Decimal
+    monto_centavos: int
     estado: TipoEstadoPago
     id_transaccion_proveedor: Optional[str] = None
     motivo_rechazo: Optional[str] = None
@@ -159,11 +195,26 @@ class PagoCreate(SQLModel):
     id_venta: int
     fecha_venta: datetime
     id_metodo_pago: int
-    monto: Decimal
+    monto_centavos: int = Field(ge=0, le=10**12)
     id_transaccion_proveedor: Optional[str] = None
 
+    @model_validator(mode="before")
+    @classmethod
+    def _monto_legado(cls, data):
+        """Acepta el campo ``monto`` (decimal) de clientes anteriores. Quitar en la próxima versión."""
+        if isinstance(data, dict) and "monto" in data and "monto_centavos" not in data:
+            data = dict(data)
+            try:
+                monto = Decimal(str(data.pop("monto")))
+                if not monto.is_finite():
+                    raise ValueError
+                data["monto_centavos"] = int((monto * 100).to_integral_value(ROUND_HALF_UP))
+            except (InvalidOperation, ValueError, OverflowError):
+                raise ValueError("monto inválido") from None
+        return data
+
 
-class PagoRead(PagoBase):
+class PagoRead(TrustedReadMixin, PagoBase):
     """Esquema para leer pago"""
     id: int
     fecha_pago: datetime
@@ -180,7 +231,7 @@ class PagoUpdate(SQLModel):
 class PagoResumen(SQLModel):
     """Esquema para resumen de pagos"""
     total_pagos: int
-    monto_total: Decimal
+    monto_total: int = Field(description="Suma de pagos en centavos")
     aprobados: int
     rechazados: int
     pendientes: int
@@ -190,24 +241,55 @@ class PagoResumen(SQLModel):
 
 # Utilidades para manejo de transacciones
 
+_puntos_ganados = attrgetter("puntos_ganados")
+_puntos_canjeados = attrgetter("puntos_canjeados")
+
+
 class GestorTransaccionesPuntos:
     """Gestor para operaciones de transacciones de puntos"""
     
     @staticmethod
-    def calcular_saldo(transacciones: List[TransaccionPuntos]) -> int:
+    def calcular_saldo(transacciones: Iterable[TransaccionPuntos]) -> int:
         """
         Calcula el saldo actual de puntos basado en las transacciones
         
+        Obsoleto cuando hay sesión disponible: usar ``saldo_db``, que agrega en
+        la base de datos sin traer las filas.
+        
         Args:
-            transacciones: Lista de transacciones del usuario
+            transacciones: Transacciones del usuario (lista o cualquier iterable)
             
         Returns:
             Saldo actual de puntos
         """
-        saldo = 0
-        for t in transacciones:
-            saldo += t.puntos_ganados - t.puntos_canjeados
-        return saldo
+        # Se recorre dos veces: un generador o ScalarResult se materializa antes
+        if not isinstance(transacciones, (list, tuple)):
+            transacciones = list(transacciones)
+        return (
+            sum(map(_puntos_ganados, transacciones))
+            - sum(map(_puntos_canjeados, transacciones))
+        )
+    
+    @staticmethod
+    def saldo_db(session: Session, id_usuario: int) -> int:
+        """Calcula el saldo de puntos del usuario con un SUM en la base de datos"""
+        statement = select(
+            func.coalesce(func.sum(TransaccionPuntos.puntos_ganados - TransaccionPuntos.puntos_canjeados), 0)
+        ).where(TransaccionPuntos.id_usuario == id_usuario)
+        return int(session.exec(statement).one())
+    
+    @staticmethod
+    def crear_transacciones_bulk(session: Session, creates: List[TransaccionPuntosCreate]) -> None:
+        """
+        Inserta varias transacciones con un único executemany (insertmanyvalues)
+        en lugar de un INSERT por fila vía ``session.add``.
+        
+        Pensado para otorgamientos masivos (campañas de bonos, referidos). No
+        actualiza el saldo cacheado: el llamador debe aplicar los deltas.
+        """
+        if not creates:
+            return
+        session.execute(insert(TransaccionPuntos), [c.model_dump() for c in creates])
     
     @staticmethod
     def crear_transaccion_venta(
@@ -254,3 +336,111 @@ class GestorTransaccionesPuntos:
             tipo_transaccion="canje",
             descripcion=descripcion
         )
+
+
+class ParticionTransacciones:
+    """
+    Clase auxiliar para particionar por mes ``transacciones_puntos`` (por ``fecha``)
+    y ``pagos`` (por ``fecha_pago``)
+    
+    Nota: Igual que ParticionVentas, estas funciones son para referencia. El
+    particionamiento real se configura a nivel de base de datos PostgreSQL: la
+    clave primaria de la tabla particionada debe incluir la columna de partición,
+    por lo que los modelos siguen declarando ``id`` como única clave.
+    """
+    
+    COLUMNA_PARTICION = {
+        "transacciones_puntos": "fecha",
+        "pagos": "fecha_pago",
+    }
+    
+    # Índices (nombre, definición) declarados sobre la tabla padre: Postgres los
+    # propaga a cada partición
+    INDICES_PADRE = {
+        "transacciones_puntos": [
+            ("idx_transacciones_cover", "(id_usuario, fecha DESC) INCLUDE (puntos_ganados, puntos_canjeados)"),
+            ("ix_transacciones_puntos_fecha", "(fecha)"),
+            ("idx_trans_solo_ganados", "(id_usuario, fecha) WHERE puntos_ganados > 0"),
+            ("idx_trans_solo_canjeados", "(id_usuario, fecha) WHERE puntos_canjeados > 0"),
+        ],
+        "pagos": [
+            ("idx_pagos_cover", "(id_venta) INCLUDE (estado, monto_centavos, fecha_pago)"),
+            ("idx_pagos_metodo", "(id_metodo_pago)"),
+            ("idx_pagos_estado", "(estado)"),
+            ("idx_pagos_fecha", "(fecha_pago)"),
+            ("idx_pagos_transaccion", "(id_transaccion_proveedor)"),
+        ],
+    }
+    
+    @staticmethod
+    def generar_nombre_particion(tabla: str, fecha: date) -> str:
+        """Genera el nombre de la partición basado en la fecha"""
+        return f"{tabla}_{fecha:%Y_%m}"
+    
+    @staticmethod
+    def crear_sql_particiones(tabla: str, desde: date, hasta: date) -> str:
+        """
+        Genera el SQL de las particiones mensuales de ``tabla`` entre ``desde``
+        y ``hasta`` (ambos meses incluidos)
+        """
+        sentencias: List[str] = []
+        for mes in ParticionVentas.meses(desde, hasta):
+            fecha_inicio, fecha_fin = ParticionVentas.obtener_rango_particion(mes)
+            sentencias.append(
+                f"CREATE TABLE IF NOT EXISTS {ParticionTransacciones.generar_nombre_particion(tabla, mes)} "
+                f"PARTITION OF {tabla} FOR VALUES FROM ('{fecha_inicio}') TO ('{fecha_fin}');"
+            )
+        return "\n".join(sentencias)
+    
+    @staticmethod
+    def crear_sql_conversion(tabla: str, desde: date, hasta: date) -> str:
+        """
+        Genera el script para convertir ``tabla`` en una tabla particionada por
+        rango mensual, copiando las filas existentes
+        
+        Ejecutar en una ventana de mantenimiento: renombra la tabla actual a
+        ``{tabla}_legacy`` y no la elimina. ``desde``/``hasta`` deben cubrir
+        las fechas de todas las filas existentes.
+        
+        ``LIKE`` no copia las claves foráneas: se recrean desde el modelo
+        después de copiar las filas. La secuencia de ``id`` pasa a pertenecer a
+        la tabla nueva, así ``DROP TABLE {tabla}_legacy`` no se la lleva.
+        """
+        columna = ParticionTransacciones.COLUMNA_PARTICION[tabla]
+        indices = ParticionTransacciones.INDICES_PADRE[tabla]
+        claves_foraneas = sorted(
+            SQLModel.metadata.tables[tabla].foreign_key_constraints,
+            key=lambda fk: fk.column_keys,
+        )
+        sentencias = [
+            f"ALTER TABLE {tabla} RENAME TO {tabla}_legacy;",
+            # Los nombres de índice son únicos por esquema: liberarlos para la tabla nueva
+            *(f"ALTER INDEX IF EXISTS {nombre} RENAME TO {nombre}_legacy;" for nombre, _ in indices),
+            f"CREATE TABLE {tabla} (LIKE {tabla}_legacy INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            f"PARTITION BY RANGE ({columna});",
+            f"ALTER TABLE {tabla} ADD PRIMARY KEY (id, {columna});",
+            ParticionTransacciones.crear_sql_particiones(tabla, desde, hasta),
+            *(f"CREATE INDEX IF NOT EXISTS {nombre} ON {tabla} {definicion};" for nombre, definicion in indices),
+            f"INSERT INTO {tabla} SELECT * FROM {tabla}_legacy;",
+            f"ALTER SEQUENCE {tabla}_id_seq OWNED BY {tabla}.id;",
+            *(
+                f"ALTER TABLE {tabla} ADD CONSTRAINT {tabla}_{'_'.join(fk.column_keys)}_fkey "
+                f"FOREIGN KEY ({', '.join(fk.column_keys)}) "
+                f"REFERENCES {fk.referred_table.name} ({', '.join(e.column.name for e in fk.elements)});"
+                for fk in claves_foraneas
+            ),
+        ]
+        return "\n".join(sentencias)
+    
+    @staticmethod
+    def crear_sql_partman(tabla: str, premake: int = 3) -> str:
+        """
+        Registra la tabla en pg_partman para que su mantenimiento
+        (``partman.run_maintenance_proc()``) cree las particiones futuras
+        """
+        columna = ParticionTransacciones.COLUMNA_PARTICION[tabla]
+        return (
+            f"SELECT partman.create_parent(p_parent_table => 'public.{tabla}', "
+            f"p_control => '{columna}', p_interval => '1 month', p_premake => {premake});"
+        )
+
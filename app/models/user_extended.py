@@ -2,11 +2,16 @@
 Modelos extendidos de usuario para la API BeCard
 Incluye roles, niveles, métodos de pago y referidos
 """
-from sqlmodel import SQLModel, Field, Relationship
+import re
+
+from pydantic import ConfigDict
+from sqlalchemy import ForeignKey, Index, String, and_, text
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlmodel import SQLModel, Field, Relationship, func
 from typing import Optional, List, TYPE_CHECKING
 from datetime import datetime, date
 from decimal import Decimal
-from .base import BaseModel, TimestampMixin, TipoSexo
+from .base import BaseModel, TimestampMixin, TipoSexo, TrustedReadMixin, utcnow
 
 # Importaciones para evitar referencias circulares
 if TYPE_CHECKING:
@@ -15,13 +20,21 @@ if TYPE_CHECKING:
     from .sales import Venta
 
 
+# Compilado una sola vez; el Field de Usuario.email reutiliza el mismo patrón
+EMAIL_RE = re.compile(r'^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$')
+
+# Códigos de QR/referido: en Postgres con collation "C" la comparación del B-tree
+# es byte a byte (memcmp) en lugar de pasar por las reglas de la collation local
+CODIGO_TYPE = String(20).with_variant(String(20, collation="C"), "postgresql")
+
+
 class TipoRolUsuario(BaseModel, table=True):
     """Tipos de rol de usuario (sin asignar, cliente, socio, admin)"""
     __tablename__ = "tipos_rol_usuario"
     
     tipo: str = Field(max_length=50, unique=True)
     descripcion: Optional[str] = Field(default=None, description="Descripción del rol")
-    creado_el: datetime = Field(default_factory=datetime.utcnow)
+    creado_el: datetime = Field(default_factory=utcnow)
     
     # Relaciones
     usuarios_roles: List["UsuarioRol"] = Relationship(back_populates="rol")
@@ -68,6 +81,8 @@ class TipoMetodoPago(BaseModel, table=True):
 class Usuario(BaseModel, table=True):
     """Modelo principal de usuario extendido"""
     __tablename__ = "usuarios"
+    # Los hybrid_property no son campos de pydantic
+    model_config = ConfigDict(ignored_types=(hybrid_property,))
     
     # Identificación
     nombre_usuario: Optional[str] = Field(max_length=50, unique=True, index=True, default=None)
@@ -75,6 +90,7 @@ class Usuario(BaseModel, table=True):
         max_length=20, 
         unique=True, 
         index=True,
+        sa_type=CODIGO_TYPE,
         description="Código único para QR (usado por guests y app users)"
     )
     
@@ -93,10 +109,9 @@ class Usuario(BaseModel, table=True):
         unique=True, 
         index=True,
         default=None,
-        regex=r'^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$'
+        regex=EMAIL_RE.pattern
     )
-    password_hash: Optional[str] = Field(default=None)
-    password_salt: Optional[str] = Field(default=None)
+    # El hash de la contraseña vive en usuarios_credenciales (ver UsuarioCredenciales)
     
     # Tipo de registro
     tipo_registro: str = Field(
@@ -107,32 +122,58 @@ class Usuario(BaseModel, table=True):
     )
     
     # Estado y seguridad
-    fecha_creacion: datetime = Field(default_factory=datetime.utcnow, index=True)
+    fecha_creacion: datetime = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
     ultimo_login: Optional[datetime] = Field(default=None)
-    activo: bool = Field(default=True, index=True)
+    activo: bool = Field(default=True)
     verificado: bool = Field(default=False, description="Si el email está verificado")
     intentos_login_fallidos: int = Field(default=0, ge=0, description="Contador para bloqueo de seguridad")
     bloqueado_hasta: Optional[datetime] = Field(default=None, description="Fecha hasta la cual está bloqueado")
     
     # Metadata para guests
+    # Indexado para "guests de un socio" y para que borrar un socio no recorra la
+    # tabla entera buscando filas que lo referencian
     registrado_por: Optional[int] = Field(
-        foreign_key="usuarios.id",
         default=None,
+        index=True,
+        sa_column_args=(ForeignKey("usuarios.id", ondelete="SET NULL"),),
         description="ID del socio que registró este guest"
     )
 
     tenant_id: Optional[int] = Field(foreign_key="tenants.id", default=None, index=True)
     
+    # Nivel y saldo de puntos vigentes en la propia fila: las lecturas no necesitan
+    # unir usuarios_niveles, que queda como registro de asignaciones de nivel
+    id_nivel_actual: Optional[int] = Field(foreign_key="tipo_nivel_usuario.id", default=None, index=True)
+    puntaje_cache: int = Field(default=0, sa_column_kwargs={"server_default": text("0")})
+    
     # Relaciones
+    credenciales: Optional["UsuarioCredenciales"] = Relationship(
+        back_populates="usuario",
+        sa_relationship_kwargs={"uselist": False, "cascade": "all, delete-orphan"}
+    )
     roles: List["UsuarioRol"] = Relationship(
         back_populates="usuario",
         sa_relationship_kwargs={"foreign_keys": "UsuarioRol.id_usuario"}
     )
-    canjes: List["Canje"] = Relationship(back_populates="usuario")
-    transacciones_puntos: List["TransaccionPuntos"] = Relationship(back_populates="usuario")
+    # Historiales sin cota (ventas, canjes, movimientos, referidos): write_only nunca
+    # materializa la colección completa; consultar con p. ej.
+    # ``session.scalars(usuario.ventas.select().limit(50))``. passive_deletes: borrar el
+    # usuario no los carga; ventas y referidos quedan con la FK en NULL (ON DELETE SET
+    # NULL) y canjes/transacciones los borra ``UserService.hard_delete_user``
+    canjes: List["Canje"] = Relationship(
+        back_populates="usuario",
+        sa_relationship_kwargs={"lazy": "write_only", "passive_deletes": True}
+    )
+    transacciones_puntos: List["TransaccionPuntos"] = Relationship(
+        back_populates="usuario",
+        sa_relationship_kwargs={"lazy": "write_only", "passive_deletes": True}
+    )
     nivel: Optional["UsuarioNivel"] = Relationship(back_populates="usuario")
     metodos_pago: List["UsuarioMetodoPago"] = Relationship(back_populates="usuario")
-    ventas: List["Venta"] = Relationship(back_populates="usuario")
+    ventas: List["Venta"] = Relationship(
+        back_populates="usuario",
+        sa_relationship_kwargs={"lazy": "write_only", "passive_deletes": True}
+    )
     cervezas_creadas: List["Cerveza"] = Relationship(back_populates="creador")
     puntos_venta: List["PuntoVenta"] = Relationship(
         back_populates="socio",
@@ -140,20 +181,78 @@ class Usuario(BaseModel, table=True):
     )
     referidos_generados: List["Referido"] = Relationship(
         back_populates="usuario_generador",
-        sa_relationship_kwargs={"foreign_keys": "Referido.id_usuario_generador"}
+        sa_relationship_kwargs={"foreign_keys": "Referido.id_usuario_generador", "lazy": "write_only", "passive_deletes": True}
     )
     referidos_recibidos: List["Referido"] = Relationship(
         back_populates="usuario_referido", 
-        sa_relationship_kwargs={"foreign_keys": "Referido.id_usuario_referido"}
+        sa_relationship_kwargs={"foreign_keys": "Referido.id_usuario_referido", "lazy": "write_only", "passive_deletes": True}
+    )
+    
+    __table_args__ = (
+        # Casi todas las consultas filtran activo = true: índice parcial más chico
+        # que uno sobre el booleano completo
+        Index("ix_usuarios_activo_true", "id", postgresql_where=text("activo"), sqlite_where=text("activo")),
+        # Listado admin: filtros activo/verificado + ORDER BY id DESC sobre cuentas con email
+        Index(
+            "ix_usuarios_activo_verificado_id",
+            "activo",
+            "verificado",
+            "id",
+            postgresql_where=text("email IS NOT NULL"),
+            sqlite_where=text("email IS NOT NULL"),
+        ),
     )
     
+    # hybrid_property: en una instancia se evalúa en Python y sobre la clase genera
+    # la expresión SQL, así ``select(Usuario).where(Usuario.is_guest)`` filtra en la base
+    @hybrid_property
     def is_guest(self) -> bool:
         """Verifica si el usuario es guest (sin cuenta)"""
         return self.tipo_registro == 'punto_venta' and self.email is None
-    
+
+    @is_guest.expression
+    def is_guest(cls):
+        return and_(cls.tipo_registro == 'punto_venta', cls.email.is_(None))
+
+    @hybrid_property
     def can_login(self) -> bool:
         """Verifica si el usuario puede hacer login"""
-        return self.email is not None and self.password_hash is not None
+        return self.email is not None and self.credenciales is not None
+
+    @can_login.expression
+    def can_login(cls):
+        return and_(cls.email.is_not(None), cls.credenciales.has())
+
+    @property
+    def password_hash(self) -> Optional[str]:
+        """Hash de la contraseña; carga ``credenciales`` solo cuando se pide"""
+        return self.credenciales.password_hash if self.credenciales is not None else None
+
+    @password_hash.setter
+    def password_hash(self, valor: str) -> None:
+        if self.credenciales is None:
+            self.credenciales = UsuarioCredenciales(password_hash=valor)
+        else:
+            self.credenciales.password_hash = valor
+
+
+class UsuarioCredenciales(SQLModel, table=True):
+    """
+    Credenciales de acceso de un usuario (1:1 con ``usuarios``).
+
+    Separadas de la fila del usuario porque solo se leen al autenticar o cambiar
+    la contraseña: los listados y lecturas de perfil recorren filas más chicas.
+    """
+    __tablename__ = "usuarios_credenciales"
+    
+    id_usuario: int = Field(
+        primary_key=True,
+        sa_column_args=(ForeignKey("usuarios.id", ondelete="CASCADE"),)
+    )
+    password_hash: str
+    password_salt: Optional[str] = Field(default=None, description="Sin uso: bcrypt incluye la sal en el hash")
+    
+    usuario: Usuario = Relationship(back_populates="credenciales")
 
 
 class UsuarioRol(SQLModel, table=True):
@@ -162,7 +261,7 @@ class UsuarioRol(SQLModel, table=True):
     
     id_usuario: int = Field(foreign_key="usuarios.id", primary_key=True)
     id_rol: int = Field(foreign_key="tipos_rol_usuario.id", primary_key=True)
-    fecha_asignacion: datetime = Field(default_factory=datetime.utcnow)
+    fecha_asignacion: datetime = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
     asignado_por: Optional[int] = Field(default=None, foreign_key="usuarios.id", description="Quién asignó el rol")
     fecha_revocacion: Optional[datetime] = Field(default=None, description="Fecha de revocación del rol")
     
@@ -180,8 +279,8 @@ class UsuarioNivel(SQLModel, table=True):
     
     id_usuario: int = Field(foreign_key="usuarios.id", primary_key=True)
     id_nivel: int = Field(foreign_key="tipo_nivel_usuario.id")
-    fecha_asignacion: datetime = Field(default_factory=datetime.utcnow)
-    puntaje_actual: int = Field(default=0, ge=0, description="Cache del puntaje actual")
+    fecha_asignacion: datetime = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
+    puntaje_actual: int = Field(default=0, ge=0, description="DEPRECATED: el saldo vigente está en Usuario.puntaje_cache")
     
     # Relaciones
     usuario: Usuario = Relationship(back_populates="nivel")
@@ -196,7 +295,7 @@ class UsuarioMetodoPago(SQLModel, table=True):
     id_metodo_pago: int = Field(foreign_key="tipos_metodo_pago.id", primary_key=True)
     proveedor_metodo_pago: str = Field(max_length=50)
     token_proveedor: str
-    fecha_creacion: datetime = Field(default_factory=datetime.utcnow)
+    fecha_creacion: datetime = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
     activo: bool = Field(default=True, description="Si el método está activo")
     fecha_expiracion: Optional[date] = Field(default=None, description="Fecha de expiración (ej: tarjetas)")
     
@@ -209,10 +308,15 @@ class Referido(BaseModel, table=True):
     """Sistema de referidos"""
     __tablename__ = "referidos"
     
-    id_usuario_generador: Optional[int] = Field(foreign_key="usuarios.id", default=None)
-    id_usuario_referido: Optional[int] = Field(foreign_key="usuarios.id", default=None)
-    codigo: str = Field(max_length=20, unique=True, index=True)
-    fecha_registro: datetime = Field(default_factory=datetime.utcnow)
+    # Borrar un usuario conserva el referido (las colecciones en Usuario son write_only)
+    id_usuario_generador: Optional[int] = Field(
+        default=None, sa_column_args=(ForeignKey("usuarios.id", ondelete="SET NULL"),)
+    )
+    id_usuario_referido: Optional[int] = Field(
+        default=None, sa_column_args=(ForeignKey("usuarios.id", ondelete="SET NULL"),)
+    )
+    codigo: str = Field(max_length=20, unique=True, index=True, sa_type=CODIGO_TYPE)
+    fecha_registro: datetime = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
     puntos_otorgados: int = Field(ge=0)
     estado: str = Field(default="pendiente", max_length=20, description="pendiente, activo, completado")
     fecha_activacion: Optional[datetime] = Field(default=None, description="Cuando el referido se activó")
@@ -235,6 +339,8 @@ class Referido(BaseModel, table=True):
 
 class UsuarioBase(SQLModel):
     """Esquema base para usuario"""
+    model_config = ConfigDict(frozen=True)
+    
     nombre_usuario: str = Field(max_length=50)
     nombres: str = Field(max_length=100)
     apellidos: str = Field(max_length=100)
@@ -250,7 +356,7 @@ class UsuarioCreate(UsuarioBase):
     password: str = Field(min_length=8, max_length=100)
 
 
-class UsuarioRead(UsuarioBase):
+class UsuarioRead(TrustedReadMixin, UsuarioBase):
     """Esquema para leer usuario"""
     id: int
     id_ext: str
@@ -263,6 +369,8 @@ class UsuarioRead(UsuarioBase):
 
 class UsuarioUpdate(SQLModel):
     """Esquema para actualizar usuario"""
+    model_config = ConfigDict(frozen=True)
+    
     nombres: Optional[str] = Field(default=None, max_length=100)
     apellidos: Optional[str] = Field(default=None, max_length=100)
     telefono: Optional[str] = Field(default=None, max_length=20)
@@ -276,12 +384,16 @@ class UsuarioUpdate(SQLModel):
 
 class RolUsuarioCreate(SQLModel):
     """Esquema para asignar rol a usuario"""
+    model_config = ConfigDict(frozen=True)
+    
     id_usuario: int
     id_rol: int
 
 
 class MetodoPagoCreate(SQLModel):
     """Esquema para crear método de pago"""
+    model_config = ConfigDict(frozen=True)
+    
     id_usuario: int
     id_metodo_pago: int
     proveedor_metodo_pago: str = Field(max_length=50)
@@ -290,6 +402,8 @@ class MetodoPagoCreate(SQLModel):
 
 class ReferidoCreate(SQLModel):
     """Esquema para crear referido"""
+    model_config = ConfigDict(frozen=True)
+    
     codigo: str = Field(max_length=20)
     id_usuario_generador: Optional[int] = None
     puntos_otorgados: int = Field(default=100)
@@ -1,15 +1,31 @@
 from __future__ import annotations
 
+import io
 from datetime import datetime
-from decimal import Decimal
-from typing import Optional
+from decimal import Decimal, ROUND_HALF_UP
+from itertools import islice
+from typing import Any, Iterable, Optional
 
-from sqlalchemy import Column, Numeric
-from sqlmodel import Field
+from sqlalchemy import BigInteger, Column, Index, insert, literal_column, text
+from sqlmodel import Field, Session, func
 
 from .base import BaseModel
 
 
+# Filas por lote en WalletTxn.bulk_append
+_TAMANO_LOTE_TXNS = 10_000
+
+
+def to_cents(amount: Decimal) -> int:
+    """Monto en moneda -> centavos enteros (redondeo half-up a 2 decimales)"""
+    return int((Decimal(str(amount)) * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def from_cents(cents: int) -> Decimal:
+    """Centavos enteros -> ``Decimal`` con 2 decimales"""
+    return Decimal(cents).scaleb(-2)
+
+
 class Wallet(BaseModel, table=True):
     __tablename__ = "wallets"
 
@@ -17,22 +33,113 @@ class Wallet(BaseModel, table=True):
     owner_type: str = Field(max_length=20, index=True)
     owner_user_id: Optional[int] = Field(foreign_key="usuarios.id", default=None, index=True)
     owner_card_id: Optional[int] = Field(foreign_key="cards.id", default=None, index=True)
-    balance: Decimal = Field(default=Decimal("0.00"), sa_column=Column(Numeric(12, 2), nullable=False))
-    activo: bool = Field(default=True, index=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    # Montos en centavos enteros: aritmética entera en Python y BIGINT de 8 bytes en la base
+    balance_cents: int = Field(default=0, sa_column=Column(BigInteger, nullable=False, server_default=text("0")))
+    activo: bool = Field(default=True)
+    created_at: datetime = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
+
+    __table_args__ = (
+        # Las búsquedas de wallet siempre filtran activo = true
+        Index("ix_wallets_activo_owner_user", "owner_user_id", postgresql_where=text("activo"), sqlite_where=text("activo")),
+        Index("ix_wallets_activo_owner_card", "owner_card_id", postgresql_where=text("activo"), sqlite_where=text("activo")),
+    )
+
+    @property
+    def balance(self) -> Decimal:
+        return from_cents(self.balance_cents)
 
 
 class WalletTxn(BaseModel, table=True):
     __tablename__ = "wallet_txns"
 
-    wallet_id: int = Field(foreign_key="wallets.id", index=True)
+    wallet_id: int = Field(foreign_key="wallets.id")
     direction: str = Field(max_length=10, index=True)
-    amount: Decimal = Field(sa_column=Column(Numeric(12, 2), nullable=False))
-    balance_before: Decimal = Field(sa_column=Column(Numeric(12, 2), nullable=False))
-    balance_after: Decimal = Field(sa_column=Column(Numeric(12, 2), nullable=False))
+    amount_cents: int = Field(sa_column=Column(BigInteger, nullable=False))
+    balance_before_cents: int = Field(sa_column=Column(BigInteger, nullable=False))
+    balance_after_cents: int = Field(sa_column=Column(BigInteger, nullable=False))
     reference_type: Optional[str] = Field(default=None, max_length=30, index=True)
     reference_id: Optional[str] = Field(default=None, max_length=80, index=True)
-    idempotency_key: Optional[str] = Field(default=None, max_length=80, index=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    idempotency_key: Optional[str] = Field(default=None, max_length=80)
+    created_at: datetime = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
     created_by: Optional[int] = Field(foreign_key="usuarios.id", default=None, index=True)
 
+    __table_args__ = (
+        # Últimos N movimientos de una wallet sin sort; también cubre el prefijo wallet_id
+        Index("ix_wallet_txns_wallet_created", "wallet_id", literal_column("created_at").desc()),
+        # Deduplica reintentos en el propio INSERT (ver WalletService._apply)
+        Index(
+            "uq_wallet_txns_idem",
+            "wallet_id",
+            "direction",
+            "idempotency_key",
+            unique=True,
+            postgresql_where=text("idempotency_key IS NOT NULL"),
+            sqlite_where=text("idempotency_key IS NOT NULL"),
+        ),
+    )
+
+    @property
+    def amount(self) -> Decimal:
+        return from_cents(self.amount_cents)
+
+    @property
+    def balance_before(self) -> Decimal:
+        return from_cents(self.balance_before_cents)
+
+    @property
+    def balance_after(self) -> Decimal:
+        return from_cents(self.balance_after_cents)
+
+    @classmethod
+    def bulk_append(cls, session: Session, rows: Iterable["WalletTxn"], *, use_copy: bool = False) -> int:
+        """
+        Agrega movimientos al libro en lotes de 10.000 filas sin pasar por la
+        unidad de trabajo del ORM. No hace commit ni actualiza ``Wallet.balance``.
+
+        Por defecto usa el ``INSERT`` de Core: el engine ya agrupa las filas con
+        insertmanyvalues (un ``INSERT ... VALUES`` multi-fila por página), que en
+        psycopg2 equivale a ``execute_values``. Con ``use_copy=True`` y PostgreSQL
+        envía cada lote con ``COPY ... FROM STDIN``, la vía más rápida para
+        importaciones grandes.
+
+        Returns:
+            Cantidad de filas insertadas
+        """
+        # id y las columnas con DEFAULT del servidor (created_at) las completa la base
+        columnas = [c.name for c in cls.__table__.columns if c.name != "id" and c.server_default is None]
+        usar_copy = use_copy and session.get_bind().dialect.name == "postgresql"
+        filas = iter(rows)
+        total = 0
+        while True:
+            lote = [{col: getattr(txn, col) for col in columnas} for txn in islice(filas, _TAMANO_LOTE_TXNS)]
+            if not lote:
+                return total
+            if usar_copy:
+                _copy_lote(session, cls.__tablename__, columnas, lote)
+            else:
+                session.execute(insert(cls), lote)
+            total += len(lote)
+
+
+def _valor_copy(valor: Any) -> str:
+    """Formato texto de COPY: ``\\N`` es NULL; escapar barra invertida y separadores"""
+    if valor is None:
+        return "\\N"
+    return (
+        str(valor)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _copy_lote(session: Session, tabla: str, columnas: list, lote: list) -> None:
+    buffer = io.StringIO()
+    for fila in lote:
+        buffer.write("\t".join(_valor_copy(fila[col]) for col in columnas))
+        buffer.write("\n")
+    buffer.seek(0)
+    # Conexión DBAPI (psycopg2) de la transacción en curso de la sesión
+    with session.connection().connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY {tabla} ({', '.join(columnas)}) FROM STDIN", buffer)
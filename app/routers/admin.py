@@ -1,21 +1,38 @@
 from __future__ import annotations
 
+import base64
+import binascii
+import json
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import or_
-from sqlmodel import Session, SQLModel, select, func
+from fastapi.responses import StreamingResponse
+from sqlalchemy import JSON, DateTime, Integer, and_, exists, insert, literal, or_, text, tuple_
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import raiseload
+from sqlmodel import Field, Session, SQLModel, select, func, update
 
 from app.core.database import get_session
 from app.core.config import settings
+from app.core.responses import PydanticJSONResponse, model_response
 from app.models.tenant import Tenant, TenantPayment, TenantUser
 from app.models.user_extended import TipoRolUsuario, Usuario, UsuarioRol
+from app.models.base import utcnow
 from app.routers.auth import require_admin
-from app.services.tenants import TenantService
+from app.core.cache import TTLCache
+from app.services.tenants import TenantService, admin_tenants_cache, invalidar_listado_admin
+from app.services.users import UserService
 
 
-router = APIRouter(prefix="/admin", tags=["admin"])
+router = APIRouter(prefix="/admin", tags=["admin"], default_response_class=PydanticJSONResponse)
+
+# Un barrido recién ejecutado no se repite: otra llamada dentro del TTL devuelve
+# el mismo resultado sin recorrer la tabla de tenants
+_sweep_cache = TTLCache(ttl_seconds=30, maxsize=1)
+
+# Filas por lote al transmitir los pagos de un tenant
+_PAYMENTS_BATCH = 50
 
 
 class AdminTenantBrief(SQLModel):
@@ -41,15 +58,22 @@ class AdminUserRow(SQLModel):
 
 class AdminUsersResponse(SQLModel):
     users: List[AdminUserRow]
-    total: int
+    total: Optional[int] = None
     skip: int
     limit: int
+    has_more: bool = False
+    next_cursor: Optional[str] = None
 
 
 class AdminSetActiveRequest(SQLModel):
     activo: bool
 
 
+class AdminBulkSetActiveRequest(SQLModel):
+    ids: List[int] = Field(min_length=1, max_length=1000)
+    activo: bool
+
+
 class AdminSetSubscriptionRequest(SQLModel):
     suscripcion_plan: Optional[str] = None
     suscripcion_estado: Optional[str] = None
@@ -137,15 +161,102 @@ class AdminTenantRow(SQLModel):
 
 class AdminTenantsResponse(SQLModel):
     tenants: List[AdminTenantRow]
-    total: int
+    total: Optional[int] = None
     skip: int
     limit: int
+    has_more: bool = False
+    next_cursor: Optional[str] = None
+
+
+def _encode_cursor(*values: Any) -> str:
+    """Cursor opaco con la clave de orden de la última fila de la página"""
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(",", ":")).encode()).decode()
+
+
+def _count_total(session: Session, stmt) -> Optional[int]:
+    """
+    COUNT(*) de un listado, acotado en PostgreSQL por ``admin_count_timeout_ms``.
+    Si se excede devuelve ``None``: el listado sale igual, sin total.
+    """
+    if session.get_bind().dialect.name != "postgresql":
+        return int(session.exec(stmt).one())
+    try:
+        # El savepoint descarta el SET LOCAL si el COUNT se cancela
+        with session.begin_nested():
+            session.execute(text(f"SET LOCAL statement_timeout = {int(settings.admin_count_timeout_ms)}"))
+            total = int(session.exec(stmt).one())
+            session.execute(text("SET LOCAL statement_timeout = DEFAULT"))
+    except OperationalError:
+        return None
+    return total
+
+
+def _json_array(session: Session, expr):
+    """Agregado JSON de ``expr``: ``json_agg`` en PostgreSQL, ``json_group_array`` en SQLite"""
+    if session.get_bind().dialect.name == "postgresql":
+        return func.json_agg(expr, type_=JSON)
+    return func.json_group_array(expr, type_=JSON)
+
+
+def _json_object(session: Session, **campos):
+    args = [arg for nombre, columna in campos.items() for arg in (literal(nombre), columna)]
+    if session.get_bind().dialect.name == "postgresql":
+        return func.json_build_object(*args)
+    return func.json_object(*args)
+
+
+def _dias_hasta(session: Session, columna, ahora):
+    """
+    Días enteros de ``ahora`` a ``columna`` redondeando hacia abajo, como
+    ``(columna - ahora).total_seconds() // 86400``; NULL si ``columna`` es NULL
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        return func.floor(func.extract("epoch", columna - ahora) / 86400).cast(Integer)
+    # SQLite: segundos enteros y división entera hacia abajo (``%`` conserva el
+    # signo del dividendo, de ahí el ajuste a un resto no negativo)
+    segundos = func.strftime("%s", columna).cast(Integer) - func.strftime("%s", ahora).cast(Integer)
+    return (segundos - (segundos % 86400 + 86400) % 86400) // 86400
+
+
+def _search_pattern(search: Optional[str]) -> Optional[str]:
+    """
+    Patrón LIKE sobre ``lower(col)``, servido en PostgreSQL por los índices GIN
+    ``gin_trgm_ops``. Con menos de 3 caracteres no hay trigramas que buscar en
+    ``%x%``: se busca como prefijo, que el índice sí puede usar.
+    """
+    search_norm = (search or "").strip().lower()
+    if not search_norm:
+        return None
+    if len(search_norm) < 3:
+        return f"{search_norm}%"
+    return f"%{search_norm}%"
+
+
+def _decode_cursor(cursor: str, types: Tuple[type, ...]) -> List[Any]:
+    """
+    Valores del cursor, uno por tipo de ``types``. Se exige el tipo exacto
+    (``bool`` no pasa por ``int``): un valor de otro tipo llegaría a la
+    comparación del keyset (DataError en PostgreSQL, comparación mixta en SQLite).
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        values = None
+    if (
+        not isinstance(values, list)
+        or len(values) != len(types)
+        or any(type(value) is not tipo for value, tipo in zip(values, types))
+    ):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido")
+    return values
 
 
 @router.get("/users", response_model=AdminUsersResponse)
 def admin_list_users(
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=50, ge=1, le=500),
+    cursor: Optional[str] = Query(default=None),
+    include_total: bool = Query(default=False),
     search: Optional[str] = Query(default=None),
     activo: Optional[bool] = Query(default=None),
     verificado: Optional[bool] = Query(default=None),
@@ -164,68 +275,80 @@ def admin_list_users(
         if verificado is not None:
             filters.append(Usuario.verificado == verificado)
 
-    if search:
-        search_norm = search.strip().lower()
-        if search_norm:
-            pattern = f"%{search_norm}%"
-            filters.append(
-                or_(
-                    func.lower(Usuario.email).like(pattern),
-                    func.lower(Usuario.nombre_usuario).like(pattern),
-                    func.lower(Usuario.nombres).like(pattern),
-                    func.lower(Usuario.apellidos).like(pattern),
-                )
+    # En SQL para que la página, el cursor y el total reflejen el filtro
+    if has_tenant is not None:
+        tiene_tenant = exists().where(TenantUser.user_id == Usuario.id)
+        filters.append(tiene_tenant if has_tenant else ~tiene_tenant)
+
+    pattern = _search_pattern(search)
+    if pattern:
+        filters.append(
+            or_(
+                func.lower(Usuario.email).like(pattern),
+                func.lower(Usuario.nombre_usuario).like(pattern),
+                func.lower(Usuario.nombres).like(pattern),
+                func.lower(Usuario.apellidos).like(pattern),
             )
+        )
 
-    stmt = select(Usuario).where(*filters).order_by(Usuario.id.desc()).offset(skip).limit(limit)
-    users = list(session.exec(stmt).all())
-    user_ids = [u.id for u in users if u.id is not None]
-
-    total_stmt = select(func.count()).select_from(Usuario).where(*filters)
-    total = int(session.exec(total_stmt).one())
-
-    roles_by_user: Dict[int, List[str]] = {uid: [] for uid in user_ids}
-    if user_ids:
-        role_rows = session.exec(
-            select(UsuarioRol.id_usuario, TipoRolUsuario.tipo)
-            .join(TipoRolUsuario, TipoRolUsuario.id == UsuarioRol.id_rol)
-            .where(UsuarioRol.id_usuario.in_(user_ids))
-            .where(UsuarioRol.fecha_revocacion.is_(None))
-        ).all()
-        for uid, role_tipo in role_rows:
-            if uid is not None:
-                roles_by_user.setdefault(uid, []).append(role_tipo)
-
-    tenants_by_user: Dict[int, List[AdminTenantBrief]] = {uid: [] for uid in user_ids}
-    if user_ids:
-        tenant_rows = session.exec(
-            select(
-                TenantUser.user_id,
-                Tenant.id,
-                Tenant.nombre,
-                Tenant.slug,
-                Tenant.activo,
-                TenantUser.rol,
-            )
-            .join(Tenant, Tenant.id == TenantUser.tenant_id)
-            .where(TenantUser.user_id.in_(user_ids))
-            .order_by(Tenant.nombre, Tenant.id)
-        ).all()
-        for user_id, tenant_id, nombre, slug, tenant_activo, rol in tenant_rows:
-            if user_id is None or tenant_id is None:
-                continue
-            tenants_by_user.setdefault(user_id, []).append(
-                AdminTenantBrief(
-                    id=int(tenant_id),
-                    nombre=str(nombre),
-                    slug=str(slug),
-                    activo=bool(tenant_activo),
-                    rol=str(rol),
-                )
+    # Paginación por clave (keyset): con ``cursor`` cada página es un rango del
+    # índice de la PK, sin recorrer y descartar las filas de páginas anteriores.
+    # ``skip`` queda para clientes que todavía paginan por offset.
+    # Roles y tenants de cada usuario como arrays JSON en la misma consulta:
+    # subconsultas correlacionadas (no JOIN + GROUP BY, que multiplicaría roles x tenants)
+    roles_json = (
+        select(_json_array(session, TipoRolUsuario.tipo))
+        .select_from(UsuarioRol)
+        .join(TipoRolUsuario, TipoRolUsuario.id == UsuarioRol.id_rol)
+        .where(UsuarioRol.id_usuario == Usuario.id, UsuarioRol.fecha_revocacion.is_(None))
+        .scalar_subquery()
+    )
+    tenants_json = (
+        select(
+            _json_array(
+                session,
+                _json_object(
+                    session,
+                    id=Tenant.id,
+                    nombre=Tenant.nombre,
+                    slug=Tenant.slug,
+                    activo=Tenant.activo,
+                    rol=TenantUser.rol,
+                ),
             )
+        )
+        .select_from(TenantUser)
+        .join(Tenant, Tenant.id == TenantUser.tenant_id)
+        .where(TenantUser.user_id == Usuario.id)
+        .scalar_subquery()
+    )
+
+    # raiseload: las filas se arman solo con columnas; tocar una relación por
+    # descuido falla en vez de disparar un SELECT por usuario
+    stmt = (
+        select(Usuario, roles_json, tenants_json)
+        .options(raiseload("*"))
+        .order_by(Usuario.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        (last_id,) = _decode_cursor(cursor, (int,))
+        stmt = stmt.where(*filters, Usuario.id < last_id)
+    else:
+        stmt = stmt.where(*filters).offset(skip)
+    results = list(session.exec(stmt).all())
+    next_cursor = None
+    if len(results) > limit:
+        results = results[:limit]
+        next_cursor = _encode_cursor(results[-1][0].id)
+    # El COUNT sobre los mismos filtros es opcional: para "¿hay otra página?"
+    # alcanza con la fila extra de ``limit + 1``
+    total = None
+    if include_total:
+        total = _count_total(session, select(func.count()).select_from(Usuario).where(*filters))
 
     rows = [
-        AdminUserRow(
+        AdminUserRow.model_construct(
             id=u.id,
             id_ext=str(u.id_ext),
             nombre_usuario=u.nombre_usuario,
@@ -234,19 +357,27 @@ def admin_list_users(
             apellidos=u.apellidos,
             activo=u.activo,
             verificado=u.verificado,
-            roles=sorted(set(roles_by_user.get(u.id, []))),
-            tenants=tenants_by_user.get(u.id, []),
+            roles=sorted(set(roles or [])),
+            tenants=[
+                AdminTenantBrief.model_construct(
+                    id=int(t["id"]),
+                    nombre=str(t["nombre"]),
+                    slug=str(t["slug"]),
+                    activo=bool(t["activo"]),
+                    rol=str(t["rol"]),
+                )
+                for t in sorted(tenants or [], key=lambda t: (t["nombre"], t["id"]))
+            ],
         )
-        for u in users
-        if u.id is not None
+        for u, roles, tenants in results
     ]
 
-    if has_tenant is True:
-        rows = [r for r in rows if len(r.tenants) > 0]
-    elif has_tenant is False:
-        rows = [r for r in rows if len(r.tenants) == 0]
-
-    return AdminUsersResponse(users=rows, total=total, skip=skip, limit=limit)
+    # Filas ya tipadas por la base: model_construct sin revalidar, y la respuesta
+    # se serializa directo (FastAPI no vuelve a validarla contra response_model)
+    response = AdminUsersResponse.model_construct(
+        users=rows, total=total, skip=skip, limit=limit, has_more=next_cursor is not None, next_cursor=next_cursor
+    )
+    return model_response(response)
 
 
 @router.patch("/users/{user_id}/active", status_code=status.HTTP_204_NO_CONTENT)
@@ -256,83 +387,124 @@ def admin_set_user_active(
     session: Session = Depends(get_session),
     _admin_user: Usuario = Depends(require_admin),
 ):
-    user = session.get(Usuario, user_id)
-    if user is None:
+    # Un solo UPDATE ... RETURNING: el 404 sale de que no haya fila afectada
+    updated = session.execute(
+        update(Usuario)
+        .where(Usuario.id == user_id)
+        .values(activo=payload.activo)
+        .returning(Usuario.id)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if updated is None:
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
-    user.activo = payload.activo
-    session.add(user)
     session.commit()
+    UserService.invalidate_user(user_id)
     return None
 
 
+@router.post("/users/bulk/active", response_model=dict)
+def admin_bulk_set_users_active(
+    payload: AdminBulkSetActiveRequest,
+    session: Session = Depends(get_session),
+    _admin_user: Usuario = Depends(require_admin),
+):
+    # Un único UPDATE ... WHERE id IN (...), sin cargar cada usuario
+    result = session.execute(
+        update(Usuario)
+        .where(Usuario.id.in_(payload.ids))
+        .values(activo=payload.activo)
+        .execution_options(synchronize_session=False)
+    )
+    session.commit()
+    for user_id in payload.ids:
+        UserService.invalidate_user(user_id)
+    return {"updated": result.rowcount}
+
+
 @router.get("/tenants", response_model=AdminTenantsResponse)
 def admin_list_tenants(
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=50, ge=1, le=500),
+    cursor: Optional[str] = Query(default=None),
+    include_total: bool = Query(default=False),
     search: Optional[str] = Query(default=None),
     activo: Optional[bool] = Query(default=None),
     session: Session = Depends(get_session),
     _admin_user: Usuario = Depends(require_admin),
 ):
+    # Polling del dashboard: unos segundos de desactualización son aceptables y
+    # los endpoints que modifican tenants invalidan la caché
+    cache_key = (skip, limit, cursor, include_total, search, activo)
+    cached = admin_tenants_cache.get(cache_key)
+    if cached is not None:
+        return model_response(cached)
+
     filters = []
     if activo is not None:
         filters.append(Tenant.activo == activo)
 
-    if search:
-        search_norm = search.strip().lower()
-        if search_norm:
-            pattern = f"%{search_norm}%"
-            filters.append(
-                or_(
-                    func.lower(Tenant.nombre).like(pattern),
-                    func.lower(Tenant.slug).like(pattern),
-                )
+    pattern = _search_pattern(search)
+    if pattern:
+        filters.append(
+            or_(
+                func.lower(Tenant.nombre).like(pattern),
+                func.lower(Tenant.slug).like(pattern),
             )
+        )
 
-    stmt = select(Tenant).where(*filters).order_by(Tenant.nombre, Tenant.id).offset(skip).limit(limit)
-    tenants = list(session.exec(stmt).all())
-    tenant_ids = [t.id for t in tenants if t.id is not None]
-
-    total_stmt = select(func.count()).select_from(Tenant).where(*filters)
-    total = int(session.exec(total_stmt).one())
+    # Estado de la suscripción calculado en la misma consulta
+    now = literal(utcnow(), DateTime)
+    dias_restantes_expr = _dias_hasta(session, Tenant.suscripcion_hasta, now)
+    en_gracia_expr = and_(Tenant.suscripcion_hasta < now, Tenant.suscripcion_gracia_hasta >= now)
+
+    # Keyset sobre (nombre, id), el mismo orden de la página
+    stmt = (
+        select(Tenant, dias_restantes_expr, en_gracia_expr)
+        .options(raiseload("*"))
+        .order_by(Tenant.nombre, Tenant.id)
+        .limit(limit + 1)
+    )
+    if cursor:
+        last_nombre, last_id = _decode_cursor(cursor, (str, int))
+        stmt = stmt.where(*filters, tuple_(Tenant.nombre, Tenant.id) > tuple_(last_nombre, last_id))
+    else:
+        stmt = stmt.where(*filters).offset(skip)
+    results = list(session.exec(stmt).all())
+    next_cursor = None
+    if len(results) > limit:
+        results = results[:limit]
+        next_cursor = _encode_cursor(results[-1][0].nombre, results[-1][0].id)
+    total = None
+    if include_total:
+        total = _count_total(session, select(func.count()).select_from(Tenant).where(*filters))
+    tenant_ids = [t.id for t, _, _ in results if t.id is not None]
 
     members_count: Dict[int, int] = {tid: 0 for tid in tenant_ids}
     owner_emails: Dict[int, List[str]] = {tid: [] for tid in tenant_ids}
 
     if tenant_ids:
-        count_rows = session.exec(
-            select(TenantUser.tenant_id, func.count())
+        # Miembros y emails de owners en una sola pasada agregada (FILTER)
+        member_rows = session.exec(
+            select(
+                TenantUser.tenant_id,
+                func.count(),
+                _json_array(session, Usuario.email).filter(TenantUser.rol == "owner"),
+            )
+            .outerjoin(Usuario, Usuario.id == TenantUser.user_id)
             .where(TenantUser.tenant_id.in_(tenant_ids))
             .group_by(TenantUser.tenant_id)
         ).all()
-        for tenant_id, count in count_rows:
+        for tenant_id, count, emails in member_rows:
             if tenant_id is not None:
                 members_count[int(tenant_id)] = int(count)
+                owner_emails[int(tenant_id)] = [email for email in emails or [] if email]
 
-        owner_rows = session.exec(
-            select(TenantUser.tenant_id, Usuario.email)
-            .join(Usuario, Usuario.id == TenantUser.user_id)
-            .where(TenantUser.tenant_id.in_(tenant_ids))
-            .where(TenantUser.rol == "owner")
-        ).all()
-        for tenant_id, email in owner_rows:
-            if tenant_id is not None and email:
-                owner_emails.setdefault(int(tenant_id), []).append(email)
-
-    now = datetime.utcnow()
     rows = []
-    for t in tenants:
+    for t, dias_restantes, en_gracia in results:
         if t.id is None:
             continue
-        dias_restantes = None
-        en_gracia = False
-        if t.suscripcion_hasta is not None:
-            dias_restantes = int((t.suscripcion_hasta - now).total_seconds() // 86400)
-            if dias_restantes < 0 and t.suscripcion_gracia_hasta is not None:
-                en_gracia = now <= t.suscripcion_gracia_hasta
-
         rows.append(
-            AdminTenantRow(
+            AdminTenantRow.model_construct(
                 id=t.id,
                 id_ext=str(t.id_ext),
                 nombre=t.nombre,
@@ -346,13 +518,17 @@ def admin_list_tenants(
                 suscripcion_moneda=t.suscripcion_moneda,
                 suscripcion_periodo_dias=t.suscripcion_periodo_dias,
                 dias_restantes=dias_restantes,
-                en_gracia=en_gracia,
+                en_gracia=bool(en_gracia),
                 members_count=members_count.get(t.id, 0),
                 owner_emails=sorted(set(owner_emails.get(t.id, []))),
             )
         )
 
-    return AdminTenantsResponse(tenants=rows, total=total, skip=skip, limit=limit)
+    response = AdminTenantsResponse.model_construct(
+        tenants=rows, total=total, skip=skip, limit=limit, has_more=next_cursor is not None, next_cursor=next_cursor
+    )
+    admin_tenants_cache.set(cache_key, response)
+    return model_response(response)
 
 
 @router.patch("/tenants/{tenant_id}/active", status_code=status.HTTP_204_NO_CONTENT)
@@ -362,15 +538,37 @@ def admin_set_tenant_active(
     session: Session = Depends(get_session),
     _admin_user: Usuario = Depends(require_admin),
 ):
-    tenant = session.get(Tenant, tenant_id)
-    if tenant is None:
+    updated = session.execute(
+        update(Tenant)
+        .where(Tenant.id == tenant_id)
+        .values(activo=payload.activo)
+        .returning(Tenant.id)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if updated is None:
         raise HTTPException(status_code=404, detail="Tenant no encontrado")
-    tenant.activo = payload.activo
-    session.add(tenant)
     session.commit()
+    invalidar_listado_admin()
     return None
 
 
+@router.post("/tenants/bulk/active", response_model=dict)
+def admin_bulk_set_tenants_active(
+    payload: AdminBulkSetActiveRequest,
+    session: Session = Depends(get_session),
+    _admin_user: Usuario = Depends(require_admin),
+):
+    result = session.execute(
+        update(Tenant)
+        .where(Tenant.id.in_(payload.ids))
+        .values(activo=payload.activo)
+        .execution_options(synchronize_session=False)
+    )
+    session.commit()
+    invalidar_listado_admin()
+    return {"updated": result.rowcount}
+
+
 @router.patch("/tenants/{tenant_id}/subscription", status_code=status.HTTP_204_NO_CONTENT)
 def admin_set_tenant_subscription(
     tenant_id: int,
@@ -378,29 +576,39 @@ def admin_set_tenant_subscription(
     session: Session = Depends(get_session),
     _admin_user: Usuario = Depends(require_admin),
 ):
-    tenant = session.get(Tenant, tenant_id)
-    if tenant is None:
-        raise HTTPException(status_code=404, detail="Tenant no encontrado")
-
-    if payload.suscripcion_plan is not None:
-        tenant.suscripcion_plan = payload.suscripcion_plan.strip() or tenant.suscripcion_plan
-    if payload.suscripcion_estado is not None:
-        tenant.suscripcion_estado = payload.suscripcion_estado.strip() or tenant.suscripcion_estado
+    # Solo los campos enviados (y no vacíos tras normalizar) entran al UPDATE
+    values: Dict[str, Any] = {}
+    if payload.suscripcion_plan is not None and payload.suscripcion_plan.strip():
+        values["suscripcion_plan"] = payload.suscripcion_plan.strip()
+    if payload.suscripcion_estado is not None and payload.suscripcion_estado.strip():
+        values["suscripcion_estado"] = payload.suscripcion_estado.strip()
     if payload.suscripcion_hasta is not None:
-        tenant.suscripcion_hasta = payload.suscripcion_hasta
+        values["suscripcion_hasta"] = payload.suscripcion_hasta
     if payload.suscripcion_gracia_hasta is not None:
-        tenant.suscripcion_gracia_hasta = payload.suscripcion_gracia_hasta
+        values["suscripcion_gracia_hasta"] = payload.suscripcion_gracia_hasta
     if payload.suscripcion_ultima_cobranza is not None:
-        tenant.suscripcion_ultima_cobranza = payload.suscripcion_ultima_cobranza
+        values["suscripcion_ultima_cobranza"] = payload.suscripcion_ultima_cobranza
     if payload.suscripcion_precio_centavos is not None:
-        tenant.suscripcion_precio_centavos = int(payload.suscripcion_precio_centavos)
-    if payload.suscripcion_moneda is not None:
-        tenant.suscripcion_moneda = payload.suscripcion_moneda.strip().upper() or tenant.suscripcion_moneda
+        values["suscripcion_precio_centavos"] = int(payload.suscripcion_precio_centavos)
+    if payload.suscripcion_moneda is not None and payload.suscripcion_moneda.strip():
+        values["suscripcion_moneda"] = payload.suscripcion_moneda.strip().upper()
     if payload.suscripcion_periodo_dias is not None:
-        tenant.suscripcion_periodo_dias = int(payload.suscripcion_periodo_dias)
-
-    session.add(tenant)
+        values["suscripcion_periodo_dias"] = int(payload.suscripcion_periodo_dias)
+
+    if values:
+        found = session.execute(
+            update(Tenant)
+            .where(Tenant.id == tenant_id)
+            .values(**values)
+            .returning(Tenant.id)
+            .execution_options(synchronize_session=False)
+        ).first()
+    else:
+        found = session.exec(select(Tenant.id).where(Tenant.id == tenant_id)).first()
+    if found is None:
+        raise HTTPException(status_code=404, detail="Tenant no encontrado")
     session.commit()
+    invalidar_listado_admin()
     return None
 
 
@@ -416,7 +624,7 @@ def admin_renew_tenant_subscription(
         raise HTTPException(status_code=404, detail="Tenant no encontrado")
 
     months = payload.months if payload.months and payload.months > 0 else 1
-    paid_at = payload.paid_at or datetime.utcnow()
+    paid_at = payload.paid_at or utcnow()
     base = tenant.suscripcion_hasta if tenant.suscripcion_hasta and tenant.suscripcion_hasta > paid_at else paid_at
     period_days = tenant.suscripcion_periodo_dias if tenant.suscripcion_periodo_dias and tenant.suscripcion_periodo_dias > 0 else 30
     period_start = base
@@ -456,6 +664,7 @@ def admin_renew_tenant_subscription(
         session.add(tenant)
 
     session.commit()
+    invalidar_listado_admin()
     return None
 
 
@@ -464,13 +673,33 @@ def admin_sweep_expired_subscriptions(
     session: Session = Depends(get_session),
     _admin_user: Usuario = Depends(require_admin),
 ):
-    count = TenantService.sweep_expired_subscriptions(session)
+    count = _sweep_cache.get_or_set("sweep", lambda: TenantService.sweep_expired_subscriptions(session))
     return {"disabled_tenants": count}
 
 
+def _payment_row_json(p: TenantPayment) -> bytes:
+    return AdminTenantPaymentRow.model_construct(
+        id=p.id,
+        id_ext=str(p.id_ext),
+        amount_centavos=p.amount_centavos,
+        currency=p.currency,
+        status=p.status,
+        paid_at=p.paid_at,
+        payment_method=p.payment_method,
+        notes=p.notes,
+        failure_reason=p.failure_reason,
+        refunded_at=p.refunded_at,
+        period_start=p.period_start,
+        period_end=p.period_end,
+        provider=p.provider,
+        provider_payment_id=p.provider_payment_id,
+    ).model_dump_json().encode()
+
+
 @router.get("/tenants/{tenant_id}/payments", response_model=AdminTenantPaymentsResponse)
 def admin_list_tenant_payments(
     tenant_id: int,
+    limit: int = Query(default=200, ge=1, le=5000),
     session: Session = Depends(get_session),
     _admin_user: Usuario = Depends(require_admin),
 ):
@@ -478,37 +707,31 @@ def admin_list_tenant_payments(
     if tenant is None:
         raise HTTPException(status_code=404, detail="Tenant no encontrado")
 
-    rows = list(
-        session.exec(
-            select(TenantPayment)
-            .where(TenantPayment.tenant_id == tenant_id)
-            .order_by(TenantPayment.paid_at.desc(), TenantPayment.id.desc())
-            .limit(200)
-        ).all()
-    )
-    return AdminTenantPaymentsResponse(
-        payments=[
-            AdminTenantPaymentRow(
-                id=p.id,
-                id_ext=str(p.id_ext),
-                amount_centavos=p.amount_centavos,
-                currency=p.currency,
-                status=p.status,
-                paid_at=p.paid_at,
-                payment_method=p.payment_method,
-                notes=p.notes,
-                failure_reason=p.failure_reason,
-                refunded_at=p.refunded_at,
-                period_start=p.period_start,
-                period_end=p.period_end,
-                provider=p.provider,
-                provider_payment_id=p.provider_payment_id,
-            )
-            for p in rows
-            if p.id is not None
-        ]
+    stmt = (
+        select(TenantPayment)
+        .options(raiseload("*"))
+        .where(TenantPayment.tenant_id == tenant_id)
+        .order_by(TenantPayment.paid_at.desc(), TenantPayment.id.desc())
+        .limit(limit)
+        # Cursor del lado del servidor en PostgreSQL: se traen y liberan lotes de 50
+        .execution_options(yield_per=_PAYMENTS_BATCH)
     )
 
+    # El stream usa su propia sesión (y conexión) del mismo engine: la del
+    # request se cierra con la dependencia, que no espera al cuerpo de la respuesta
+    engine = session.get_bind()
+
+    def body():
+        with Session(engine) as stream_session:
+            yield b'{"payments":['
+            separador = b""
+            for lote in stream_session.exec(stmt).partitions():
+                yield separador + b",".join(_payment_row_json(p) for p in lote)
+                separador = b","
+            yield b"]}"
+
+    return StreamingResponse(body(), media_type="application/json")
+
 
 @router.post("/tenants/{tenant_id}/payments", status_code=status.HTTP_201_CREATED)
 def admin_create_tenant_payment(
@@ -522,7 +745,7 @@ def admin_create_tenant_payment(
         raise HTTPException(status_code=404, detail="Tenant no encontrado")
 
     months = payload.months if payload.months and payload.months > 0 else 1
-    paid_at = payload.paid_at or datetime.utcnow()
+    paid_at = payload.paid_at or utcnow()
     base = tenant.suscripcion_hasta if tenant.suscripcion_hasta and tenant.suscripcion_hasta > paid_at else paid_at
     period_days = tenant.suscripcion_periodo_dias if tenant.suscripcion_periodo_dias and tenant.suscripcion_periodo_dias > 0 else 30
     period_start = base
@@ -544,7 +767,11 @@ def admin_create_tenant_payment(
         provider_payment_id=payload.provider_payment_id,
         creado_por=admin_user.id,
     )
-    session.add(payment)
+    # INSERT ... RETURNING id: evita el SELECT posterior de session.refresh(payment).
+    # El modelo se instancia solo para completar id_ext/creado_el (defaults de Python).
+    payment_id = session.execute(
+        insert(TenantPayment).values(**payment.model_dump(exclude={"id"})).returning(TenantPayment.id)
+    ).scalar_one()
 
     if status_value == "paid":
         tenant.suscripcion_hasta = period_end
@@ -553,9 +780,11 @@ def admin_create_tenant_payment(
         tenant.suscripcion_ultima_cobranza = paid_at
         tenant.activo = True
         session.add(tenant)
+    # Leer antes del commit: después el tenant queda expirado y volvería a consultarse
+    suscripcion_hasta = tenant.suscripcion_hasta
     session.commit()
-    session.refresh(payment)
-    return {"payment_id": payment.id, "period_end": tenant.suscripcion_hasta.isoformat() if tenant.suscripcion_hasta else None}
+    invalidar_listado_admin()
+    return {"payment_id": payment_id, "period_end": suscripcion_hasta.isoformat() if suscripcion_hasta else None}
 
 
 @router.patch("/payments/{payment_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -565,21 +794,29 @@ def admin_update_payment(
     session: Session = Depends(get_session),
     _admin_user: Usuario = Depends(require_admin),
 ):
-    payment = session.get(TenantPayment, payment_id)
-    if payment is None:
-        raise HTTPException(status_code=404, detail="Pago no encontrado")
-
-    if payload.status is not None:
-        payment.status = payload.status.strip().lower() or payment.status
+    values: Dict[str, Any] = {}
+    if payload.status is not None and payload.status.strip():
+        values["status"] = payload.status.strip().lower()
     if payload.payment_method is not None:
-        payment.payment_method = payload.payment_method.strip() or payload.payment_method
+        values["payment_method"] = payload.payment_method.strip() or payload.payment_method
     if payload.notes is not None:
-        payment.notes = payload.notes
+        values["notes"] = payload.notes
     if payload.failure_reason is not None:
-        payment.failure_reason = payload.failure_reason
+        values["failure_reason"] = payload.failure_reason
     if payload.refunded_at is not None:
-        payment.refunded_at = payload.refunded_at
-
-    session.add(payment)
+        values["refunded_at"] = payload.refunded_at
+
+    if values:
+        found = session.execute(
+            update(TenantPayment)
+            .where(TenantPayment.id == payment_id)
+            .values(**values)
+            .returning(TenantPayment.id)
+            .execution_options(synchronize_session=False)
+        ).first()
+    else:
+        found = session.exec(select(TenantPayment.id).where(TenantPayment.id == payment_id)).first()
+    if found is None:
+        raise HTTPException(status_code=404, detail="Pago no encontrado")
     session.commit()
     return None
@@ -1,17 +1,20 @@
 """
 Router de autenticación - Refactorizado para usar Usuario
 """
-from datetime import datetime, timedelta
-from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from datetime import timedelta
+from typing import Annotated, Awaitable, Callable, Dict, Optional
+
+import anyio.to_thread
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlmodel import Session, select
 from sqlalchemy.exc import IntegrityError
 
 from app.core.database import get_session
-from app.core.security import create_access_token, create_refresh_token, verify_token
+from app.core.security import create_access_token, create_refresh_token, verify_token, verify_token_cached
 from app.core.config import settings
 from app.core.rate_limit import limiter, AUTH_RATE_LIMIT, PASSWORD_RATE_LIMIT, READ_RATE_LIMIT
+from app.core.responses import PydanticJSONResponse, model_response
 from app.services.refresh_tokens import (
     compute_refresh_token_hash,
     get_refresh_token_by_hash,
@@ -19,10 +22,12 @@ from app.services.refresh_tokens import (
     store_refresh_token,
 )
 from app.services.users import UserService
+from app.services import role_cache
 from app.services.password_reset import PasswordResetService
 from app.services.email_verification import EmailVerificationService
 from app.services.email_service import EmailService
 from app.models.user_extended import Usuario, UsuarioRol, TipoRolUsuario
+from app.models.base import utcnow
 from app.schemas.auth import (
     Token,
     LoginJSONRequest,
@@ -35,47 +40,112 @@ from app.schemas.auth import (
 from app.schemas.register import RegisterResponse
 from app.schemas.users import UserCreate, UserRead, UserWithRoles, RolRead, TipoRolUsuarioRead
 
-router = APIRouter(prefix="/auth", tags=["authentication"])
+router = APIRouter(prefix="/auth", tags=["authentication"], default_response_class=PydanticJSONResponse)
 
 # OAuth2 scheme para extraer el token del header Authorization
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+# Conjuntos de roles aceptados por cada dependencia, armados una sola vez
+ADMIN_ROLES = frozenset({"superadmin", "admin", "administrador"})
+SUPERADMIN_ROLES = frozenset({"superadmin"})
+SOCIO_ROLES = frozenset({"socio"})
+ADMIN_OR_SOCIO_ROLES = ADMIN_ROLES | SOCIO_ROLES
+
+
+# Vigencia del access token, calculada una vez (settings no cambia en caliente)
+_TOKEN_TTL = timedelta(minutes=settings.access_token_expire_minutes)
+_EXPIRES_IN = settings.access_token_expire_minutes * 60
+
+
+def _issue_token(session: Session, request: Request, user: Usuario, *, reemplaza=None) -> Token:
+    """
+    Emitir access token y refresh token (persistido) para ``user``
+    
+    Args:
+        session: Sesión de base de datos
+        request: Request actual (user-agent e IP del refresh token)
+        user: Usuario autenticado
+        reemplaza: Registro del refresh token que se rota, si corresponde
+    """
+    claims = {"sub": str(user.id), "email": user.email}
+    access_token = create_access_token(data=claims, expires_delta=_TOKEN_TTL)
+    refresh_token, refresh_jti, refresh_expires_at = create_refresh_token(data=claims)
+    if reemplaza is not None:
+        revoke_refresh_token(session, reemplaza, replaced_by_refresh_token=refresh_token)
+    store_refresh_token(
+        session,
+        user_id=user.id,
+        refresh_token=refresh_token,
+        jti=refresh_jti,
+        expires_at=refresh_expires_at,
+        user_agent=request.headers.get("user-agent"),
+        ip_address=request.client.host if request.client else None,
+    )
+    return Token(
+        access_token=access_token,
+        token_type="bearer",
+        expires_in=_EXPIRES_IN,
+        refresh_token=refresh_token,
+    )
+
+
+def _user_id_from_payload(payload: dict) -> Optional[int]:
+    """Id de usuario del claim ``sub``, o ``None`` si no es un entero positivo"""
+    try:
+        user_id = int(payload["sub"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return user_id if user_id > 0 else None
+
+
+_BEARER_HEADERS = {"WWW-Authenticate": "Bearer"}
+
+
+def _credentials_exception() -> HTTPException:
+    # Se arma solo al rechazar: los requests válidos no pagan la instancia.
+    # No se comparte una única instancia porque cada raise le agrega su traceback.
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="No se pudieron validar las credenciales",
+        headers=_BEARER_HEADERS,
+    )
+
 
 def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)], 
     session: Session = Depends(get_session)
 ) -> Usuario:
     """Obtener usuario actual desde el token JWT"""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="No se pudieron validar las credenciales",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
-    payload = verify_token(token, expected_type="access")
+    payload = verify_token_cached(token, expected_type="access")
     if payload is None:
-        raise credentials_exception
+        raise _credentials_exception()
     
-    user_id_str = payload.get("sub")
-    if user_id_str is None:
-        raise credentials_exception
+    # Token o sub inválido: 401 sin tocar la base
+    user_id = _user_id_from_payload(payload)
+    if user_id is None:
+        raise _credentials_exception()
     
-    try:
-        user_id = int(user_id_str)
-    except (ValueError, TypeError):
-        raise credentials_exception
-    
-    user = session.get(Usuario, user_id)
-    if user is None:
-        raise credentials_exception
+    contexto = UserService.get_auth_context(session, user_id)
+    if contexto is None:
+        raise _credentials_exception()
     
+    user, role_names = contexto
+    # Los guards require_* leen los roles de aquí (ver _check_user_roles)
+    user.__dict__["_cached_roles"] = role_names
     return user
 
 
-def get_current_active_user(
+async def get_current_active_user(
     current_user: Annotated[Usuario, Depends(get_current_user)]
 ) -> Usuario:
-    """Obtener usuario actual activo"""
+    """
+    Obtener usuario actual activo
+
+    ``async`` porque solo lee un atributo ya cargado: corre en el event loop
+    sin ocupar un hilo del threadpool. ``get_current_user`` sigue siendo
+    ``def`` porque ante un fallo de caché consulta la base (no hay driver async
+    instalado).
+    """
     if not current_user.activo:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, 
@@ -84,21 +154,45 @@ def get_current_active_user(
     return current_user
 
 
-def _check_user_roles(session: Session, user_id: int, required_roles: list[str]) -> bool:
+def _check_user_roles(session: Session, user: Usuario, required_roles: frozenset[str]) -> bool:
     """
     Función auxiliar para verificar si un usuario tiene alguno de los roles requeridos
     
     Args:
         session: Sesión de base de datos
-        user_id: ID del usuario
-        required_roles: Lista de roles requeridos (cualquiera de ellos es válido)
+        user: Usuario autenticado
+        required_roles: Conjunto de roles requeridos (cualquiera de ellos es válido)
     
     Returns:
         bool: True si el usuario tiene al menos uno de los roles requeridos
     """
-    user_roles = UserService.get_user_roles(session, user_id)
-    role_names = [role.tipo for role in user_roles]
-    return any(role in role_names for role in required_roles)
+    # get_current_user deja los roles en la propia instancia (una sesión por
+    # request); role_cache queda para usuarios obtenidos por otra vía
+    role_names = user.__dict__.get("_cached_roles")
+    if role_names is None:
+        role_names = role_cache.get_role_names(session, user.id)
+        # Directo en __dict__: pydantic no admite atributos privados no declarados
+        # en instancias cargadas por el ORM
+        user.__dict__["_cached_roles"] = role_names
+    # isdisjoint corta en la primera coincidencia y no arma un set intermedio
+    return not required_roles.isdisjoint(role_names)
+
+
+async def _has_any_role(session: Session, user: Usuario, required_roles: frozenset[str]) -> bool:
+    """
+    ``_check_user_roles`` para las dependencias ``async``: con los roles ya en
+    la instancia (lo normal tras ``get_current_user``) se resuelve en el event
+    loop; si hay que leerlos de ``role_cache``, que puede consultar la base, se
+    delega al threadpool.
+    """
+    if "_cached_roles" in user.__dict__:
+        return _check_user_roles(session, user, required_roles)
+    return await anyio.to_thread.run_sync(_check_user_roles, session, user, required_roles)
+
+
+# Una sola dependencia por rol: FastAPI cachea por request cada callable
+# (misma identidad = se ejecuta una vez) y reutiliza su introspección
+_role_checkers: Dict[str, Callable[..., Awaitable[Usuario]]] = {}
 
 
 def require_role(required_role: str):
@@ -109,22 +203,32 @@ def require_role(required_role: str):
         required_role: Nombre del rol requerido
     
     Returns:
-        Función de dependencia que verifica el rol
+        Función de dependencia que verifica el rol (la misma para cada rol)
     """
-    def role_checker(
+    checker = _role_checkers.get(required_role)
+    if checker is None:
+        checker = _role_checkers[required_role] = _make_role_checker(required_role)
+    return checker
+
+
+def _make_role_checker(required_role: str) -> Callable[..., Awaitable[Usuario]]:
+    required = frozenset({required_role})
+    detail = f"Se requiere rol: {required_role}"
+
+    async def role_checker(
         current_user: Annotated[Usuario, Depends(get_current_active_user)],
         session: Session = Depends(get_session)
     ) -> Usuario:
-        if not _check_user_roles(session, current_user.id, [required_role]):
+        if not await _has_any_role(session, current_user, required):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Se requiere rol: {required_role}"
+                detail=detail
             )
         return current_user
     return role_checker
 
 
-def require_admin(
+async def require_admin(
     current_user: Annotated[Usuario, Depends(get_current_active_user)],
     session: Session = Depends(get_session)
 ) -> Usuario:
@@ -141,9 +245,7 @@ def require_admin(
     Raises:
         HTTPException: 403 si el usuario no tiene permisos de administrador
     """
-    admin_roles = ["superadmin", "admin", "administrador"]
-    
-    if not _check_user_roles(session, current_user.id, admin_roles):
+    if not await _has_any_role(session, current_user, ADMIN_ROLES):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Se requieren permisos de administrador"
@@ -152,11 +254,11 @@ def require_admin(
     return current_user
 
 
-def require_superadmin(
+async def require_superadmin(
     current_user: Annotated[Usuario, Depends(get_current_active_user)],
     session: Session = Depends(get_session),
 ) -> Usuario:
-    if not _check_user_roles(session, current_user.id, ["superadmin"]):
+    if not await _has_any_role(session, current_user, SUPERADMIN_ROLES):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Se requieren permisos de superadmin",
@@ -165,7 +267,7 @@ def require_superadmin(
 
 
 # Funciones de conveniencia para roles comunes
-def require_socio(
+async def require_socio(
     current_user: Annotated[Usuario, Depends(get_current_active_user)],
     session: Session = Depends(get_session)
 ) -> Usuario:
@@ -182,7 +284,7 @@ def require_socio(
     Raises:
         HTTPException: 403 si el usuario no tiene rol de socio
     """
-    if not _check_user_roles(session, current_user.id, ["socio"]):
+    if not await _has_any_role(session, current_user, SOCIO_ROLES):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Se requiere rol de socio"
@@ -191,7 +293,7 @@ def require_socio(
     return current_user
 
 
-def require_admin_or_socio(
+async def require_admin_or_socio(
     current_user: Annotated[Usuario, Depends(get_current_active_user)],
     session: Session = Depends(get_session)
 ) -> Usuario:
@@ -208,9 +310,7 @@ def require_admin_or_socio(
     Raises:
         HTTPException: 403 si el usuario no tiene ninguno de los roles requeridos
     """
-    allowed_roles = ["superadmin", "admin", "administrador", "socio"]
-    
-    if not _check_user_roles(session, current_user.id, allowed_roles):
+    if not await _has_any_role(session, current_user, ADMIN_OR_SOCIO_ROLES):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Se requiere rol de administrador o socio"
@@ -219,9 +319,43 @@ def require_admin_or_socio(
     return current_user
 
 
+def _campo_unico_violado(error: IntegrityError) -> Optional[str]:
+    """
+    Columna de ``usuarios`` cuyo índice único rechazó el INSERT ("email" o
+    "nombre_usuario"), o ``None``. Mira solo el error del driver: el texto
+    completo de la excepción incluye el SQL, que menciona todas las columnas.
+    """
+    diag = getattr(error.orig, "diag", None)  # psycopg2: nombre del constraint
+    detalle = (getattr(diag, "constraint_name", None) or str(error.orig)).lower()
+    for campo in ("nombre_usuario", "email"):
+        if campo in detalle:
+            return campo
+    return None
+
+
+def _enviar_email(background_tasks: BackgroundTasks, enviar: Callable[..., bool], **kwargs) -> bool:
+    """
+    Envía un email con ``enviar`` (un ``EmailService.send_*``).
+
+    Con ``email_send_in_background`` el envío queda como tarea de fondo y corre
+    después de responder, así el request no espera el handshake SMTP/Brevo;
+    el resultado real solo se ve en el log, por lo que se informa como enviado
+    salvo con el backend deshabilitado.
+    """
+    if settings.email_send_in_background:
+        background_tasks.add_task(enviar, **kwargs)
+        return settings.email_backend != "disabled"
+    return enviar(**kwargs)
+
+
 @router.post("/register", response_model=RegisterResponse, status_code=status.HTTP_201_CREATED)
 @limiter.limit(AUTH_RATE_LIMIT)
-def register_user(request: Request, user: UserCreate, session: Session = Depends(get_session)):
+def register_user(
+    request: Request,
+    user: UserCreate,
+    background_tasks: BackgroundTasks,
+    session: Session = Depends(get_session),
+):
     """
     Registrar un nuevo usuario
     
@@ -230,22 +364,8 @@ def register_user(request: Request, user: UserCreate, session: Session = Depends
     - Nivel inicial (Bronce)
     - Código QR para usar en puntos de venta
     """
-    # Verificar si el email ya existe
-    existing_user = UserService.get_user_by_email(session, user.email)
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="El email ingresado ya está registrado"
-        )
-
-    # Verificar si el nombre de usuario ya existe
-    existing_username = UserService.get_user_by_username(session, user.nombre_usuario)
-    if existing_username:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="El nombre de usuario ingresado ya está registrado"
-        )
-
+    # Sin SELECT previo: los índices únicos de email y nombre_usuario deciden y
+    # el IntegrityError se traduce abajo al 400 que corresponda
     # Crear usuario con manejo de race conditions
     try:
         db_user = UserService.create_user(
@@ -260,33 +380,17 @@ def register_user(request: Request, user: UserCreate, session: Session = Depends
             telefono=user.telefono,
             activo=False,
             role_tipo=settings.registration_default_role,
-        )
-    except ValueError as e:
-        session.rollback()
-        if str(e) == "EMAIL_ALREADY_EXISTS":
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="El email ingresado ya está registrado",
-            )
-        if str(e) == "USERNAME_ALREADY_EXISTS":
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="El nombre de usuario ingresado ya está registrado",
-            )
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="El usuario no pudo ser registrado. Verifica los datos e intenta nuevamente.",
+            check_existing=False,
         )
     except IntegrityError as e:
         session.rollback()
-        # El constraint único de la BD atrapó la race condition
-        error_msg = str(e).lower()
-        if 'email' in error_msg:
+        campo = _campo_unico_violado(e)
+        if campo == "email":
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="El email ingresado ya está registrado"
             )
-        elif 'nombre_usuario' in error_msg:
+        elif campo == "nombre_usuario":
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="El nombre de usuario ingresado ya está registrado"
@@ -297,27 +401,17 @@ def register_user(request: Request, user: UserCreate, session: Session = Depends
                 detail="El usuario no pudo ser registrado. Verifica los datos e intenta nuevamente."
             )
     
-    # Mapear campos del modelo Usuario al schema UserRead
-    user_read = UserRead(
-        id=db_user.id,
-        id_ext=str(db_user.id_ext),  # Convertir UUID a string
-        nombre_usuario=db_user.nombre_usuario,
-        email=db_user.email,
-        nombres=db_user.nombres,  # Usar nombres directamente
-        apellidos=db_user.apellidos,  # Usar apellidos directamente
-        sexo=db_user.sexo.value if getattr(db_user, "sexo", None) else None,
-        fecha_nac=db_user.fecha_nac,  # Usar fecha_nac directamente
-        telefono=db_user.telefono,
-        activo=db_user.activo,
-        verificado=db_user.verificado,
-        fecha_creacion=db_user.fecha_creacion,
-        ultimo_login=db_user.ultimo_login,
-        intentos_login_fallidos=db_user.intentos_login_fallidos
-    )
+    # Lector precompilado por (UserRead, Usuario): sin revalidar ni mapear campo a campo
+    user_read = UserRead.from_orm_trusted(db_user)
     
     raw_token, expires_at = EmailVerificationService.create_token(session, db_user, expires_in_minutes=60 * 24)
     verification_link = f"{settings.frontend_url}/verify-email?token={raw_token}"
-    email_sent = EmailService.send_email_verification(to_email=db_user.email, verification_link=verification_link)
+    email_sent = _enviar_email(
+        background_tasks,
+        EmailService.send_email_verification,
+        to_email=db_user.email,
+        verification_link=verification_link,
+    )
 
     response = RegisterResponse(
         message=(
@@ -332,7 +426,9 @@ def register_user(request: Request, user: UserCreate, session: Session = Depends
     if settings.environment != "production":
         response.verification_link = verification_link
         response.verification_expires_at = expires_at.isoformat()
-    return response
+    # Ya construido desde la fila ORM: se serializa una vez, sin que FastAPI lo
+    # vuelque a dict y lo valide de nuevo contra response_model
+    return model_response(response, status_code=status.HTTP_201_CREATED)
 
 
 @router.post("/login", response_model=Token)
@@ -372,33 +468,7 @@ def login_user(
             detail="Cuenta pendiente de habilitación"
         )
     
-    # Crear token de acceso
-    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
-    access_token = create_access_token(
-        data={"sub": str(user.id), "email": user.email},
-        expires_delta=access_token_expires
-    )
-
-    # Crear refresh token
-    refresh_token, refresh_jti, refresh_expires_at = create_refresh_token(
-        data={"sub": str(user.id), "email": user.email}
-    )
-    store_refresh_token(
-        session,
-        user_id=user.id,
-        refresh_token=refresh_token,
-        jti=refresh_jti,
-        expires_at=refresh_expires_at,
-        user_agent=request.headers.get("user-agent"),
-        ip_address=request.client.host if request.client else None,
-    )
-
-    return Token(
-        access_token=access_token,
-        token_type="bearer",
-        expires_in=settings.access_token_expire_minutes * 60,
-        refresh_token=refresh_token
-    )
+    return _issue_token(session, request, user)
 
 
 @router.post("/login-json", response_model=Token)
@@ -437,33 +507,7 @@ def login_user_json(
             detail="Cuenta pendiente de habilitación"
         )
     
-    # Crear token de acceso
-    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
-    access_token = create_access_token(
-        data={"sub": str(user.id), "email": user.email},
-        expires_delta=access_token_expires
-    )
-
-    # Crear refresh token
-    refresh_token, refresh_jti, refresh_expires_at = create_refresh_token(
-        data={"sub": str(user.id), "email": user.email}
-    )
-    store_refresh_token(
-        session,
-        user_id=user.id,
-        refresh_token=refresh_token,
-        jti=refresh_jti,
-        expires_at=refresh_expires_at,
-        user_agent=request.headers.get("user-agent"),
-        ip_address=request.client.host if request.client else None,
-    )
-
-    return Token(
-        access_token=access_token,
-        token_type="bearer",
-        expires_in=settings.access_token_expire_minutes * 60,
-        refresh_token=refresh_token
-    )
+    return _issue_token(session, request, user)
 
 
 @router.get("/me", response_model=UserWithRoles)
@@ -477,11 +521,6 @@ def read_current_user(
     Requiere token JWT válido en el header:
     Authorization: Bearer <token>
     """
-    sexo = None
-    raw_sexo = getattr(current_user, "sexo", None)
-    if raw_sexo:
-        sexo = raw_sexo.value if hasattr(raw_sexo, "value") else str(raw_sexo).strip() or None
-
     role_rows = session.exec(
         select(UsuarioRol, TipoRolUsuario)
         .join(TipoRolUsuario, TipoRolUsuario.id == UsuarioRol.id_rol)
@@ -502,24 +541,8 @@ def read_current_user(
         if rol is not None and rol.id is not None
     ]
 
-    return UserWithRoles(
-        id=current_user.id,
-        id_ext=str(current_user.id_ext),  # Convert UUID to string
-        nombre_usuario=current_user.nombre_usuario,
-        email=current_user.email,
-        nombres=current_user.nombres,  # Use correct field name 'nombres'
-        apellidos=current_user.apellidos,  # Use correct field name 'apellidos'
-        sexo=sexo,
-        fecha_nac=current_user.fecha_nac,  # Use correct field name 'fecha_nac'
-        telefono=current_user.telefono,
-        avatar=getattr(current_user, "avatar", None),
-        activo=current_user.activo,
-        verificado=current_user.verificado,
-        fecha_creacion=current_user.fecha_creacion,
-        ultimo_login=current_user.ultimo_login,
-        intentos_login_fallidos=current_user.intentos_login_fallidos,
-        roles=roles,
-    )
+    user_read = UserRead.from_orm_trusted(current_user)
+    return model_response(UserWithRoles.model_construct(**dict(user_read), roles=roles))
 
 
 @router.post("/refresh", response_model=Token)
@@ -541,7 +564,8 @@ def refresh_access_token(
         )
 
     refresh_jti = payload.get("jti")
-    if not refresh_jti:
+    user_id = _user_id_from_payload(payload)
+    if not refresh_jti or user_id is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token de refresh inválido")
 
     token_hash = compute_refresh_token_hash(refresh_token)
@@ -550,24 +574,9 @@ def refresh_access_token(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token de refresh inválido")
     if record.jti != refresh_jti:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token de refresh inválido")
-    if record.expires_at < datetime.utcnow():
+    if record.expires_at < utcnow():
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token de refresh expirado")
     
-    user_id_str = payload.get("sub")
-    if user_id_str is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token de refresh inválido"
-        )
-    
-    try:
-        user_id = int(user_id_str)
-    except (ValueError, TypeError):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token de refresh inválido"
-        )
-    
     user = session.get(Usuario, user_id)
     if user is None or not user.activo:
         raise HTTPException(
@@ -575,33 +584,8 @@ def refresh_access_token(
             detail="Usuario no encontrado o inactivo"
         )
     
-    # Crear nuevo token de acceso
-    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
-    access_token = create_access_token(
-        data={"sub": str(user.id), "email": user.email},
-        expires_delta=access_token_expires
-    )
-
-    new_refresh_token, new_refresh_jti, new_refresh_expires_at = create_refresh_token(
-        data={"sub": str(user.id), "email": user.email}
-    )
-    revoke_refresh_token(session, record, replaced_by_refresh_token=new_refresh_token)
-    store_refresh_token(
-        session,
-        user_id=user.id,
-        refresh_token=new_refresh_token,
-        jti=new_refresh_jti,
-        expires_at=new_refresh_expires_at,
-        user_agent=request.headers.get("user-agent"),
-        ip_address=request.client.host if request.client else None,
-    )
-    
-    return Token(
-        access_token=access_token,
-        token_type="bearer",
-        expires_in=settings.access_token_expire_minutes * 60,
-        refresh_token=new_refresh_token,
-    )
+    # Rotación: el refresh token usado queda revocado y apunta al nuevo
+    return _issue_token(session, request, user, reemplaza=record)
 
 
 @router.post("/forgot-password")
@@ -609,6 +593,7 @@ def refresh_access_token(
 def forgot_password(
     request: Request,
     body: ForgotPasswordRequest,
+    background_tasks: BackgroundTasks,
     session: Session = Depends(get_session),
 ):
     email_normalized = body.email.lower().strip()
@@ -617,7 +602,7 @@ def forgot_password(
     if user and user.activo:
         raw_token, expires_at = PasswordResetService.create_reset_token(session, user, expires_in_minutes=30)
         reset_link = f"{settings.frontend_url}/reset-password?token={raw_token}"
-        EmailService.send_password_reset_email(to_email=user.email, reset_link=reset_link)
+        _enviar_email(background_tasks, EmailService.send_password_reset_email, to_email=user.email, reset_link=reset_link)
         if settings.environment != "production":
             return {
                 "message": "Si el email existe, te enviaremos un link para restablecer tu contraseña.",
@@ -661,6 +646,7 @@ def verify_email(
 def resend_verification_email(
     request: Request,
     body: ResendVerificationRequest,
+    background_tasks: BackgroundTasks,
     session: Session = Depends(get_session),
 ):
     email_normalized = body.email.lower().strip()
@@ -668,7 +654,12 @@ def resend_verification_email(
     if user and not user.verificado:
         raw_token, _expires_at = EmailVerificationService.create_token(session, user, expires_in_minutes=60 * 24)
         verification_link = f"{settings.frontend_url}/verify-email?token={raw_token}"
-        EmailService.send_email_verification(to_email=user.email, verification_link=verification_link)
+        _enviar_email(
+            background_tasks,
+            EmailService.send_email_verification,
+            to_email=user.email,
+            verification_link=verification_link,
+        )
     return {"message": "Si el email existe, te enviaremos un link para confirmar tu cuenta."}
 
 
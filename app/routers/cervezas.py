@@ -16,6 +16,7 @@ from ..models.beer import (
     CervezaCreate, CervezaRead, CervezaUpdate,
     TipoEstiloCervezaCreate, TipoEstiloCervezaRead, PrecioCervezaCreate, PrecioCervezaRead
 )
+from ..models.base import utcnow
 from ..services.cervezas import CervezaService
 
 
@@ -326,7 +327,7 @@ def create_precio_cerveza(
         "id": 0,  # Se podría mejorar obteniendo el ID real del precio
         "id_cerveza": cerveza_id,
         "precio": precio_actual,
-        "fecha_inicio": datetime.utcnow(),
+        "fecha_inicio": utcnow(),
         "fecha_fin": None,
         "creado_por": current_user.id,
         "motivo": precio_data.motivo
@@ -14,9 +14,10 @@ from app.models.tenant import Tenant
 from app.models.user_extended import Usuario
 from app.models.sales import Venta
 from app.models.beer import Cerveza
-from app.models.sales_point import Equipo, TipoBarril, TipoEstadoEquipo, PuntoVenta
+from app.models.sales_point import Equipo, TipoBarril, PuntoVenta
 from app.models.transactions import Pago, TipoEstadoPago
 from app.models.user_extended import TipoMetodoPago
+from app.models.base import utcnow
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
@@ -34,7 +35,7 @@ def get_dashboard_kpis(
     Requiere usuario autenticado con acceso al tenant
     """
     # Calcular fecha de inicio según días solicitados
-    fecha_inicio = datetime.utcnow() - timedelta(days=days)
+    fecha_inicio = utcnow() - timedelta(days=days)
 
     # Total de ventas en el período
     total_ventas_statement = (
@@ -130,7 +131,7 @@ def get_ventas_por_dia(
 
     Requiere usuario autenticado con acceso al tenant
     """
-    fecha_inicio = datetime.utcnow() - timedelta(days=days)
+    fecha_inicio = utcnow() - timedelta(days=days)
 
     # Agrupar ventas por día
     from sqlalchemy import cast, Date
@@ -175,7 +176,7 @@ def get_cervezas_populares(
 
     Requiere usuario autenticado con acceso al tenant
     """
-    fecha_inicio = datetime.utcnow() - timedelta(days=days)
+    fecha_inicio = utcnow() - timedelta(days=days)
 
     # Top cervezas por ventas
     cervezas_statement = select(
@@ -230,7 +231,7 @@ def get_top_clientes(
 
     Requiere usuario autenticado con acceso al tenant
     """
-    fecha_inicio = datetime.utcnow() - timedelta(days=days)
+    fecha_inicio = utcnow() - timedelta(days=days)
 
     # Top clientes por gasto
     clientes_statement = select(
@@ -323,7 +324,7 @@ def get_dashboard_kpis_dia(
     tenant: Tenant = Depends(get_current_tenant),
     session: Session = Depends(get_session),
 ):
-    now = datetime.utcnow()
+    now = utcnow()
     hoy_inicio = datetime(now.year, now.month, now.day)
     hoy_fin = hoy_inicio + timedelta(days=1)
     ayer_inicio = hoy_inicio - timedelta(days=1)
@@ -411,7 +412,7 @@ def get_distribucion_por_estilo(
     session: Session = Depends(get_session),
     days: int = 30,
 ):
-    fecha_inicio = datetime.utcnow() - timedelta(days=days)
+    fecha_inicio = utcnow() - timedelta(days=days)
 
     stmt = (
         select(
@@ -457,11 +458,10 @@ def get_canillas(
             Equipo.capacidad_actual,
             TipoBarril.capacidad,
             Cerveza.nombre,
-            TipoEstadoEquipo.permite_ventas,
+            Equipo.puede_vender,
         )
         .join(PuntoVenta, Equipo.id_punto_de_venta == PuntoVenta.id)
         .join(TipoBarril, TipoBarril.id == Equipo.id_barril)
-        .join(TipoEstadoEquipo, TipoEstadoEquipo.id == Equipo.id_estado_equipo)
         .join(Cerveza, Cerveza.id == Equipo.id_cerveza, isouter=True)
         .where(PuntoVenta.tenant_id == tenant.id)
         .order_by(Equipo.id.asc())
@@ -503,14 +503,14 @@ def get_metodos_pago_hoy(
     tenant: Tenant = Depends(get_current_tenant),
     session: Session = Depends(get_session),
 ):
-    now = datetime.utcnow()
+    now = utcnow()
     inicio = datetime(now.year, now.month, now.day)
     fin = inicio + timedelta(days=1)
 
     stmt = (
         select(
             TipoMetodoPago.metodo_pago,
-            func.sum(Pago.monto).label("monto"),
+            func.sum(Pago.monto_centavos).label("monto_centavos"),
         )
         .join(Venta, (Venta.id == Pago.id_venta) & (Venta.fecha_hora == Pago.fecha_venta))
         .join(Equipo, Venta.id_equipo == Equipo.id)
@@ -523,14 +523,14 @@ def get_metodos_pago_hoy(
             PuntoVenta.tenant_id == tenant.id,
         )
         .group_by(TipoMetodoPago.metodo_pago)
-        .order_by(func.sum(Pago.monto).desc())
+        .order_by(func.sum(Pago.monto_centavos).desc())
     )
     rows = session.exec(stmt).all()
-    total = sum((float(row[1] or 0) for row in rows)) or 0.0
+    total = sum((int(row[1] or 0) for row in rows)) / 100.0
 
     datos = []
-    for metodo, monto in rows:
-        monto_value = float(monto or 0)
+    for metodo, monto_centavos in rows:
+        monto_value = int(monto_centavos or 0) / 100.0
         porcentaje = (monto_value / total) * 100.0 if total > 0 else 0.0
         datos.append(
             {
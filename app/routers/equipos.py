@@ -8,6 +8,7 @@ import logging
 from uuid import UUID
 
 from ..core.database import get_session
+from ..core.responses import list_response, model_response
 from ..core.tenant import get_current_tenant
 from .auth import get_current_user
 from ..models.tenant import Tenant
@@ -73,13 +74,13 @@ class SimularConsumoRequest(SQLModel):
 @router.get("/tipos-barril", response_model=List[TipoBarrilRead])
 def get_tipos_barril(session: Session = Depends(get_session)):
     """Obtener todos los tipos de barril"""
-    return EquipoService.get_tipos_barril(session)
+    return list_response(TipoBarrilRead, EquipoService.get_tipos_barril(session))
 
 
 @router.get("/estados-equipo", response_model=List[TipoEstadoEquipoRead])
 def get_estados_equipo(session: Session = Depends(get_session)):
     """Obtener todos los estados de equipo"""
-    return EquipoService.get_estados_equipo(session)
+    return list_response(TipoEstadoEquipoRead, EquipoService.get_estados_equipo(session))
 
 
 @router.get("/puntos-venta", response_model=List[PuntoVentaListRead])
@@ -174,7 +175,9 @@ def get_equipos(
     end_index = start_index + size
     equipos_paginados = equipos[start_index:end_index]
     
-    return EquipoResponse(equipos=equipos_paginados, total=total, page=page, size=size, total_pages=total_pages)
+    return model_response(
+        EquipoResponse(equipos=equipos_paginados, total=total, page=page, size=size, total_pages=total_pages)
+    )
 
 
 @router.get("/{equipo_id}", response_model=EquipoDetailRead)
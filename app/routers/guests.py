@@ -151,7 +151,7 @@ def upgrade_guest_to_account(
         )
     
     # Verificar que sea realmente guest
-    if not existing.is_guest():
+    if not existing.is_guest:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Este código ya tiene una cuenta asociada"
@@ -197,22 +197,7 @@ def upgrade_guest_to_account(
     
     return {
         "message": "Cuenta actualizada exitosamente",
-        "user": UserRead(
-            id=upgraded_user.id,
-            id_ext=upgraded_user.id_ext,
-            nombre_usuario=upgraded_user.nombre_usuario,
-            email=upgraded_user.email,
-            nombre=upgraded_user.nombres,
-            apellido=upgraded_user.apellidos,
-            sexo=upgraded_user.sexo,
-            fecha_nacimiento=upgraded_user.fecha_nac,
-            telefono=upgraded_user.telefono,
-            activo=upgraded_user.activo,
-            verificado=upgraded_user.verificado,
-            fecha_creacion=upgraded_user.fecha_creacion,
-            ultimo_login=upgraded_user.ultimo_login,
-            intentos_login_fallidos=upgraded_user.intentos_login_fallidos
-        ),
+        "user": UserRead.from_orm_trusted(upgraded_user),
         "token": Token(
             access_token=access_token,
             token_type="bearer",
@@ -9,6 +9,7 @@ from app.core.database import get_session
 from app.models.profile import UserProfessionalInfo
 from app.models.refresh_token import RefreshToken
 from app.models.user_extended import Usuario, TipoSexo
+from app.models.base import utcnow
 from app.routers.auth import get_current_active_user
 
 router = APIRouter(prefix="/profile", tags=["profile"])
@@ -70,7 +71,7 @@ def _get_or_create_professional(session: Session, user_id: int) -> UserProfessio
 def _activity_from_last_login(last_login: Optional[datetime]) -> str:
     if not last_login:
         return "Bajo"
-    now = datetime.utcnow()
+    now = utcnow()
     if last_login >= now - timedelta(days=1):
         return "Alto"
     if last_login >= now - timedelta(days=7):
@@ -146,7 +147,7 @@ def update_profile_me(
     professional.puesto = payload.puesto
     professional.departamento = payload.departamento
     professional.id_empleado = payload.id_empleado
-    professional.updated_at = datetime.utcnow()
+    professional.updated_at = utcnow()
 
     if payload.fecha_ingreso:
         try:
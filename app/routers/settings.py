@@ -1,9 +1,8 @@
 """
 Router para configuración de usuario (settings)
 """
-from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlmodel import Session, select
+from sqlmodel import Session, func, select
 from typing import Annotated, List, Optional
 from pydantic import BaseModel, Field
 
@@ -14,6 +13,7 @@ from app.core.security import verify_password, get_password_hash
 from app.core.rate_limit import limiter, PASSWORD_RATE_LIMIT
 from app.models.settings import UserPreferencesDB
 from app.models.refresh_token import RefreshToken
+from app.models.base import utcnow
 
 router = APIRouter(prefix="/settings", tags=["settings"])
 
@@ -148,7 +148,7 @@ def update_user_preferences(
     record.language = preferences.language
     record.date_format = preferences.date_format
     record.theme = preferences.theme
-    record.updated_at = datetime.utcnow()
+    record.updated_at = func.now()
     session.add(record)
     session.commit()
     session.refresh(record)
@@ -218,7 +218,7 @@ def get_active_sessions(
     """
     Obtener sesiones activas del usuario
     """
-    now = datetime.utcnow()
+    now = utcnow()
     records = session.exec(
         select(RefreshToken)
         .where(
@@ -264,7 +264,7 @@ def close_session(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sesión no encontrada")
 
     if record.revoked_at is None:
-        record.revoked_at = datetime.utcnow()
+        record.revoked_at = utcnow()
         session.add(record)
         session.commit()
 
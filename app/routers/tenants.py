@@ -9,6 +9,7 @@ from app.core.database import get_session
 from app.core.config import settings
 from app.models.tenant import Tenant
 from app.models.user_extended import Usuario
+from app.models.base import utcnow
 from app.routers.auth import get_current_active_user, require_admin
 from app.services.users import UserService
 from app.services.tenants import TenantService
@@ -78,9 +79,9 @@ def admin_create_tenant(
         creado_por=admin_user.id,
         activo=payload.activo,
     )
-    from datetime import datetime, timedelta
+    from datetime import timedelta
 
-    now = datetime.utcnow()
+    now = utcnow()
     tenant.suscripcion_plan = "mensual"
     tenant.suscripcion_estado = "activa" if payload.activo else "suspendida"
     tenant.suscripcion_hasta = now + timedelta(days=settings.subscription_default_days)
@@ -71,23 +71,7 @@ def create_user(
         telefono=user.telefono
     )
     
-    # Mapear el modelo a UserRead para asegurar tipos correctos (especialmente sexo)
-    return UserRead(
-        id=db_user.id,
-        id_ext=str(db_user.id_ext),
-        nombre_usuario=db_user.nombre_usuario,
-        email=db_user.email,
-        nombres=db_user.nombres,
-        apellidos=db_user.apellidos,
-        sexo=db_user.sexo.value if getattr(db_user, "sexo", None) else None,
-        fecha_nac=db_user.fecha_nac,
-        telefono=db_user.telefono,
-        activo=db_user.activo,
-        verificado=db_user.verificado,
-        fecha_creacion=db_user.fecha_creacion,
-        ultimo_login=db_user.ultimo_login,
-        intentos_login_fallidos=db_user.intentos_login_fallidos
-    )
+    return UserRead.from_orm_trusted(db_user)
 
 
 @router.get("/", response_model=UserListResponse)
@@ -105,7 +89,8 @@ def read_users(
     - **limit**: Número máximo de registros a devolver
     - **activo**: Filtrar por estado activo (opcional)
     """
-    users = UserService.get_users(session, skip=skip, limit=limit, activo=activo)
+    rows = UserService.list_users_fast(session, limit=limit, offset=skip, activo=activo)
+    users = [UserRead.from_row_trusted(row) for row in rows]
     
     # Contar total (para paginación)
     from sqlmodel import select, func
@@ -216,22 +201,7 @@ async def update_user(
     if not updated_user:
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
 
-    return UserRead(
-        id=updated_user.id,
-        nombre_usuario=updated_user.nombre_usuario,
-        email=updated_user.email,
-        nombres=updated_user.nombres,
-        apellidos=updated_user.apellidos,
-        sexo=updated_user.sexo.value if getattr(updated_user, "sexo", None) else None,
-        fecha_nac=updated_user.fecha_nac,
-        telefono=updated_user.telefono,
-        id_ext=str(updated_user.id_ext),
-        activo=updated_user.activo,
-        verificado=updated_user.verificado,
-        fecha_creacion=updated_user.fecha_creacion,
-        ultimo_login=updated_user.ultimo_login,
-        intentos_login_fallidos=updated_user.intentos_login_fallidos,
-    )
+    return UserRead.from_orm_trusted(updated_user)
 
 
 @router.delete("/{user_id}", response_model=MessageResponse)
@@ -1,12 +1,14 @@
 """
 Esquemas Pydantic para autenticación
 """
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from typing import Optional
 
 
 class Token(BaseModel):
     """Esquema para token de acceso y refresh"""
+    model_config = ConfigDict(frozen=True)
+
     access_token: str
     token_type: str = "bearer"
     expires_in: int  # segundos
@@ -15,6 +17,8 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     """Datos extraídos del token"""
+    model_config = ConfigDict(frozen=True)
+
     user_id: Optional[int] = None
     email: Optional[str] = None
 
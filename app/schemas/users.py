@@ -6,6 +6,15 @@ from typing import Optional, List
 from datetime import datetime, date
 import re
 
+from app.models.base import TrustedReadMixin
+
+
+# Reglas de complejidad de contraseña, compiladas una sola vez
+_RE_MAYUSCULA = re.compile(r"[A-Z]")
+_RE_MINUSCULA = re.compile(r"[a-z]")
+_RE_DIGITO = re.compile(r"\d")
+_RE_ESPECIAL = re.compile(r"[!@#$%^&*(),.?\":{}|<>]")
+
 
 # Esquemas para TipoRolUsuario
 class TipoRolUsuarioRead(BaseModel):
@@ -89,16 +98,16 @@ class UserCreate(UserBase):
         if len(v) < 8:
             raise ValueError("La contraseña debe tener al menos 8 caracteres")
 
-        if not re.search(r"[A-Z]", v):
+        if not _RE_MAYUSCULA.search(v):
             raise ValueError("La contraseña debe contener al menos una letra mayúscula")
 
-        if not re.search(r"[a-z]", v):
+        if not _RE_MINUSCULA.search(v):
             raise ValueError("La contraseña debe contener al menos una letra minúscula")
 
-        if not re.search(r"\d", v):
+        if not _RE_DIGITO.search(v):
             raise ValueError("La contraseña debe contener al menos un número")
 
-        if not re.search(r"[!@#$%^&*(),.?\":{}|<>]", v):
+        if not _RE_ESPECIAL.search(v):
             raise ValueError("La contraseña debe contener al menos un carácter especial (!@#$%^&*(),.?\":{}|<>)")
 
         return v
@@ -123,22 +132,22 @@ class UserUpdate(BaseModel):
         if len(v) < 8:
             raise ValueError("La contraseña debe tener al menos 8 caracteres")
 
-        if not re.search(r"[A-Z]", v):
+        if not _RE_MAYUSCULA.search(v):
             raise ValueError("La contraseña debe contener al menos una letra mayúscula")
 
-        if not re.search(r"[a-z]", v):
+        if not _RE_MINUSCULA.search(v):
             raise ValueError("La contraseña debe contener al menos una letra minúscula")
 
-        if not re.search(r"\d", v):
+        if not _RE_DIGITO.search(v):
             raise ValueError("La contraseña debe contener al menos un número")
 
-        if not re.search(r"[!@#$%^&*(),.?\":{}|<>]", v):
+        if not _RE_ESPECIAL.search(v):
             raise ValueError("La contraseña debe contener al menos un carácter especial (!@#$%^&*(),.?\":{}|<>)")
 
         return v
 
 
-class UserRead(UserBase):
+class UserRead(TrustedReadMixin, UserBase):
     """Esquema para leer usuario (respuesta)"""
     id: int
     id_ext: str
@@ -3,11 +3,12 @@ Servicio de alertas automáticas para stock de barriles
 """
 from sqlmodel import Session, select
 from typing import List, Dict, Any
-from datetime import datetime, timedelta
+from datetime import timedelta
 from decimal import Decimal
 
-from ..models.sales_point import Equipo, TipoBarril, TipoEstadoEquipo
+from ..models.sales_point import Equipo, TipoBarril
 from ..models.beer import Cerveza
+from ..models.base import utcnow
 from .equipos import EquipoService, EquipoDetailRead
 
 
@@ -35,7 +36,7 @@ class AlertaStock:
         self.tipo_alerta = tipo_alerta
         self.prioridad = prioridad
         self.mensaje = mensaje
-        self.timestamp = datetime.utcnow()
+        self.timestamp = utcnow()
     
     def to_dict(self) -> Dict[str, Any]:
         """Convertir alerta a diccionario"""
@@ -69,8 +70,7 @@ class AlertaService:
         # Obtener equipos activos
         equipos = session.exec(
             select(Equipo)
-            .join(TipoEstadoEquipo)
-            .where(TipoEstadoEquipo.permite_ventas == True)
+            .where(Equipo.puede_vender == True)
         ).all()
         
         for equipo in equipos:
@@ -177,7 +177,7 @@ class AlertaService:
                 "count": len(alertas_bajas),
                 "alertas": [a.to_dict() for a in alertas_bajas]
             },
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utcnow().isoformat()
         }
     
     @staticmethod
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from datetime import datetime
 from typing import Optional, Tuple
 
 from sqlmodel import Session, select
@@ -9,6 +8,7 @@ from app.core.security import hmac_sha256_hex
 from app.core.config import settings
 from app.models.cards import Card, CardAssignment
 from app.models.user_extended import Usuario
+from app.models.base import utcnow
 
 
 class CardService:
@@ -85,7 +85,7 @@ class CardService:
 
         if active_assignment and active_assignment.activo:
             active_assignment.activo = False
-            active_assignment.unassigned_at = datetime.utcnow()
+            active_assignment.unassigned_at = utcnow()
             session.add(active_assignment)
 
         assignment = CardAssignment(
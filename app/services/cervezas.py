@@ -4,7 +4,6 @@ Servicios de negocio para cervezas
 from sqlmodel import Session, select, and_, or_
 from typing import List, Optional
 from decimal import Decimal
-from datetime import datetime
 from sqlalchemy import desc
 from sqlalchemy.exc import IntegrityError
 
@@ -14,6 +13,7 @@ from ..models.beer import (
     TipoEstiloCervezaRead, PrecioCervezaCreate
 )
 from ..models.sales_point import Equipo, PuntoVenta
+from ..models.base import utcnow
 
 
 class CervezaService:
@@ -211,7 +211,7 @@ class CervezaService:
             ).first()
             
             if precio_actual:
-                precio_actual.fecha_fin = datetime.utcnow()
+                precio_actual.fecha_fin = utcnow()
             
             # Crear nuevo precio
             nuevo_precio = PrecioCerveza(
@@ -269,8 +269,7 @@ class CervezaService:
             .where(Equipo.activo == True)
             .join(PuntoVenta, Equipo.id_punto_de_venta == PuntoVenta.id)
             .where(PuntoVenta.tenant_id == tenant_id)
-            .join(Equipo.estado_equipo)
-            .where(Equipo.estado_equipo.has(permite_ventas=True))
+            .where(Equipo.puede_vender == True)
         ).all()
         
         return base + sum(equipo.capacidad_actual for equipo in equipos)
@@ -4,9 +4,8 @@ Refactorizado para usar ORM SQLModel en lugar de consultas SQL directas
 """
 from typing import Optional, List, Dict, Any
 from sqlmodel import Session, select, func, and_, or_, desc, asc
-from sqlalchemy.orm import selectinload, joinedload
 from sqlalchemy import case
-from datetime import datetime, date
+from datetime import date
 from decimal import Decimal
 import re
 import secrets
@@ -18,10 +17,13 @@ from app.schemas.clients import (
 
 # Importar modelos SQLModel necesarios
 from app.models import (
-    Usuario, UsuarioNivel, TipoNivelUsuario, Venta, Canje, 
-    UsuarioMetodoPago, TipoMetodoPago, TransaccionPuntos, CatalogoPremio, Pago
+    Usuario, TipoNivelUsuario, Venta, Canje, 
+    UsuarioMetodoPago, TipoMetodoPago, CatalogoPremio, Pago
 )
 from app.models.beer import Cerveza
+from app.models.base import utcnow
+from app.services.points import PointsService
+from app.services.transactions import TransactionService
 from app.services.users import UserService
 from app.core.config import settings
 
@@ -66,15 +68,14 @@ class ClientService:
                 Usuario.telefono.label('phone'),
                 Usuario.activo.label('activo'),
                 func.coalesce(TipoNivelUsuario.nivel, 'Sin Nivel').label('loyaltyLevel'),
-                func.coalesce(UsuarioNivel.puntaje_actual, 0).label('loyaltyPoints'),
+                Usuario.puntaje_cache.label('loyaltyPoints'),
                 func.coalesce(stats_subquery.c.monto_total_gastado, 0).label('totalSpent'),
                 func.coalesce(stats_subquery.c.total_ordenes, 0).label('totalOrders'),
                 Usuario.fecha_creacion.label('joinDate'),
                 stats_subquery.c.fecha_ultima_orden.label('lastOrder')
             )
             .select_from(Usuario)
-            .outerjoin(UsuarioNivel, Usuario.id == UsuarioNivel.id_usuario)
-            .outerjoin(TipoNivelUsuario, UsuarioNivel.id_nivel == TipoNivelUsuario.id)
+            .outerjoin(TipoNivelUsuario, Usuario.id_nivel_actual == TipoNivelUsuario.id)
             .outerjoin(stats_subquery, Usuario.id == stats_subquery.c.id_usuario)
             .where(Usuario.tenant_id == tenant_id)
         )
@@ -99,7 +100,7 @@ class ClientService:
             'name': (Usuario.nombres + ' ' + Usuario.apellidos),
             'joinDate': Usuario.fecha_creacion,
             'totalSpent': func.coalesce(stats_subquery.c.monto_total_gastado, 0),
-            'loyaltyPoints': func.coalesce(UsuarioNivel.puntaje_actual, 0)
+            'loyaltyPoints': Usuario.puntaje_cache
         }
         
         sort_field = sort_mapping.get(sort_by, sort_mapping['name'])
@@ -161,17 +162,10 @@ class ClientService:
         Obtener detalle completo de un cliente por su id_ext usando ORM
         """
         
-        # Buscar usuario con relaciones cargadas
-        query = (
-            select(Usuario)
-            .options(
-                selectinload(Usuario.nivel).selectinload(UsuarioNivel.nivel),
-                selectinload(Usuario.ventas),
-                selectinload(Usuario.canjes),
-                selectinload(Usuario.metodos_pago).selectinload(UsuarioMetodoPago.metodo_pago)
-            )
-            .where(Usuario.id_ext == client_id, Usuario.tenant_id == tenant_id)
-        )
+        # Solo columnas del usuario: estadísticas, lealtad, órdenes y métodos de pago
+        # se resuelven con consultas agregadas/acotadas más abajo, así que cargar
+        # aquí ventas y canjes completos solo multiplicaba filas
+        query = select(Usuario).where(Usuario.id_ext == client_id, Usuario.tenant_id == tenant_id)
         
         result = session.exec(query)
         user = result.first()
@@ -282,24 +276,21 @@ class ClientService:
     def _get_client_loyalty(session: Session, user_id: int) -> ClientLoyalty:
         """Obtener información de lealtad del cliente usando ORM"""
         
-        # Buscar nivel del usuario
+        # Saldo y nivel vigentes del usuario
         query = (
-            select(UsuarioNivel, TipoNivelUsuario)
-            .join(TipoNivelUsuario, UsuarioNivel.id_nivel == TipoNivelUsuario.id)
-            .where(UsuarioNivel.id_usuario == user_id)
+            select(Usuario.puntaje_cache, TipoNivelUsuario)
+            .outerjoin(TipoNivelUsuario, Usuario.id_nivel_actual == TipoNivelUsuario.id)
+            .where(Usuario.id == user_id)
         )
         
-        result = session.exec(query).first()
+        current_points, tipo_nivel = session.exec(query).first() or (0, None)
         
-        if result:
-            usuario_nivel, tipo_nivel = result
-            current_points = usuario_nivel.puntaje_actual
+        if tipo_nivel:
             level = tipo_nivel.nivel
             level_benefits = tipo_nivel.beneficios
             max_points = tipo_nivel.puntaje_max
             min_points = tipo_nivel.puntaje_min
         else:
-            current_points = 0
             level = 'Sin Nivel'
             level_benefits = None
             max_points = None
@@ -404,12 +395,7 @@ class ClientService:
 
     @staticmethod
     def get_loyalty_history(session: Session, user_id: int, limit: int = 50) -> List[PointTransaction]:
-        rows = session.exec(
-            select(TransaccionPuntos)
-            .where(TransaccionPuntos.id_usuario == user_id)
-            .order_by(desc(TransaccionPuntos.fecha))
-            .limit(limit)
-        ).all()
+        rows = TransactionService.transacciones_de_usuario(session, user_id, limite=limit)
 
         txs: List[PointTransaction] = []
         for t in rows:
@@ -440,21 +426,20 @@ class ClientService:
     @staticmethod
     def get_rewards(session: Session, user_id: int) -> dict:
         loyalty = ClientService._get_client_loyalty(session, user_id)
-        now = datetime.utcnow()
+        now = utcnow()
 
         available_rows = session.exec(
             select(CatalogoPremio)
             .where(
-                CatalogoPremio.activo == True,
+                CatalogoPremio.disponible == True,
                 or_(CatalogoPremio.fecha_vencimiento == None, CatalogoPremio.fecha_vencimiento > now),
-                or_(CatalogoPremio.stock_disponible == None, CatalogoPremio.stock_disponible > 0),
             )
             .order_by(asc(CatalogoPremio.puntos_requeridos), asc(CatalogoPremio.nombre))
         ).all()
 
         redeemed_rows = session.exec(
-            select(Canje, CatalogoPremio)
-            .join(CatalogoPremio, CatalogoPremio.id == Canje.id_premio)
+            select(Canje, CatalogoPremio.nombre, CatalogoPremio.categoria)
+            .outerjoin(CatalogoPremio, CatalogoPremio.id == Canje.id_premio)
             .where(Canje.id_usuario == user_id)
             .order_by(desc(Canje.fecha_canje))
             .limit(20)
@@ -474,18 +459,18 @@ class ClientService:
             )
 
         history: List[ClientRewardItem] = []
-        for canje, premio in redeemed_rows:
+        for canje, premio_nombre, premio_categoria in redeemed_rows:
             status = "Canjeado"
             if getattr(canje, "estado", None) == "cancelado":
                 status = "Expirado"
             history.append(
                 ClientRewardItem(
-                    id=premio.id,
-                    name=premio.nombre,
+                    id=canje.id_premio,
+                    name=canje.premio_nombre_snapshot or premio_nombre or "",
                     pointsCost=int(canje.puntos_utilizados),
                     status=status,
                     redeemedDate=canje.fecha_canje,
-                    category=premio.categoria,
+                    category=premio_categoria,
                 )
             )
 
@@ -503,7 +488,7 @@ class ClientService:
             raise ValueError("Cliente no encontrado")
 
         premio = session.get(CatalogoPremio, premio_id)
-        if not premio or not premio.activo:
+        if not premio or not premio.disponible:
             raise ValueError("Premio no disponible")
 
         loyalty = ClientService._get_client_loyalty(session, user.id)
@@ -516,27 +501,24 @@ class ClientService:
             puntos_utilizados=int(premio.puntos_requeridos),
             estado="canjeado",
             notas=None,
+            premio_nombre_snapshot=premio.nombre,
+            premio_descripcion_snapshot=premio.descripcion,
         )
         session.add(canje)
-        session.commit()
-        session.refresh(canje)
-
-        usuario_nivel = session.exec(select(UsuarioNivel).where(UsuarioNivel.id_usuario == user.id)).first()
-        if usuario_nivel:
-            usuario_nivel.puntaje_actual = max(0, int(usuario_nivel.puntaje_actual or 0) - int(premio.puntos_requeridos))
-            session.add(usuario_nivel)
-
-        tx = TransaccionPuntos(
-            id_usuario=user.id,
-            puntos_ganados=0,
-            puntos_canjeados=int(premio.puntos_requeridos),
-            saldo_anterior=max(0, int(loyalty.currentPoints)),
-            saldo_posterior=max(0, int(loyalty.currentPoints) - int(premio.puntos_requeridos)),
-            id_canje=canje.id,
-            descripcion=f"Canje: {premio.nombre}",
-            tipo_transaccion="canje",
-        )
-        session.add(tx)
+        # Canje y débito van en un único commit: sin saldo no queda el canje
+        session.flush()
+
+        try:
+            PointsService.debitar_canje(
+                session,
+                id_usuario=user.id,
+                id_canje=canje.id,
+                puntos_canjeados=int(premio.puntos_requeridos),
+                descripcion=f"Canje: {premio.nombre}",
+            )
+        except ValueError:
+            session.rollback()
+            raise
 
         if premio.stock_disponible is not None and premio.stock_disponible > 0:
             premio.stock_disponible -= 1
@@ -734,6 +716,7 @@ class ClientService:
             telefono=phone,
             tenant_id=tenant_id,
             registrado_por=creado_por,
+            with_wallet=True,
         )
 
         if address is not None:
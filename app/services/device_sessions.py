@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from datetime import datetime
 from decimal import Decimal, ROUND_HALF_UP
 from typing import Optional
 
@@ -8,12 +7,14 @@ from sqlmodel import Session, select
 
 from app.models.cards import Card, CardAssignment
 from app.models.device_session import DeviceSession
-from app.models.points import CalculadoraPuntos, ReglaConversionPuntos
 from app.models.pricing import ConsultaPrecio
 from app.models.sales import Venta
 from app.models.sales_point import Equipo, PuntoVenta
-from app.models.transactions import Pago, TipoEstadoPago, TransaccionPuntos
-from app.models.user_extended import TipoMetodoPago, UsuarioNivel
+from app.models.transactions import Pago, TipoEstadoPago
+from app.models.user_extended import TipoMetodoPago
+from app.models.base import utcnow
+from app.services import reference_cache
+from app.services.points import PointsService
 from app.services.pricing import PricingService
 from app.services.wallets import WalletService
 
@@ -60,7 +61,7 @@ class DeviceSessionService:
             id_cerveza=equipo.id_cerveza,
             id_equipo=equipo.id,
             id_punto_venta=equipo.id_punto_de_venta,
-            fecha_consulta=datetime.utcnow(),
+            fecha_consulta=utcnow(),
             cantidad=1,
         )
         calculo = PricingService.calcular_precio(session, consulta, tenant_id=tenant_id)
@@ -72,10 +73,10 @@ class DeviceSessionService:
         if payment_mode == "wallet":
             if user_id:
                 wallet = WalletService.get_or_create_user_wallet(session, tenant_id=tenant_id, user_id=user_id)
-                if Decimal(str(wallet.balance)) <= 0:
+                if wallet.balance_cents <= 0:
                     max_ml = 0
                 else:
-                    max_ml_by_balance = int((Decimal(str(wallet.balance)) / price_per_liter) * Decimal(1000))
+                    max_ml_by_balance = int((wallet.balance / price_per_liter) * Decimal(1000))
                     max_ml = max(0, min(int(requested_ml), int(max_ml_by_balance)))
             elif uid_hash:
                 card = session.exec(select(Card).where(Card.uid_hash == uid_hash, Card.activo == True)).first()
@@ -89,10 +90,10 @@ class DeviceSessionService:
                     ).first()
                     if assignment and assignment.assignment_type == "anonymous_wallet" and assignment.user_id is None:
                         wallet = WalletService.get_or_create_card_wallet(session, tenant_id=tenant_id, card_id=card.id)
-                        if Decimal(str(wallet.balance)) <= 0:
+                        if wallet.balance_cents <= 0:
                             max_ml = 0
                         else:
-                            max_ml_by_balance = int((Decimal(str(wallet.balance)) / price_per_liter) * Decimal(1000))
+                            max_ml_by_balance = int((wallet.balance / price_per_liter) * Decimal(1000))
                             max_ml = max(0, min(int(requested_ml), int(max_ml_by_balance)))
 
         device_session = DeviceSession(
@@ -182,7 +183,7 @@ class DeviceSessionService:
 
         venta = Venta(
             id_ext=str(uuid4()),
-            fecha_hora=datetime.utcnow(),
+            fecha_hora=utcnow(),
             cantidad_ml=poured_ml_capped,
             monto_total=final_amount,
             descuento_aplicado=Decimal("0.00"),
@@ -193,60 +194,36 @@ class DeviceSessionService:
         session.add(venta)
         session.flush()
 
-        metodo = session.exec(select(TipoMetodoPago).where(TipoMetodoPago.metodo_pago == "Saldo BeCard")).first()
-        if not metodo:
+        metodo_id = reference_cache.get_metodo_pago_id(session, "Saldo BeCard")
+        if metodo_id is None:
             metodo = TipoMetodoPago(metodo_pago="Saldo BeCard", activo=True, requiere_autorizacion=False)
             session.add(metodo)
             session.flush()
+            metodo_id = metodo.id
 
         pago = Pago(
             id_venta=int(venta.id),
             fecha_venta=venta.fecha_hora,
-            id_metodo_pago=int(metodo.id),
-            monto=final_amount,
+            id_metodo_pago=int(metodo_id),
+            monto_centavos=int((final_amount * 100).to_integral_value(ROUND_HALF_UP)),
             estado=TipoEstadoPago.APROBADO,
             id_transaccion_proveedor=str(device_session.id_ext),
         )
         session.add(pago)
 
         if device_session.user_id:
-            now = datetime.utcnow()
-            reglas = session.exec(
-                select(ReglaConversionPuntos).where(
-                    ReglaConversionPuntos.activo == True,
-                    ReglaConversionPuntos.fecha_inicio <= now,
-                    (ReglaConversionPuntos.fecha_fin == None) | (ReglaConversionPuntos.fecha_fin >= now),
-                )
-            ).all()
-            calculo_puntos = CalculadoraPuntos.calcular_puntos(final_amount, list(reglas))
-
-            nivel = session.exec(select(UsuarioNivel).where(UsuarioNivel.id_usuario == int(device_session.user_id))).first()
-            if not nivel:
-                nivel = UsuarioNivel(id_usuario=int(device_session.user_id), id_nivel=1, puntaje_actual=0)
-                session.add(nivel)
-                session.flush()
-
-            saldo_anterior = int(nivel.puntaje_actual or 0)
-            saldo_posterior = max(0, saldo_anterior + int(calculo_puntos.puntos_ganados))
-            nivel.puntaje_actual = saldo_posterior
-            session.add(nivel)
-
-            tx_puntos = TransaccionPuntos(
+            PointsService.acreditar_venta(
+                session,
                 id_usuario=int(device_session.user_id),
-                puntos_ganados=int(calculo_puntos.puntos_ganados),
-                puntos_canjeados=0,
-                saldo_anterior=max(0, saldo_anterior),
-                saldo_posterior=max(0, saldo_posterior),
                 id_venta=int(venta.id),
+                monto=final_amount,
                 descripcion=f"Venta {venta.id_ext}",
-                tipo_transaccion="venta",
             )
-            session.add(tx_puntos)
 
         device_session.poured_ml = poured_ml_capped
         device_session.final_amount = final_amount
         device_session.status = "completed"
-        device_session.completed_at = datetime.utcnow()
+        device_session.completed_at = utcnow()
         device_session.venta_id = int(venta.id)
         device_session.venta_fecha_hora = venta.fecha_hora
         session.add(device_session)
@@ -288,7 +265,7 @@ class DeviceSessionService:
 
         venta = Venta(
             id_ext=str(uuid4()),
-            fecha_hora=datetime.utcnow(),
+            fecha_hora=utcnow(),
             cantidad_ml=poured_ml_capped,
             monto_total=final_amount,
             descuento_aplicado=Decimal("0.00"),
@@ -299,17 +276,18 @@ class DeviceSessionService:
         session.add(venta)
         session.flush()
 
-        metodo = session.exec(select(TipoMetodoPago).where(TipoMetodoPago.metodo_pago == payment_method_name)).first()
-        if not metodo:
+        metodo_id = reference_cache.get_metodo_pago_id(session, payment_method_name)
+        if metodo_id is None:
             metodo = TipoMetodoPago(metodo_pago=payment_method_name, activo=True, requiere_autorizacion=True)
             session.add(metodo)
             session.flush()
+            metodo_id = metodo.id
 
         pago = Pago(
             id_venta=int(venta.id),
             fecha_venta=venta.fecha_hora,
-            id_metodo_pago=int(metodo.id),
-            monto=final_amount,
+            id_metodo_pago=int(metodo_id),
+            monto_centavos=int((final_amount * 100).to_integral_value(ROUND_HALF_UP)),
             estado=TipoEstadoPago.PENDIENTE,
             id_transaccion_proveedor=provider_transaction_id or str(device_session.id_ext),
         )
@@ -319,7 +297,7 @@ class DeviceSessionService:
         device_session.poured_ml = poured_ml_capped
         device_session.final_amount = final_amount
         device_session.status = "pending_payment"
-        device_session.completed_at = datetime.utcnow()
+        device_session.completed_at = utcnow()
         device_session.venta_id = int(venta.id)
         device_session.venta_fecha_hora = venta.fecha_hora
         device_session.pago_id = int(pago.id)
@@ -356,7 +334,7 @@ class DeviceSessionService:
         device_session.poured_ml = poured_ml_capped
         device_session.final_amount = final_amount
         device_session.status = "completed"
-        device_session.completed_at = datetime.utcnow()
+        device_session.completed_at = utcnow()
 
         session.add(device_session)
         session.commit()
@@ -7,6 +7,7 @@ from sqlmodel import Session, select
 
 from app.models.email_verification_token import EmailVerificationToken
 from app.models.user_extended import Usuario
+from app.models.base import utcnow
 
 
 def compute_email_verification_token_hash(raw_token: str) -> str:
@@ -22,7 +23,7 @@ class EmailVerificationService:
     ) -> Tuple[str, datetime]:
         raw_token = secrets.token_urlsafe(32)
         token_hash = compute_email_verification_token_hash(raw_token)
-        expires_at = datetime.utcnow() + timedelta(minutes=expires_in_minutes)
+        expires_at = utcnow() + timedelta(minutes=expires_in_minutes)
 
         record = EmailVerificationToken(
             user_id=user.id,
@@ -41,7 +42,7 @@ class EmailVerificationService:
             return None
         if record.used_at is not None:
             return None
-        if record.expires_at <= datetime.utcnow():
+        if record.expires_at <= utcnow():
             return None
         return record
 
@@ -57,7 +58,7 @@ class EmailVerificationService:
 
         user.verificado = True
         user.activo = True
-        record.used_at = datetime.utcnow()
+        record.used_at = utcnow()
 
         session.add(user)
         session.add(record)
@@ -8,6 +8,7 @@ from datetime import datetime
 from uuid import UUID
 
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, raiseload
 
 from ..models.sales_point import (
     Equipo, EquipoCreate, EquipoRead, EquipoUpdate,
@@ -15,6 +16,7 @@ from ..models.sales_point import (
     TipoEstadoEquipoRead, TipoBarrilRead, PuntoVentaRead
 )
 from ..models.beer import Cerveza, CervezaRead
+from . import reference_cache
 
 class EquipoDetailRead(EquipoRead):
     """Esquema extendido para leer equipo con detalles completos"""
@@ -34,6 +36,17 @@ class CambiarCervezaRequest(SQLModel):
     motivo: Optional[str] = None
 
 
+# Relaciones muchos-a-uno que usa _equipo_to_detail_read: se cargan en la misma
+# consulta y cualquier otra carga perezosa falla en lugar de provocar N+1
+_OPCIONES_DETALLE = (
+    joinedload(Equipo.estado_equipo),
+    joinedload(Equipo.barril_tipo),
+    joinedload(Equipo.punto_venta),
+    joinedload(Equipo.cerveza),
+    raiseload("*"),
+)
+
+
 class EquipoService:
     """Servicio de negocio para equipos"""
 
@@ -107,7 +120,12 @@ class EquipoService:
     def get_equipos_with_details(session: Session, tenant_id: Optional[int] = None) -> List[EquipoDetailRead]:
         """Obtener equipos con detalles completos"""
 
-        stmt = select(Equipo).where(Equipo.activo == True).order_by(Equipo.nombre_equipo, Equipo.id)
+        stmt = (
+            select(Equipo)
+            .options(*_OPCIONES_DETALLE)
+            .where(Equipo.activo == True)
+            .order_by(Equipo.nombre_equipo, Equipo.id)
+        )
         if tenant_id is not None:
             stmt = (
                 stmt.join(PuntoVenta, Equipo.id_punto_de_venta == PuntoVenta.id)
@@ -144,6 +162,7 @@ class EquipoService:
         equipo_dict = equipo_data.model_dump()
         equipo = Equipo(**equipo_dict)
         equipo.tenant_id = tenant_id
+        EquipoService._sincronizar_puede_vender(session, equipo)
 
         if equipo.codigo_equipo is None:
             equipo.codigo_equipo = EquipoService._generate_equipo_codigo(session, tenant_id=tenant_id)
@@ -283,6 +302,8 @@ class EquipoService:
         update_data = equipo_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(equipo, field, value)
+        if "id_estado_equipo" in update_data:
+            EquipoService._sincronizar_puede_vender(session, equipo)
         
         session.commit()
         session.refresh(equipo)
@@ -352,6 +373,7 @@ class EquipoService:
             raise ValueError(f"Estado con ID {nuevo_estado_id} no encontrado")
         
         equipo.id_estado_equipo = nuevo_estado_id
+        equipo.puede_vender = estado.permite_ventas
         
         # TODO: Registrar el cambio de estado en un log
         
@@ -392,10 +414,9 @@ class EquipoService:
             raise ValueError("Estados Activo/Inactivo no encontrados en la base de datos")
         
         # Alternar estado
-        if estado_actual.estado == "Activo":
-            equipo.id_estado_equipo = estado_inactivo.id
-        else:
-            equipo.id_estado_equipo = estado_activo.id
+        nuevo_estado = estado_inactivo if estado_actual.estado == "Activo" else estado_activo
+        equipo.id_estado_equipo = nuevo_estado.id
+        equipo.puede_vender = nuevo_estado.permite_ventas
         
         # TODO: Registrar el cambio de estado en un log
         
@@ -438,41 +459,22 @@ class EquipoService:
     @staticmethod
     def get_tipos_barril(session: Session) -> List[TipoBarrilRead]:
         """Obtener todos los tipos de barril"""
-        tipos = session.exec(select(TipoBarril).order_by(TipoBarril.capacidad)).all()
-        return [
-            TipoBarrilRead(
-                id=tipo.id,
-                id_ext=str(tipo.id_ext),
-                capacidad=tipo.capacidad,
-                nombre=tipo.nombre
-            )
-            for tipo in tipos
-        ]
+        return reference_cache.listar_tipos_barril(session)
     
     @staticmethod
     def get_estados_equipo(session: Session) -> List[TipoEstadoEquipoRead]:
         """Obtener todos los estados de equipo"""
-        estados = session.exec(select(TipoEstadoEquipo).order_by(TipoEstadoEquipo.estado)).all()
-        return [
-            TipoEstadoEquipoRead(
-                id=estado.id,
-                id_ext=str(estado.id_ext),
-                estado=estado.estado,
-                permite_ventas=estado.permite_ventas
-            )
-            for estado in estados
-        ]
+        return reference_cache.listar_estados_equipo(session)
     
     @staticmethod
     def get_equipos_con_stock_bajo(session: Session, umbral_porcentaje: int = 20) -> List[EquipoDetailRead]:
         """Obtener equipos con stock bajo"""
-        equipos = session.exec(select(Equipo)).all()
+        equipos = session.exec(select(Equipo).options(*_OPCIONES_DETALLE)).all()
         equipos_stock_bajo = []
         
         for equipo in equipos:
-            barril = session.get(TipoBarril, equipo.id_barril)
             porcentaje = EquipoService.get_nivel_barril_porcentaje(
-                barril.capacidad, 
+                equipo.barril_tipo.capacidad, 
                 equipo.capacidad_actual
             )
             
@@ -482,57 +484,34 @@ class EquipoService:
         
         return equipos_stock_bajo
     
+    @staticmethod
+    def _sincronizar_puede_vender(session: Session, equipo: Equipo) -> None:
+        """Copia permite_ventas del estado actual al campo desnormalizado del equipo"""
+        estado = reference_cache.get_estado_equipo(session, equipo.id_estado_equipo)
+        equipo.puede_vender = bool(estado.permite_ventas) if estado else False
+    
     @staticmethod
     def _equipo_to_detail_read(session: Session, equipo: Equipo) -> EquipoDetailRead:
         """Convertir modelo Equipo a EquipoDetailRead con datos adicionales"""
         
-        # Obtener estado
-        estado = session.get(TipoEstadoEquipo, equipo.id_estado_equipo)
-        estado_read = TipoEstadoEquipoRead(
-            id=estado.id,
-            id_ext=str(estado.id_ext),
-            estado=estado.estado,
-            permite_ventas=estado.permite_ventas
-        )
+        # Relaciones: precargadas con _OPCIONES_DETALLE en los listados,
+        # carga perezosa (una consulta cada una) para un único equipo
+        estado_read = TipoEstadoEquipoRead.from_orm_trusted(equipo.estado_equipo)
         
-        # Obtener barril
-        barril = session.get(TipoBarril, equipo.id_barril)
-        barril_read = TipoBarrilRead(
-            id=barril.id,
-            id_ext=str(barril.id_ext),
-            capacidad=barril.capacidad,
-            nombre=barril.nombre
-        )
+        barril = equipo.barril_tipo
+        barril_read = TipoBarrilRead.from_orm_trusted(barril)
         
         # Obtener punto de venta (opcional)
         punto_venta_read = None
         if equipo.id_punto_de_venta:
-            punto_venta = session.get(PuntoVenta, equipo.id_punto_de_venta)
+            punto_venta = equipo.punto_venta
             if punto_venta:
-                punto_venta_read = PuntoVentaRead(
-                    id=punto_venta.id,
-                    id_ext=str(punto_venta.id_ext),
-                    nombre=punto_venta.nombre,
-                    calle=punto_venta.calle,
-                    altura=punto_venta.altura,
-                    localidad=punto_venta.localidad,
-                    provincia=punto_venta.provincia,
-                    codigo_postal=punto_venta.codigo_postal,
-                    telefono=punto_venta.telefono,
-                    email=punto_venta.email,
-                    horario_apertura=punto_venta.horario_apertura,
-                    horario_cierre=punto_venta.horario_cierre,
-                    codigo_punto_venta=punto_venta.codigo_punto_venta,
-                    activo=punto_venta.activo,
-                    creado_el=punto_venta.creado_el,
-                    creado_por=punto_venta.creado_por,
-                    id_usuario_socio=punto_venta.id_usuario_socio
-                )
+                punto_venta_read = PuntoVentaRead.from_orm_trusted(punto_venta)
         
         # Obtener cerveza actual (opcional)
         cerveza_read = None
         if equipo.id_cerveza:
-            cerveza = session.get(Cerveza, equipo.id_cerveza)
+            cerveza = equipo.cerveza
             if cerveza:
                 cerveza_read = CervezaRead(
                     id=cerveza.id,
@@ -571,6 +550,7 @@ class EquipoService:
             id_punto_de_venta=equipo.id_punto_de_venta,
             id_cerveza=equipo.id_cerveza,
             tenant_id=equipo.tenant_id,
+            puede_vender=equipo.puede_vender,
             creado_el=equipo.creado_el,
             estado=estado_read,
             barril=barril_read,
@@ -6,7 +6,8 @@ from sqlmodel import Session, select, func
 from datetime import datetime, date
 
 from app.models.user_extended import Usuario, UsuarioRol, UsuarioNivel
-from app.services.users import UserService
+from app.services import role_cache
+from app.services.users import OPCIONES_LISTADO_USUARIOS, UserService
 from app.core.security import get_password_hash
 
 
@@ -55,18 +56,18 @@ class GuestService:
             tipo_registro='punto_venta',
             activo=True,
             verificado=False,
-            registrado_por=registrado_por
+            registrado_por=registrado_por,
+            id_nivel_actual=1  # Bronce
         )
         
         session.add(guest)
         session.commit()
         session.refresh(guest)
         
-        # Asignar nivel inicial (Bronce)
+        # Registrar la asignación del nivel inicial (Bronce)
         usuario_nivel = UsuarioNivel(
             id_usuario=guest.id,
-            id_nivel=1,  # Bronce
-            puntaje_actual=0
+            id_nivel=1
         )
         session.add(usuario_nivel)
         
@@ -78,6 +79,7 @@ class GuestService:
         session.add(usuario_rol)
         
         session.commit()
+        role_cache.invalidar_usuario(guest.id)
         session.refresh(guest)
         
         return guest
@@ -120,7 +122,7 @@ class GuestService:
             return None
         
         # Verificar que sea realmente guest
-        if not guest.is_guest():
+        if not guest.is_guest:
             return None  # Ya tiene cuenta
         
         # Verificar que email no esté usado
@@ -200,7 +202,7 @@ class GuestService:
             "total_compras": total_compras,
             "monto_total_gastado": float(monto_total),
             "fecha_registro": guest.fecha_creacion,
-            "puede_actualizar_cuenta": guest.is_guest()
+            "puede_actualizar_cuenta": guest.is_guest
         }
     
     @staticmethod
@@ -223,10 +225,7 @@ class GuestService:
         Returns:
             Lista de clientes guest
         """
-        statement = select(Usuario).where(
-            Usuario.tipo_registro == 'punto_venta',
-            Usuario.email == None
-        )
+        statement = select(Usuario).options(*OPCIONES_LISTADO_USUARIOS).where(Usuario.is_guest)
         
         if registrado_por:
             statement = statement.where(Usuario.registrado_por == registrado_por)
@@ -9,6 +9,7 @@ from app.core.security import get_password_hash
 from app.models.password_reset_token import PasswordResetToken
 from app.models.user_extended import Usuario
 from app.models.refresh_token import RefreshToken
+from app.models.base import utcnow
 
 
 def compute_password_reset_token_hash(raw_token: str) -> str:
@@ -24,7 +25,7 @@ class PasswordResetService:
     ) -> Tuple[str, datetime]:
         raw_token = secrets.token_urlsafe(32)
         token_hash = compute_password_reset_token_hash(raw_token)
-        expires_at = datetime.utcnow() + timedelta(minutes=expires_in_minutes)
+        expires_at = utcnow() + timedelta(minutes=expires_in_minutes)
 
         record = PasswordResetToken(
             user_id=user.id,
@@ -37,7 +38,7 @@ class PasswordResetService:
 
     @staticmethod
     def mark_used(session: Session, record: PasswordResetToken) -> None:
-        record.used_at = datetime.utcnow()
+        record.used_at = utcnow()
         session.add(record)
         session.commit()
 
@@ -51,7 +52,7 @@ class PasswordResetService:
             return None
         if record.used_at is not None:
             return None
-        if record.expires_at <= datetime.utcnow():
+        if record.expires_at <= utcnow():
             return None
         return record
 
@@ -69,7 +70,6 @@ class PasswordResetService:
             raise ValueError("Usuario no encontrado")
 
         user.password_hash = get_password_hash(new_password)
-        user.password_salt = ""
         user.intentos_login_fallidos = 0
         user.bloqueado_hasta = None
         user.activo = True
@@ -77,7 +77,7 @@ class PasswordResetService:
         PasswordResetService.mark_used(session, record)
 
         tokens = session.exec(select(RefreshToken).where(RefreshToken.user_id == user.id)).all()
-        now = datetime.utcnow()
+        now = utcnow()
         for t in tokens:
             if t.revoked_at is None:
                 t.revoked_at = now
@@ -0,0 +1,112 @@
+"""
+Servicio de puntos de fidelidad: acreditación por ventas y saldo cacheado
+"""
+from decimal import Decimal
+from typing import Optional, Tuple
+
+from sqlalchemy import func, update
+from sqlmodel import Session, select
+
+from ..models.points import CalculadoraPuntos, ReglaConversionPuntos
+from ..models.transactions import GestorTransaccionesPuntos, TransaccionPuntos
+from ..models.user_extended import Usuario
+from ..models.base import utcnow
+from .users import UserService
+
+
+class PointsService:
+    """Servicio para movimientos de puntos y su saldo cacheado en Usuario.puntaje_cache"""
+
+    @staticmethod
+    def aplicar_delta_saldo(session: Session, id_usuario: int, delta: int) -> Tuple[int, int]:
+        """
+        Suma ``delta`` al saldo cacheado del usuario con un único UPDATE atómico.
+
+        Debe ejecutarse en la misma transacción que inserta la TransaccionPuntos.
+        Un débito solo se aplica si el saldo alcanza (la condición va en el
+        propio UPDATE, así dos canjes concurrentes no lo dejan negativo). Un
+        usuario sin nivel recibe el nivel 1 en el mismo UPDATE.
+
+        Returns:
+            Tupla (saldo_anterior, saldo_posterior)
+
+        Raises:
+            ValueError: Si el usuario no existe, o si ``delta`` es negativo y el
+                saldo no alcanza
+        """
+        stmt = update(Usuario).where(Usuario.id == id_usuario)
+        if delta < 0:
+            stmt = stmt.where(Usuario.puntaje_cache >= -delta)
+        saldo_posterior = session.execute(
+            stmt.values(
+                puntaje_cache=Usuario.puntaje_cache + delta,
+                id_nivel_actual=func.coalesce(Usuario.id_nivel_actual, 1),
+            ).returning(Usuario.puntaje_cache)
+        ).scalar_one_or_none()
+        if saldo_posterior is None:
+            if delta >= 0:
+                raise ValueError("Usuario no encontrado")
+            raise ValueError("Puntos insuficientes")
+        UserService.invalidate_user_on_commit(session, id_usuario)
+
+        return int(saldo_posterior) - delta, int(saldo_posterior)
+
+    @staticmethod
+    def acreditar_venta(
+        session: Session,
+        *,
+        id_usuario: int,
+        id_venta: int,
+        monto: Decimal,
+        descripcion: Optional[str] = None,
+    ) -> TransaccionPuntos:
+        """Calcula los puntos de una venta según las reglas vigentes y los acredita"""
+        now = utcnow()
+        reglas = session.exec(
+            select(ReglaConversionPuntos).where(
+                ReglaConversionPuntos.activo == True,
+                ReglaConversionPuntos.fecha_inicio <= now,
+                (ReglaConversionPuntos.fecha_fin == None) | (ReglaConversionPuntos.fecha_fin >= now),
+            )
+        ).all()
+        calculo = CalculadoraPuntos.calcular_puntos(monto, list(reglas))
+        puntos_ganados = int(calculo.puntos_ganados)
+
+        saldo_anterior, _ = PointsService.aplicar_delta_saldo(session, id_usuario, puntos_ganados)
+        datos = GestorTransaccionesPuntos.crear_transaccion_venta(
+            id_usuario=id_usuario,
+            id_venta=id_venta,
+            puntos_ganados=puntos_ganados,
+            saldo_anterior=saldo_anterior,
+            descripcion=descripcion,
+        )
+        tx = TransaccionPuntos(**datos.model_dump())
+        session.add(tx)
+        return tx
+
+    @staticmethod
+    def debitar_canje(
+        session: Session,
+        *,
+        id_usuario: int,
+        id_canje: int,
+        puntos_canjeados: int,
+        descripcion: Optional[str] = None,
+    ) -> TransaccionPuntos:
+        """
+        Descuenta del saldo los puntos de un canje y registra la transacción
+
+        Raises:
+            ValueError: Si el saldo no alcanza; no se modifica nada
+        """
+        saldo_anterior, _ = PointsService.aplicar_delta_saldo(session, id_usuario, -puntos_canjeados)
+        datos = GestorTransaccionesPuntos.crear_transaccion_canje(
+            id_usuario=id_usuario,
+            id_canje=id_canje,
+            puntos_canjeados=puntos_canjeados,
+            saldo_anterior=saldo_anterior,
+            descripcion=descripcion,
+        )
+        tx = TransaccionPuntos(**datos.model_dump())
+        session.add(tx)
+        return tx
@@ -2,7 +2,7 @@
 Servicio de negocio para reglas de precios y cálculo
 """
 from typing import List, Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import timedelta
 from sqlmodel import Session, select
 from decimal import Decimal
 
@@ -16,11 +16,13 @@ from ..models.pricing import (
     ConsultaPrecio,
     CalculoPrecio,
     CalculadoraPrecios,
+    LoteReglasPrecio,
 )
 from ..models.base import TipoAlcanceRegla, TipoPrioridadRegla
 from .cervezas import CervezaService
 from ..models.beer import Cerveza
 from ..models.sales_point import PuntoVenta, Equipo
+from ..models.base import utcnow
 
 
 class PricingService:
@@ -47,7 +49,7 @@ class PricingService:
         if activo is not None:
             query = query.where(ReglaDePrecio.esta_activo == activo)
 
-        now = datetime.utcnow()
+        now = utcnow()
         if estado:
             estado_lower = estado.lower()
             if estado_lower == "programada":
@@ -127,7 +129,6 @@ class PricingService:
             fecha_hora_fin=fecha_fin,
             dias_semana=data.dias_semana,
             creado_por=user_id,
-            creado_el=datetime.utcnow(),
             tenant_id=tenant_id,
         )
         session.add(regla)
@@ -280,7 +281,8 @@ class PricingService:
         )
 
         # Aplicar reglas y multiplicadores
-        calculo = CalculadoraPrecios.aplicar_reglas(precio_base, reglas, consulta.fecha_consulta)
+        lote = LoteReglasPrecio(reglas)
+        calculo = CalculadoraPrecios.aplicar_reglas_lote(precio_base, lote, consulta.fecha_consulta)
         return calculo
 
     @staticmethod
@@ -292,7 +294,7 @@ class PricingService:
         id_punto_venta: Optional[int] = None,
     ) -> List[ReglaDePrecio]:
         """Obtiene las reglas activas que aplican al contexto. Si no hay alcances, se considera regla global."""
-        now = datetime.utcnow()
+        now = utcnow()
         reglas_activas = session.exec(
             select(ReglaDePrecio).where(ReglaDePrecio.esta_activo == True, ReglaDePrecio.tenant_id == tenant_id)
         ).all()
@@ -328,7 +330,7 @@ class PricingService:
     def _to_read(session: Session, regla: Optional[ReglaDePrecio]) -> Optional[ReglaDePrecioRead]:
         if not regla:
             return None
-        now = datetime.utcnow()
+        now = utcnow()
         vigente = False
         if regla.fecha_hora_fin is not None:
             vigente = regla.esta_activo and regla.fecha_hora_inicio <= now <= regla.fecha_hora_fin
@@ -0,0 +1,64 @@
+"""
+Caché en proceso de tablas de referencia pequeñas y casi inmutables
+(estados de equipo, tipos de barril, métodos de pago)
+
+Se guardan esquemas de lectura o ids, nunca instancias ORM: estas quedan ligadas
+a la sesión que las cargó. Las entradas expiran a los 5 minutos; quien cree o
+modifique filas de estas tablas debe llamar a ``invalidar()``.
+"""
+from typing import List, Optional
+
+from sqlmodel import Session, select
+
+from app.core.cache import TTLCache
+from app.models.sales_point import TipoBarril, TipoBarrilRead, TipoEstadoEquipo, TipoEstadoEquipoRead
+from app.models.user_extended import TipoMetodoPago
+
+_TTL_SEGUNDOS = 300
+
+_cache = TTLCache(ttl_seconds=_TTL_SEGUNDOS)
+
+
+def invalidar() -> None:
+    """Descarta todas las entradas (tras altas o cambios en las tablas de referencia)"""
+    _cache.clear()
+
+
+def get_estado_equipo(session: Session, id_estado: int) -> Optional[TipoEstadoEquipoRead]:
+    def cargar():
+        estado = session.get(TipoEstadoEquipo, id_estado)
+        return TipoEstadoEquipoRead.from_orm_trusted(estado) if estado else None
+
+    return _cache.get_or_set(("estado_equipo", id_estado), cargar)
+
+
+def get_tipo_barril(session: Session, id_barril: int) -> Optional[TipoBarrilRead]:
+    def cargar():
+        barril = session.get(TipoBarril, id_barril)
+        return TipoBarrilRead.from_orm_trusted(barril) if barril else None
+
+    return _cache.get_or_set(("tipo_barril", id_barril), cargar)
+
+
+def listar_estados_equipo(session: Session) -> List[TipoEstadoEquipoRead]:
+    def cargar():
+        estados = session.exec(select(TipoEstadoEquipo).order_by(TipoEstadoEquipo.estado)).all()
+        return list(map(TipoEstadoEquipoRead.from_orm_trusted, estados))
+
+    return _cache.get_or_set("estados_equipo", cargar)
+
+
+def listar_tipos_barril(session: Session) -> List[TipoBarrilRead]:
+    def cargar():
+        tipos = session.exec(select(TipoBarril).order_by(TipoBarril.capacidad)).all()
+        return list(map(TipoBarrilRead.from_orm_trusted, tipos))
+
+    return _cache.get_or_set("tipos_barril", cargar)
+
+
+def get_metodo_pago_id(session: Session, metodo_pago: str) -> Optional[int]:
+    """Id del método de pago por nombre, o ``None`` si no existe"""
+    return _cache.get_or_set(
+        ("metodo_pago", metodo_pago),
+        lambda: session.exec(select(TipoMetodoPago.id).where(TipoMetodoPago.metodo_pago == metodo_pago)).first(),
+    )
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import uuid
+from itertools import islice
+from typing import Any, Dict, Iterable
+
+from sqlmodel import Session
+
+from app.models.user_extended import Referido, ReferidoCreate
+
+
+# Filas por sentencia: punto óptimo de executemany/insertmanyvalues en PostgreSQL
+TAMANO_LOTE_REFERIDOS = 1000
+
+
+class ReferidoService:
+    @staticmethod
+    def bulk_create_referidos(session: Session, rows: Iterable[Dict[str, Any]]) -> int:
+        """
+        Inserta códigos de referido en lotes de ``TAMANO_LOTE_REFERIDOS`` con el
+        ``INSERT`` de Core, sin pasar por la unidad de trabajo del ORM.
+
+        Cada fila se valida con ``ReferidoCreate`` (codigo, puntos_otorgados,
+        id_usuario_generador); ``id_ext`` y ``estado`` se completan aquí porque
+        sus valores por defecto viven en el modelo Python. ``fecha_registro`` la
+        completa la base con ``DEFAULT now()``.
+        No hace commit: todos los lotes quedan en la transacción del llamador.
+
+        Returns:
+            Cantidad de filas insertadas
+        """
+        insert_stmt = Referido.__table__.insert()
+        filas = iter(rows)
+        total = 0
+        while True:
+            lote = [
+                {
+                    **ReferidoCreate.model_validate(fila).model_dump(),
+                    "id_ext": uuid.uuid4(),
+                    "estado": "pendiente",
+                }
+                for fila in islice(filas, TAMANO_LOTE_REFERIDOS)
+            ]
+            if not lote:
+                return total
+            session.execute(insert_stmt, lote)
+            total += len(lote)
@@ -7,15 +7,16 @@ from sqlmodel import Session, select
 
 from app.core.config import settings
 from app.models.refresh_token import RefreshToken
+from app.models.base import utcnow
 
 
-def compute_refresh_token_hash(refresh_token: str) -> str:
+def compute_refresh_token_hash(refresh_token: str) -> bytes:
     secret = settings.secret_key.encode("utf-8")
     message = refresh_token.encode("utf-8")
-    return hmac.new(secret, message, hashlib.sha256).hexdigest()
+    return hmac.digest(secret, message, hashlib.sha256)
 
 
-def get_refresh_token_by_hash(session: Session, token_hash: str) -> Optional[RefreshToken]:
+def get_refresh_token_by_hash(session: Session, token_hash: bytes) -> Optional[RefreshToken]:
     statement = select(RefreshToken).where(RefreshToken.token_hash == token_hash)
     return session.exec(statement).first()
 
@@ -51,7 +52,7 @@ def revoke_refresh_token(
     *,
     replaced_by_refresh_token: Optional[str] = None,
 ) -> RefreshToken:
-    record.revoked_at = datetime.utcnow()
+    record.revoked_at = utcnow()
     if replaced_by_refresh_token:
         record.replaced_by_token_hash = compute_refresh_token_hash(replaced_by_refresh_token)
     session.add(record)
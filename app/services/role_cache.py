@@ -0,0 +1,75 @@
+"""
+Caché en proceso de los roles activos de cada usuario
+
+Las dependencias ``require_*`` consultan los roles en cada request protegido;
+aquí se guarda el conjunto de ``TipoRolUsuario.tipo`` por usuario durante un
+minuto. Quien asigne o revoque roles debe llamar a ``invalidar_usuario()``; en
+otros workers el cambio se ve al vencer el TTL.
+"""
+import threading
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+from sqlmodel import Session, select
+
+from app.core.cache import TTLCache
+from app.models.user_extended import TipoRolUsuario, UsuarioRol
+
+_TTL_SEGUNDOS = 60
+
+_cache = TTLCache(ttl_seconds=_TTL_SEGUNDOS, maxsize=10_000)
+
+# Generación por usuario (y global, para ``invalidar()``): una lectura hecha
+# antes de una invalidación concurrente no se guarda, así un rol revocado no
+# sobrevive en caché hasta el TTL
+_generaciones: Dict[int, int] = {}
+_generacion_global = 0
+_lock = threading.Lock()
+
+
+def generacion(user_id: int) -> Tuple[int, int]:
+    """Marca a tomar antes de leer los roles de la base (ver ``guardar``)"""
+    return _generacion_global, _generaciones.get(user_id, 0)
+
+
+def get_role_names(session: Session, user_id: int) -> FrozenSet[str]:
+    """Nombres (``tipo``) de los roles activos del usuario"""
+    role_names = _cache.get(user_id)
+    if role_names is not None:
+        return role_names
+
+    marca = generacion(user_id)
+    tipos = session.exec(
+        select(TipoRolUsuario.tipo)
+        .join(UsuarioRol, UsuarioRol.id_rol == TipoRolUsuario.id)
+        .where(UsuarioRol.id_usuario == user_id, UsuarioRol.fecha_revocacion == None)
+    ).all()
+    role_names = frozenset(tipos)
+    guardar(user_id, role_names, generacion=marca)
+    return role_names
+
+
+def guardar(user_id: int, role_names: Iterable[str], *, generacion: Optional[Tuple[int, int]] = None) -> None:
+    """
+    Cachea roles ya leídos junto con el usuario, sin consulta propia. Con
+    ``generacion`` (tomada antes de la lectura) no se guarda nada si el usuario
+    se invalidó mientras tanto.
+    """
+    role_names = frozenset(role_names)
+    with _lock:
+        if generacion is not None and generacion != (_generacion_global, _generaciones.get(user_id, 0)):
+            return
+        _cache.set(user_id, role_names)
+
+
+def invalidar_usuario(user_id: int) -> None:
+    """Descarta los roles cacheados de un usuario (tras asignar o revocar)"""
+    with _lock:
+        _generaciones[user_id] = _generaciones.get(user_id, 0) + 1
+        _cache.pop(user_id)
+
+
+def invalidar() -> None:
+    global _generacion_global
+    with _lock:
+        _generacion_global += 1
+        _cache.clear()
@@ -5,8 +5,21 @@ from typing import List, Optional
 
 from sqlmodel import Session, select
 
+from app.core.cache import TTLCache
 from app.models.tenant import Tenant, TenantUser
 from app.models.sales_point import PuntoVenta
+from app.models.base import utcnow
+
+
+# Respuestas del listado de tenants del panel de admin (polling del dashboard),
+# por combinación de filtros. Local al proceso: en otros workers el TTL acota
+# la desactualización
+admin_tenants_cache = TTLCache(ttl_seconds=10, maxsize=256)
+
+
+def invalidar_listado_admin() -> None:
+    """Descarta los listados cacheados tras crear o modificar tenants o membresías"""
+    admin_tenants_cache.clear()
 
 
 def _slugify(value: str) -> str:
@@ -83,6 +96,7 @@ class TenantService:
         session.add(tenant)
         session.commit()
         session.refresh(tenant)
+        invalidar_listado_admin()
 
         pv = session.exec(select(PuntoVenta).where(PuntoVenta.tenant_id == tenant.id).limit(1)).first()
         if pv is None:
@@ -120,19 +134,19 @@ class TenantService:
                 session.add(existing)
                 session.commit()
                 session.refresh(existing)
+                invalidar_listado_admin()
             return existing
 
         membership = TenantUser(tenant_id=tenant_id, user_id=user_id, rol=rol)
         session.add(membership)
         session.commit()
         session.refresh(membership)
+        invalidar_listado_admin()
         return membership
 
     @staticmethod
     def sweep_expired_subscriptions(session: Session) -> int:
-        from datetime import datetime
-
-        now = datetime.utcnow()
+        now = utcnow()
         stmt = (
             select(Tenant)
             .where(Tenant.activo == True)
@@ -149,4 +163,5 @@ class TenantService:
             session.add(t)
         if tenants:
             session.commit()
+            invalidar_listado_admin()
         return len(tenants)
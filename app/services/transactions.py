@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import lambda_stmt, literal_column
+from sqlmodel import Session, select
+
+from app.models.transactions import Pago, TransaccionPuntos, TransaccionPuntosFilter
+
+
+class TransactionService:
+    """
+    Consultas calientes sobre pagos y transacciones de puntos.
+
+    Se construyen con ``lambda_stmt``: la clave de caché es el código de la lambda,
+    así que cada llamada evita reconstruir el árbol de la consulta y los valores
+    capturados viajan como parámetros enlazados.
+    """
+
+    @staticmethod
+    def ultimo_pago_de_venta(session: Session, *, id_venta: int, fecha_venta: datetime) -> Optional[Pago]:
+        stmt = lambda_stmt(lambda: select(Pago))
+        stmt += lambda s: s.where(Pago.id_venta == id_venta, Pago.fecha_venta == fecha_venta)
+        stmt += lambda s: s.order_by(Pago.fecha_pago.desc()).limit(1)
+        return session.execute(stmt).scalars().first()
+
+    @staticmethod
+    def venta_ya_acreditada(session: Session, id_venta: int) -> bool:
+        stmt = lambda_stmt(
+            lambda: select(TransaccionPuntos.id)
+            .where(TransaccionPuntos.id_venta == id_venta, TransaccionPuntos.tipo_transaccion == "venta")
+            .limit(1)
+        )
+        return session.execute(stmt).first() is not None
+
+    @staticmethod
+    def transacciones_de_usuario(
+        session: Session,
+        id_usuario: int,
+        *,
+        fecha_inicio: Optional[datetime] = None,
+        fecha_fin: Optional[datetime] = None,
+        solo_ganados: bool = False,
+        solo_canjeados: bool = False,
+        limite: int = 100,
+        offset: int = 0,
+    ) -> List[TransaccionPuntos]:
+        stmt = lambda_stmt(lambda: select(TransaccionPuntos).where(TransaccionPuntos.id_usuario == id_usuario))
+        # Constantes literales (no parámetros) para que el planner use los índices
+        # parciales idx_trans_solo_ganados / idx_trans_solo_canjeados
+        if solo_ganados:
+            stmt += lambda s: s.where(TransaccionPuntos.puntos_ganados > literal_column("0"))
+        if solo_canjeados:
+            stmt += lambda s: s.where(TransaccionPuntos.puntos_canjeados > literal_column("0"))
+        if fecha_inicio is not None:
+            stmt += lambda s: s.where(TransaccionPuntos.fecha >= fecha_inicio)
+        if fecha_fin is not None:
+            stmt += lambda s: s.where(TransaccionPuntos.fecha <= fecha_fin)
+        stmt += lambda s: s.order_by(TransaccionPuntos.fecha.desc()).limit(limite).offset(offset)
+        return list(session.execute(stmt).scalars().all())
+
+    @staticmethod
+    def filtrar_transacciones(session: Session, id_usuario: int, filtro: TransaccionPuntosFilter) -> List[TransaccionPuntos]:
+        return TransactionService.transacciones_de_usuario(
+            session,
+            id_usuario,
+            fecha_inicio=filtro.fecha_inicio,
+            fecha_fin=filtro.fecha_fin,
+            solo_ganados=filtro.solo_ganados,
+            solo_canjeados=filtro.solo_canjeados,
+            limite=filtro.limite,
+            offset=filtro.offset,
+        )
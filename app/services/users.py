@@ -1,23 +1,108 @@
 """
 Servicio CRUD para usuarios
 """
-from typing import Optional, List
+from typing import FrozenSet, Iterable, Optional, List, Tuple
 from sqlmodel import Session, select
-from datetime import datetime, date
+from datetime import date
 import secrets
 
+from sqlalchemy import RowMapping, bindparam, delete, event, inspect, or_
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session as OrmSession, joinedload, make_transient_to_detached, object_session, selectinload
 
 from app.models.user_extended import (
     Usuario, 
     UsuarioRol,
     UsuarioNivel,
+    UsuarioMetodoPago,
+    UsuarioCredenciales,
     TipoRolUsuario,
-    TipoNivelUsuario
+    TipoNivelUsuario,
+    MetodoPagoCreate,
 )
+from app.models.rewards import Canje
+from app.models.transactions import TransaccionPuntos
+from app.models.wallet import Wallet
+from app.models.base import utcnow
+from app.services import role_cache
+from app.core.cache import TTLCache
 from app.core.security import get_password_hash, verify_password
 
 
+# Carga de relaciones para listados: cada colección se trae con una única
+# consulta ``WHERE id_usuario IN (...)`` en vez de una por usuario
+OPCIONES_LISTADO_USUARIOS = (
+    selectinload(Usuario.roles).joinedload(UsuarioRol.rol),
+    selectinload(Usuario.metodos_pago),
+)
+
+# Columnas que expone UserRead, para listados sin hidratar entidades
+_COLUMNAS_LISTADO = (
+    Usuario.id,
+    Usuario.id_ext,
+    Usuario.nombre_usuario,
+    Usuario.email,
+    Usuario.nombres,
+    Usuario.apellidos,
+    Usuario.sexo,
+    Usuario.fecha_nac,
+    Usuario.telefono,
+    Usuario.avatar,
+    Usuario.activo,
+    Usuario.verificado,
+    Usuario.fecha_creacion,
+    Usuario.ultimo_login,
+    Usuario.intentos_login_fallidos,
+)
+
+# Búsquedas frecuentes construidas una sola vez con parámetros con nombre: la
+# clave del caché de compilación del engine es siempre la misma
+_USUARIO_POR_EMAIL = select(Usuario).where(Usuario.email == bindparam("email"))
+_USUARIO_POR_NOMBRE = select(Usuario).where(Usuario.nombre_usuario == bindparam("nombre_usuario"))
+_USUARIO_POR_CODIGO = select(Usuario).where(Usuario.codigo_cliente == bindparam("codigo_cliente"))
+# Usuario autenticado con sus roles en un solo SELECT (JOIN), para la autenticación
+_USUARIO_CON_ROLES = (
+    select(Usuario)
+    .options(joinedload(Usuario.roles).joinedload(UsuarioRol.rol))
+    .where(Usuario.id == bindparam("user_id"))
+)
+
+# Columnas del usuario autenticado, por id, para no repetir el SELECT en cada
+# request. Se guardan valores (no la instancia ORM, ligada a su sesión); los
+# flush del ORM invalidan solos vía eventos, los UPDATE de Core deben llamar a
+# ``UserService.invalidate_user_on_commit`` (o a ``invalidate_user`` ya commiteados).
+_usuarios_cache = TTLCache(ttl_seconds=30, maxsize=10_000)
+_ATRIBUTOS_USUARIO = tuple(attr.key for attr in inspect(Usuario).column_attrs)
+
+
+_CLAVE_USUARIOS_MODIFICADOS = "usuarios_cache_pendientes"
+
+
+@event.listens_for(Usuario, "after_update")
+@event.listens_for(Usuario, "after_delete")
+def _invalidar_usuario_cacheado(_mapper, _connection, target: Usuario) -> None:
+    # El flush ocurre antes del commit: otro request puede volver a cachear la
+    # fila vieja en ese intervalo, así que se invalida de nuevo tras el commit
+    session = object_session(target)
+    if session is not None:
+        _invalidar_al_commit(session, target.id)
+    else:
+        _usuarios_cache.pop(target.id)
+
+
+def _invalidar_al_commit(session: OrmSession, user_id: int) -> None:
+    """Descarta el usuario ya y de nuevo cuando ``session`` haga commit"""
+    _usuarios_cache.pop(user_id)
+    session.info.setdefault(_CLAVE_USUARIOS_MODIFICADOS, set()).add(user_id)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _invalidar_usuarios_tras_commit(session: OrmSession) -> None:
+    for user_id in session.info.pop(_CLAVE_USUARIOS_MODIFICADOS, ()):
+        _usuarios_cache.pop(user_id)
+
+
 class UserService:
     """Servicio para operaciones CRUD de usuarios"""
     
@@ -43,7 +128,9 @@ class UserService:
         registrado_por: Optional[int] = None,
         activo: bool = True,
         role_tipo: str = "usuario",
-        nivel_id: int = 1  # Nivel básico por defecto
+        nivel_id: int = 1,  # Nivel básico por defecto
+        with_wallet: bool = False,
+        check_existing: bool = True
     ) -> Usuario:
         """
         Crear un nuevo usuario
@@ -59,6 +146,11 @@ class UserService:
             fecha_nacimiento: Fecha de nacimiento
             telefono: Teléfono opcional
             nivel_id: ID del nivel inicial (por defecto 1)
+            with_wallet: Crear también la wallet del usuario en ``tenant_id``, en el
+                mismo commit que el nivel y el rol
+            check_existing: Verificar email/nombre de usuario antes del INSERT
+                (``ValueError``). Con ``False`` decide el UNIQUE de la base y el
+                llamador debe atrapar ``IntegrityError``
         
         Returns:
             Usuario creado
@@ -67,10 +159,13 @@ class UserService:
         email_normalized = email.lower().strip()
         username_normalized = (nombre_usuario or "").strip()
 
-        if UserService.get_user_by_email(session, email_normalized):
-            raise ValueError("EMAIL_ALREADY_EXISTS")
-        if username_normalized and UserService.get_user_by_username(session, username_normalized):
-            raise ValueError("USERNAME_ALREADY_EXISTS")
+        if check_existing:
+            # Una sola consulta para ambos chequeos; el email tiene prioridad
+            existentes = UserService.get_users_by_email_or_username(session, email_normalized, username_normalized)
+            if any(u.email == email_normalized for u in existentes):
+                raise ValueError("EMAIL_ALREADY_EXISTS")
+            if username_normalized and existentes:
+                raise ValueError("USERNAME_ALREADY_EXISTS")
 
         # Hash de la contraseña
         password_hash = get_password_hash(password)
@@ -85,8 +180,7 @@ class UserService:
             nombre_usuario=username_normalized,
             codigo_cliente=codigo_cliente,
             email=email_normalized,
-            password_hash=password_hash,
-            password_salt="",  # Ya incluido en el hash con bcrypt
+            credenciales=UsuarioCredenciales(password_hash=password_hash),
             nombres=nombre,
             apellidos=apellido,
             sexo=sexo,
@@ -97,6 +191,7 @@ class UserService:
             verificado=False,
             tenant_id=tenant_id,
             registrado_por=registrado_por,
+            id_nivel_actual=nivel_id,
         )
         
         session.add(db_user)
@@ -104,6 +199,8 @@ class UserService:
             session.commit()
         except IntegrityError:
             session.rollback()
+            if not check_existing:
+                raise
             if UserService.get_user_by_email(session, email_normalized):
                 raise ValueError("EMAIL_ALREADY_EXISTS")
             if username_normalized and UserService.get_user_by_username(session, username_normalized):
@@ -111,11 +208,10 @@ class UserService:
             raise
         session.refresh(db_user)
         
-        # Asignar nivel inicial
+        # Registrar la asignación del nivel inicial
         usuario_nivel = UsuarioNivel(
             id_usuario=db_user.id,
-            id_nivel=nivel_id,
-            puntaje_actual=0
+            id_nivel=nivel_id
         )
         session.add(usuario_nivel)
         
@@ -131,7 +227,11 @@ class UserService:
         )
         session.add(usuario_rol)
         
+        if with_wallet and tenant_id is not None:
+            session.add(Wallet(tenant_id=tenant_id, owner_type="user", owner_user_id=db_user.id, activo=True))
+        
         session.commit()
+        role_cache.invalidar_usuario(db_user.id)
         session.refresh(db_user)
         
         return db_user
@@ -141,24 +241,82 @@ class UserService:
         """Obtener usuario por ID"""
         return session.get(Usuario, user_id)
     
+    @staticmethod
+    def get_user_cached(session: Session, user_id: int) -> Optional[Usuario]:
+        """
+        Obtener usuario por ID reutilizando sus columnas leídas hace menos de 30 s
+        
+        En un acierto no hay consulta: la instancia se reconstruye y se adjunta a
+        ``session`` como persistente (``merge(load=False)``), así que las
+        relaciones se cargan y los cambios se guardan igual que con ``session.get``.
+        """
+        valores = _usuarios_cache.get(user_id)
+        if valores is None:
+            # Los roles vienen en el mismo SELECT y se dejan en role_cache
+            marca_roles = role_cache.generacion(user_id)
+            db_user = session.exec(_USUARIO_CON_ROLES, params={"user_id": user_id}).unique().first()
+            if db_user is not None:
+                _usuarios_cache.set(user_id, {key: getattr(db_user, key) for key in _ATRIBUTOS_USUARIO})
+                role_cache.guardar(
+                    user_id,
+                    (ur.rol.tipo for ur in db_user.roles if ur.fecha_revocacion is None and ur.rol is not None),
+                    generacion=marca_roles,
+                )
+            return db_user
+        
+        db_user = Usuario(**valores)
+        make_transient_to_detached(db_user)
+        return session.merge(db_user, load=False)
+    
+    @staticmethod
+    def get_auth_context(session: Session, user_id: int) -> Optional[Tuple[Usuario, FrozenSet[str]]]:
+        """
+        Usuario autenticado y nombres de sus roles activos
+        
+        En frío es un único SELECT (usuario JOIN roles, ver ``get_user_cached``);
+        con el usuario y los roles en caché, ninguno.
+        
+        Returns:
+            Tupla (usuario, roles) o None si el usuario no existe
+        """
+        db_user = UserService.get_user_cached(session, user_id)
+        if db_user is None:
+            return None
+        return db_user, role_cache.get_role_names(session, user_id)
+    
+    @staticmethod
+    def invalidate_user(user_id: int) -> None:
+        """Descartar el usuario cacheado (tras commitear un UPDATE de Core sobre usuarios)"""
+        _usuarios_cache.pop(user_id)
+    
+    @staticmethod
+    def invalidate_user_on_commit(session: Session, user_id: int) -> None:
+        """
+        Descartar el usuario cacheado tras un UPDATE de Core aún sin commitear:
+        se descarta ahora y otra vez al hacer commit ``session``, por si otro
+        request lo volvió a cachear con la fila vieja en el medio
+        """
+        _invalidar_al_commit(session, user_id)
+    
+    @staticmethod
+    def invalidate_all_users() -> None:
+        _usuarios_cache.clear()
+    
     @staticmethod
     def get_user_by_email(session: Session, email: str) -> Optional[Usuario]:
         """Obtener usuario por email (case-insensitive)"""
         email_normalized = email.lower().strip()
-        statement = select(Usuario).where(Usuario.email == email_normalized)
-        return session.exec(statement).first()
+        return session.exec(_USUARIO_POR_EMAIL, params={"email": email_normalized}).first()
     
     @staticmethod
     def get_user_by_username(session: Session, username: str) -> Optional[Usuario]:
         """Obtener usuario por nombre de usuario"""
-        statement = select(Usuario).where(Usuario.nombre_usuario == username)
-        return session.exec(statement).first()
+        return session.exec(_USUARIO_POR_NOMBRE, params={"nombre_usuario": username}).first()
     
     @staticmethod
     def get_customer_by_codigo(session: Session, codigo_cliente: str) -> Optional[Usuario]:
         """Obtener cliente por código QR"""
-        statement = select(Usuario).where(Usuario.codigo_cliente == codigo_cliente)
-        return session.exec(statement).first()
+        return session.exec(_USUARIO_POR_CODIGO, params={"codigo_cliente": codigo_cliente}).first()
     
     @staticmethod
     def get_users(
@@ -180,7 +338,7 @@ class UserService:
         Returns:
             Lista de usuarios
         """
-        statement = select(Usuario)
+        statement = select(Usuario).options(*OPCIONES_LISTADO_USUARIOS)
         
         if activo is not None:
             statement = statement.where(Usuario.activo == activo)
@@ -188,6 +346,25 @@ class UserService:
         statement = statement.offset(skip).limit(limit)
         return list(session.exec(statement).all())
     
+    @staticmethod
+    def list_users_fast(
+        session: Session,
+        *,
+        limit: int = 100,
+        offset: int = 0,
+        activo: Optional[bool] = None
+    ) -> List[RowMapping]:
+        """
+        Listado paginado de usuarios como filas de Core (dicts) con solo las
+        columnas de ``UserRead``, sin identity map ni relaciones del ORM.
+        Convertir con ``UserRead.from_row_trusted``.
+        """
+        statement = select(*_COLUMNAS_LISTADO)
+        if activo is not None:
+            statement = statement.where(Usuario.activo == activo)
+        statement = statement.order_by(Usuario.id).limit(limit).offset(offset)
+        return list(session.execute(statement).mappings().all())
+    
     @staticmethod
     def update_user(
         session: Session,
@@ -257,11 +434,32 @@ class UserService:
         
         return True
     
+    @staticmethod
+    def get_users_by_email_or_username(session: Session, email: str, username: Optional[str]) -> List[Usuario]:
+        """
+        Usuarios que ya usan el email o el nombre de usuario (a lo sumo dos)
+        
+        Args:
+            session: Sesión de base de datos
+            email: Email (se normaliza a lowercase)
+            username: Nombre de usuario; vacío o ``None`` solo compara el email
+        
+        Returns:
+            Lista con los usuarios encontrados
+        """
+        condicion = Usuario.email == email.lower().strip()
+        if username:
+            condicion = or_(condicion, Usuario.nombre_usuario == username)
+        return list(session.exec(select(Usuario).where(condicion).limit(2)).all())
+    
     @staticmethod
     def hard_delete_user(session: Session, user_id: int) -> bool:
         """
         Eliminación física de un usuario (usar con precaución)
         
+        Borra también sus transacciones de puntos y canjes; sus ventas y
+        referidos se conservan con la FK en NULL.
+        
         Args:
             session: Sesión de base de datos
             user_id: ID del usuario
@@ -273,8 +471,12 @@ class UserService:
         if not db_user:
             return False
         
+        # Las transacciones referencian canjes: van primero
+        session.execute(delete(TransaccionPuntos).where(TransaccionPuntos.id_usuario == user_id))
+        session.execute(delete(Canje).where(Canje.id_usuario == user_id))
         session.delete(db_user)
         session.commit()
+        role_cache.invalidar_usuario(user_id)
         
         return True
     
@@ -314,7 +516,7 @@ class UserService:
         # Reset intentos fallidos y actualizar último login
         db_user.intentos_login_fallidos = 0
         if db_user.activo:
-            db_user.ultimo_login = datetime.utcnow()
+            db_user.ultimo_login = utcnow()
         session.add(db_user)
         session.commit()
         
@@ -387,6 +589,7 @@ class UserService:
         )
         session.add(usuario_rol)
         session.commit()
+        role_cache.invalidar_usuario(user_id)
         
         return True
     
@@ -417,9 +620,10 @@ class UserService:
         if not usuario_rol:
             return False
         
-        usuario_rol.fecha_revocacion = datetime.utcnow()
+        usuario_rol.fecha_revocacion = utcnow()
         session.add(usuario_rol)
         session.commit()
+        role_cache.invalidar_usuario(user_id)
         
         return True
     
@@ -474,7 +678,52 @@ class UserService:
         Returns:
             Nivel del usuario o None
         """
-        statement = select(TipoNivelUsuario).join(UsuarioNivel).where(
-            UsuarioNivel.id_usuario == user_id
-        )
+        statement = select(TipoNivelUsuario).join(
+            Usuario, Usuario.id_nivel_actual == TipoNivelUsuario.id
+        ).where(Usuario.id == user_id)
         return session.exec(statement).first()
+    
+    @staticmethod
+    def sync_payment_methods(
+        session: Session,
+        user_id: int,
+        metodos: Iterable[MetodoPagoCreate]
+    ) -> int:
+        """
+        Sincronizar los métodos de pago de un usuario informados por el proveedor
+        
+        Un único ``INSERT ... ON CONFLICT (id_usuario, id_metodo_pago) DO UPDATE``
+        con todas las filas: los métodos nuevos se insertan y los existentes
+        actualizan su token y quedan activos, en un solo viaje a la base.
+        
+        Args:
+            session: Sesión de base de datos
+            user_id: ID del usuario
+            metodos: Métodos informados por el proveedor
+        
+        Returns:
+            Cantidad de métodos distintos sincronizados
+        """
+        # Una fila por (id_usuario, id_metodo_pago), gana la última: PostgreSQL
+        # rechaza un ON CONFLICT DO UPDATE que toque dos veces la misma fila
+        filas = list({
+            metodo.id_metodo_pago: {**metodo.model_dump(), "id_usuario": user_id, "activo": True}
+            for metodo in metodos
+        }.values())
+        if not filas:
+            return 0
+        
+        dialecto = postgresql if session.get_bind().dialect.name == "postgresql" else sqlite
+        stmt = dialecto.insert(UsuarioMetodoPago.__table__).values(filas)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["id_usuario", "id_metodo_pago"],
+            set_={
+                "proveedor_metodo_pago": stmt.excluded.proveedor_metodo_pago,
+                "token_proveedor": stmt.excluded.token_proveedor,
+                "activo": stmt.excluded.activo,
+            },
+        )
+        session.execute(stmt)
+        session.commit()
+        
+        return len(filas)
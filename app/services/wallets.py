@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-from decimal import Decimal, ROUND_HALF_UP
-from typing import Optional
+from decimal import Decimal
+from typing import Optional, Sequence
 
+from sqlalchemy import exists, func, insert, literal, true
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 
-from app.models.wallet import Wallet, WalletTxn
+from app.models.user_extended import Usuario
+from app.models.wallet import Wallet, WalletTxn, to_cents
 
 
 class WalletService:
@@ -22,12 +25,49 @@ class WalletService:
         if wallet:
             return wallet
 
-        wallet = Wallet(tenant_id=tenant_id, owner_type="user", owner_user_id=user_id, balance=Decimal("0.00"), activo=True)
+        wallet = Wallet(tenant_id=tenant_id, owner_type="user", owner_user_id=user_id, balance_cents=0, activo=True)
         session.add(wallet)
         session.commit()
         session.refresh(wallet)
         return wallet
 
+    @staticmethod
+    def create_user_wallets(session: Session, *, tenant_id: int, user_ids: Sequence[int]) -> int:
+        """
+        Crea las wallets que falten para ``user_ids`` con un único
+        ``INSERT INTO wallets ... SELECT ... FROM usuarios``: pensado para después de
+        una carga masiva de usuarios, sin un SELECT + INSERT por usuario.
+
+        En PostgreSQL ``id_ext`` sale de ``gen_random_uuid()``: nativa desde la
+        versión 13; en versiones anteriores requiere la extensión ``pgcrypto``.
+
+        Returns:
+            Cantidad de wallets creadas
+        """
+        if not user_ids:
+            return 0
+        if session.get_bind().dialect.name == "postgresql":
+            id_ext = func.gen_random_uuid()
+        else:
+            # Mismo formato que guarda el tipo GUID de SQLModel en SQLite (uuid.hex)
+            id_ext = func.lower(func.hex(func.randomblob(16)))
+        con_wallet = exists().where(
+            Wallet.owner_user_id == Usuario.id,
+            Wallet.tenant_id == tenant_id,
+            Wallet.activo == true(),
+        )
+        origen = select(
+            id_ext,
+            literal(tenant_id),
+            literal("user"),
+            Usuario.id,
+            true(),
+        ).where(Usuario.id.in_(user_ids), ~con_wallet)
+        stmt = insert(Wallet).from_select(["id_ext", "tenant_id", "owner_type", "owner_user_id", "activo"], origen)
+        creadas = session.execute(stmt).rowcount
+        session.commit()
+        return creadas
+
     @staticmethod
     def get_or_create_card_wallet(session: Session, *, tenant_id: int, card_id: int) -> Wallet:
         wallet = session.exec(
@@ -41,7 +81,7 @@ class WalletService:
         if wallet:
             return wallet
 
-        wallet = Wallet(tenant_id=tenant_id, owner_type="card", owner_card_id=card_id, balance=Decimal("0.00"), activo=True)
+        wallet = Wallet(tenant_id=tenant_id, owner_type="card", owner_card_id=card_id, balance_cents=0, activo=True)
         session.add(wallet)
         session.commit()
         session.refresh(wallet)
@@ -58,47 +98,31 @@ class WalletService:
         idempotency_key: Optional[str],
         created_by: Optional[int],
     ) -> WalletTxn:
-        amount_q = Decimal(str(amount)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-        if amount_q <= 0:
+        amount_cents = to_cents(amount)
+        if amount_cents <= 0:
             raise ValueError("INVALID_AMOUNT")
 
-        if idempotency_key:
-            existing = session.exec(
-                select(WalletTxn).where(
-                    WalletTxn.wallet_id == wallet_id,
-                    WalletTxn.idempotency_key == idempotency_key,
-                    WalletTxn.direction == "debit",
-                )
-            ).first()
-            if existing:
-                return existing
-
         wallet = session.get(Wallet, wallet_id)
         if not wallet or not wallet.activo:
             raise ValueError("WALLET_NOT_FOUND")
 
-        if Decimal(str(wallet.balance)) < amount_q:
+        if wallet.balance_cents < amount_cents:
+            # Un reintento de un débito ya aplicado puede encontrar el saldo agotado
+            existing = WalletService._existing_txn(session, wallet_id, idempotency_key, "debit")
+            if existing:
+                return existing
             raise ValueError("INSUFFICIENT_FUNDS")
 
-        before = Decimal(str(wallet.balance))
-        after = (before - amount_q).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-        wallet.balance = after
-        session.add(wallet)
-
-        txn = WalletTxn(
-            wallet_id=wallet.id,
+        return WalletService._apply(
+            session,
+            wallet,
             direction="debit",
-            amount=amount_q,
-            balance_before=before,
-            balance_after=after,
+            delta_cents=-amount_cents,
             reference_type=reference_type,
             reference_id=reference_id,
             idempotency_key=idempotency_key,
             created_by=created_by,
         )
-        session.add(txn)
-        session.flush()
-        return txn
 
     @staticmethod
     def credit(
@@ -111,42 +135,78 @@ class WalletService:
         idempotency_key: Optional[str],
         created_by: Optional[int],
     ) -> WalletTxn:
-        amount_q = Decimal(str(amount)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-        if amount_q <= 0:
+        amount_cents = to_cents(amount)
+        if amount_cents <= 0:
             raise ValueError("INVALID_AMOUNT")
 
-        if idempotency_key:
-            existing = session.exec(
-                select(WalletTxn).where(
-                    WalletTxn.wallet_id == wallet_id,
-                    WalletTxn.idempotency_key == idempotency_key,
-                    WalletTxn.direction == "credit",
-                )
-            ).first()
-            if existing:
-                return existing
-
         wallet = session.get(Wallet, wallet_id)
         if not wallet or not wallet.activo:
             raise ValueError("WALLET_NOT_FOUND")
 
-        before = Decimal(str(wallet.balance))
-        after = (before + amount_q).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-        wallet.balance = after
-        session.add(wallet)
+        return WalletService._apply(
+            session,
+            wallet,
+            direction="credit",
+            delta_cents=amount_cents,
+            reference_type=reference_type,
+            reference_id=reference_id,
+            idempotency_key=idempotency_key,
+            created_by=created_by,
+        )
 
+    @staticmethod
+    def _apply(
+        session: Session,
+        wallet: Wallet,
+        *,
+        direction: str,
+        delta_cents: int,
+        reference_type: Optional[str],
+        reference_id: Optional[str],
+        idempotency_key: Optional[str],
+        created_by: Optional[int],
+    ) -> WalletTxn:
+        """
+        Aplica el movimiento dentro de un SAVEPOINT. La deduplicación por
+        ``idempotency_key`` la resuelve el índice único parcial al insertar: si la
+        clave ya existe se deshace el savepoint (saldo incluido) y se devuelve el
+        movimiento original, sin un SELECT previo en el camino normal.
+        """
+        before = wallet.balance_cents
+        after = before + delta_cents
         txn = WalletTxn(
             wallet_id=wallet.id,
-            direction="credit",
-            amount=amount_q,
-            balance_before=before,
-            balance_after=after,
+            direction=direction,
+            amount_cents=abs(delta_cents),
+            balance_before_cents=before,
+            balance_after_cents=after,
             reference_type=reference_type,
             reference_id=reference_id,
             idempotency_key=idempotency_key,
             created_by=created_by,
         )
-        session.add(txn)
-        session.flush()
+        try:
+            with session.begin_nested():
+                wallet.balance_cents = after
+                session.add(wallet)
+                session.add(txn)
+        except IntegrityError:
+            existing = WalletService._existing_txn(session, wallet.id, idempotency_key, direction)
+            if existing is None:
+                raise
+            return existing
         return txn
 
+    @staticmethod
+    def _existing_txn(
+        session: Session, wallet_id: int, idempotency_key: Optional[str], direction: str
+    ) -> Optional[WalletTxn]:
+        if not idempotency_key:
+            return None
+        return session.exec(
+            select(WalletTxn).where(
+                WalletTxn.wallet_id == wallet_id,
+                WalletTxn.direction == direction,
+                WalletTxn.idempotency_key == idempotency_key,
+            )
+        ).first()
@@ -268,6 +268,8 @@ def create_sample_equipos(session: Session):
     # Mapear por nombre
     barril_map = {barril.nombre: barril.id for barril in tipos_barril}
     estado_map = {estado.estado: estado.id for estado in estados}
+    # Mismo valor que EquipoService._sincronizar_puede_vender al crear por la API
+    permite_ventas_map = {estado.id: bool(estado.permite_ventas) for estado in estados}
     
     equipos_data = [
         {
@@ -318,7 +320,10 @@ def create_sample_equipos(session: Session):
             ).first()
             
             if not existing:
-                equipo = Equipo(**equipo_data)
+                equipo = Equipo(
+                    **equipo_data,
+                    puede_vender=permite_ventas_map[equipo_data["id_estado_equipo"]],
+                )
                 session.add(equipo)
                 print(f"  ✓ Creado equipo: {equipo_data['nombre_equipo']}")
             else:
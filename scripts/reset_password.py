@@ -28,7 +28,6 @@ def main() -> int:
             return 1
 
         user.password_hash = get_password_hash(args.password)
-        user.password_salt = ""
         user.intentos_login_fallidos = 0
         user.bloqueado_hasta = None
         user.activo = True
@@ -14,7 +14,8 @@ from app.models.user_extended import (
     TipoRolUsuario,
     TipoNivelUsuario,
     TipoMetodoPago,
-    Usuario
+    Usuario,
+    UsuarioCredenciales
 )
 import hashlib
 from datetime import datetime, date
@@ -75,7 +76,7 @@ def create_basic_data():
             admin = Usuario(
                 nombre_usuario="admin",
                 email=admin_email,
-                password_hash=hashlib.sha256("admin".encode()).hexdigest(),
+                credenciales=UsuarioCredenciales(password_hash=hashlib.sha256("admin".encode()).hexdigest()),
                 nombres="Admin",
                 apellidos="BeCard",
                 codigo_cliente="ADMIN-001",
@@ -97,7 +98,7 @@ def create_basic_data():
             cliente = Usuario(
                 nombre_usuario="cliente_demo",
                 email=cliente_email,
-                password_hash=hashlib.sha256("demo".encode()).hexdigest(),
+                credenciales=UsuarioCredenciales(password_hash=hashlib.sha256("demo".encode()).hexdigest()),
                 nombres="Cliente",
                 apellidos="Demo",
                 codigo_cliente="DEMO-001",
@@ -8,6 +8,7 @@ os.environ.setdefault("SQL_ECHO", "false")
 os.environ.setdefault("AUTO_CREATE_DB", "false")
 
 import sys
+from contextlib import contextmanager
 from pathlib import Path
 
 project_root = Path(__file__).resolve().parents[1]
@@ -19,12 +20,33 @@ from app.core.rate_limit import limiter
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlalchemy.pool import StaticPool
 from sqlmodel import SQLModel, Session, create_engine
 
 limiter.enabled = False
 
 
+@pytest.fixture(autouse=True)
+def _clear_process_caches():
+    """Cada test usa una base nueva: descartar cachés en proceso entre tests"""
+    from app.routers import admin
+    from app.services import reference_cache, role_cache, tenants
+    from app.services.users import UserService
+
+    reference_cache.invalidar()
+    role_cache.invalidar()
+    UserService.invalidate_all_users()
+    tenants.invalidar_listado_admin()
+    admin._sweep_cache.clear()
+    yield
+    reference_cache.invalidar()
+    role_cache.invalidar()
+    UserService.invalidate_all_users()
+    tenants.invalidar_listado_admin()
+    admin._sweep_cache.clear()
+
+
 @pytest.fixture()
 def engine():
     return create_engine(
@@ -54,3 +76,28 @@ def client(engine, db_session):
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
+
+
+@pytest.fixture()
+def contar_sentencias(engine):
+    """
+    ``with contar_sentencias() as sentencias:`` junta en ``sentencias`` el SQL
+    que se ejecuta sobre ``engine`` dentro del bloque. ``al_ejecutar`` se llama
+    antes de cada sentencia (para simular otro request concurrente).
+    """
+    @contextmanager
+    def contar(al_ejecutar=None):
+        sentencias = []
+
+        def registrar(conn, cursor, statement, parameters, context, executemany):
+            sentencias.append(statement)
+            if al_ejecutar is not None:
+                al_ejecutar()
+
+        event.listen(engine, "before_cursor_execute", registrar)
+        try:
+            yield sentencias
+        finally:
+            event.remove(engine, "before_cursor_execute", registrar)
+
+    return contar
@@ -1,6 +1,6 @@
 from datetime import date
 
-from sqlmodel import Session
+from sqlmodel import Session, select
 
 
 def _seed_roles_and_level(session: Session) -> None:
@@ -63,13 +63,20 @@ def test_admin_list_users_and_toggle_active(client, db_session: Session):
     assert login.status_code == 200
     headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
 
-    resp = client.get("/api/v1/admin/users", headers=headers)
+    resp = client.get("/api/v1/admin/users", params={"include_total": True}, headers=headers)
     assert resp.status_code == 200
     body = resp.json()
     assert body["total"] >= 2
+    assert client.get("/api/v1/admin/users", headers=headers).json()["total"] is None
     row = next(r for r in body["users"] if r["email"] == "u1@example.com")
     assert any(t["slug"] == "t1" for t in row["tenants"])
 
+    con_tenant = client.get("/api/v1/admin/users", params={"has_tenant": True, "include_total": True}, headers=headers)
+    assert [r["email"] for r in con_tenant.json()["users"]] == ["u1@example.com"]
+    assert con_tenant.json()["total"] == 1
+    sin_tenant = client.get("/api/v1/admin/users", params={"has_tenant": False}, headers=headers).json()["users"]
+    assert "u1@example.com" not in [r["email"] for r in sin_tenant]
+
     resp2 = client.patch(f"/api/v1/admin/users/{user.id}/active", json={"activo": False}, headers=headers)
     assert resp2.status_code == 204
 
@@ -104,3 +111,262 @@ def test_admin_list_tenants_and_toggle_active(client, db_session: Session):
     assert resp3.status_code == 200
     assert any(t["slug"] == "humulus" and t["activo"] is False for t in resp3.json()["tenants"])
 
+
+
+def test_admin_list_paginacion_por_cursor(client, db_session: Session):
+    from app.models.tenant import Tenant
+
+    _seed_roles_and_level(db_session)
+    admin = _create_verified_user(db_session, email="admin5@example.com", password="StrongPass1!", role_tipo="admin")
+    for i in range(4):
+        _create_verified_user(db_session, email=f"pag{i}@example.com", password="StrongPass1!", role_tipo="usuario")
+    for i, nombre in enumerate(("Beta", "Alfa", "Beta", "Gamma")):
+        db_session.add(Tenant(nombre=nombre, slug=f"pag-{i}", creado_por=admin.id))
+    db_session.commit()
+
+    login = client.post("/api/v1/auth/login-json", json={"email": admin.email, "password": "StrongPass1!"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    def recorrer(path, key, campo):
+        vistos, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            body = client.get(path, params=params, headers=headers).json()
+            vistos += [r[campo] for r in body[key]]
+            assert body["has_more"] is (body["next_cursor"] is not None)
+            cursor = body["next_cursor"]
+            if cursor is None:
+                return vistos
+
+    ids = recorrer("/api/v1/admin/users", "users", "id")
+    assert ids == sorted(ids, reverse=True) and len(ids) == 5
+    nombres = recorrer("/api/v1/admin/tenants", "tenants", "nombre")
+    assert nombres == ["Alfa", "Beta", "Beta", "Gamma"]
+
+    assert client.get("/api/v1/admin/users", params={"cursor": "nope"}, headers=headers).status_code == 400
+
+    from app.routers.admin import _encode_cursor
+
+    for path, valores in [
+        ("/api/v1/admin/users", ["x"]),
+        ("/api/v1/admin/users", [True]),
+        ("/api/v1/admin/tenants", [1, 1]),
+        ("/api/v1/admin/tenants", ["Alfa", "1"]),
+    ]:
+        assert client.get(path, params={"cursor": _encode_cursor(*valores)}, headers=headers).status_code == 400
+
+
+def test_admin_bulk_active(client, db_session: Session):
+    from app.models.tenant import Tenant
+    from app.models.user_extended import Usuario
+
+    _seed_roles_and_level(db_session)
+    admin = _create_verified_user(db_session, email="admin6@example.com", password="StrongPass1!", role_tipo="admin")
+    users = [
+        _create_verified_user(db_session, email=f"bulk{i}@example.com", password="StrongPass1!", role_tipo="usuario")
+        for i in range(3)
+    ]
+    tenants = [Tenant(nombre=f"B{i}", slug=f"bulk-{i}", creado_por=admin.id, activo=True) for i in range(2)]
+    db_session.add_all(tenants)
+    db_session.commit()
+
+    login = client.post("/api/v1/auth/login-json", json={"email": admin.email, "password": "StrongPass1!"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    resp = client.post(
+        "/api/v1/admin/users/bulk/active", json={"ids": [u.id for u in users[:2]], "activo": False}, headers=headers
+    )
+    assert resp.status_code == 200 and resp.json() == {"updated": 2}
+    resp = client.post("/api/v1/admin/tenants/bulk/active", json={"ids": [t.id for t in tenants], "activo": False}, headers=headers)
+    assert resp.json() == {"updated": 2}
+    assert client.post("/api/v1/admin/users/bulk/active", json={"ids": [], "activo": True}, headers=headers).status_code == 422
+
+    db_session.expire_all()
+    assert [db_session.get(Usuario, u.id).activo for u in users] == [False, False, True]
+    assert all(not db_session.get(Tenant, t.id).activo for t in tenants)
+
+
+def test_admin_listados_con_cantidad_fija_de_consultas(client, contar_sentencias, db_session: Session):
+    from app.models.tenant import Tenant, TenantUser
+
+    _seed_roles_and_level(db_session)
+    admin = _create_verified_user(db_session, email="admin7@example.com", password="StrongPass1!", role_tipo="admin")
+    tenant = Tenant(nombre="Q1", slug="q1", creado_por=admin.id, activo=True)
+    db_session.add(tenant)
+    db_session.commit()
+    for i in range(6):
+        user = _create_verified_user(db_session, email=f"q{i}@example.com", password="StrongPass1!", role_tipo="usuario")
+        db_session.add(TenantUser(tenant_id=tenant.id, user_id=user.id, rol="member"))
+    db_session.commit()
+
+    login = client.post("/api/v1/auth/login-json", json={"email": admin.email, "password": "StrongPass1!"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    def contar_consultas(path):
+        with contar_sentencias() as sentencias:
+            assert client.get(path, headers=headers).status_code == 200
+        return len(sentencias)
+
+    # Autenticación incluida; no crece con la cantidad de filas
+    assert contar_consultas("/api/v1/admin/users") <= 5
+    assert contar_consultas("/api/v1/admin/tenants") <= 5
+
+
+def test_admin_list_tenants_miembros_y_owners(client, db_session: Session):
+    from app.models.tenant import Tenant, TenantUser
+
+    _seed_roles_and_level(db_session)
+    admin = _create_verified_user(db_session, email="admin8@example.com", password="StrongPass1!", role_tipo="admin")
+    owner = _create_verified_user(db_session, email="owner8@example.com", password="StrongPass1!", role_tipo="usuario")
+    member = _create_verified_user(db_session, email="member8@example.com", password="StrongPass1!", role_tipo="usuario")
+    con_miembros = Tenant(nombre="M1", slug="m1", creado_por=admin.id)
+    vacio = Tenant(nombre="M2", slug="m2", creado_por=admin.id)
+    db_session.add_all([con_miembros, vacio])
+    db_session.commit()
+    db_session.add(TenantUser(tenant_id=con_miembros.id, user_id=owner.id, rol="owner"))
+    db_session.add(TenantUser(tenant_id=con_miembros.id, user_id=member.id, rol="member"))
+    db_session.commit()
+
+    login = client.post("/api/v1/auth/login-json", json={"email": admin.email, "password": "StrongPass1!"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    rows = {t["slug"]: t for t in client.get("/api/v1/admin/tenants", headers=headers).json()["tenants"]}
+    assert (rows["m1"]["members_count"], rows["m1"]["owner_emails"]) == (2, ["owner8@example.com"])
+    assert (rows["m2"]["members_count"], rows["m2"]["owner_emails"]) == (0, [])
+
+
+def test_admin_list_tenants_cache_e_invalidacion(client, db_session: Session):
+    from app.models.tenant import Tenant
+
+    _seed_roles_and_level(db_session)
+    admin = _create_verified_user(db_session, email="admin9@example.com", password="StrongPass1!", role_tipo="admin")
+    tenant = Tenant(nombre="C1", slug="c1", creado_por=admin.id, activo=True)
+    db_session.add(tenant)
+    db_session.commit()
+
+    login = client.post("/api/v1/auth/login-json", json={"email": admin.email, "password": "StrongPass1!"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    def slugs():
+        return [t["slug"] for t in client.get("/api/v1/admin/tenants", headers=headers).json()["tenants"]]
+
+    assert slugs() == ["c1"]
+    # Alta directa en la base, sin pasar por un endpoint que invalide: sigue la respuesta cacheada
+    db_session.add(Tenant(nombre="C2", slug="c2", creado_por=admin.id, activo=True))
+    db_session.commit()
+    assert slugs() == ["c1"]
+
+    assert client.patch(f"/api/v1/admin/tenants/{tenant.id}/active", json={"activo": False}, headers=headers).status_code == 204
+    assert slugs() == ["c1", "c2"]
+
+
+def test_admin_list_tenants_estado_de_suscripcion(client, db_session: Session):
+    from datetime import datetime, timedelta
+
+    from app.models.tenant import Tenant
+
+    _seed_roles_and_level(db_session)
+    admin = _create_verified_user(db_session, email="admin10@example.com", password="StrongPass1!", role_tipo="admin")
+    now = datetime.utcnow()
+    db_session.add_all([
+        Tenant(nombre="S1", slug="s1", creado_por=admin.id, suscripcion_hasta=now + timedelta(days=3, hours=1)),
+        Tenant(
+            nombre="S2",
+            slug="s2",
+            creado_por=admin.id,
+            suscripcion_hasta=now - timedelta(days=1, hours=12),
+            suscripcion_gracia_hasta=now + timedelta(days=1),
+        ),
+        Tenant(nombre="S3", slug="s3", creado_por=admin.id, suscripcion_hasta=None),
+    ])
+    db_session.commit()
+
+    login = client.post("/api/v1/auth/login-json", json={"email": admin.email, "password": "StrongPass1!"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    rows = {t["slug"]: t for t in client.get("/api/v1/admin/tenants", headers=headers).json()["tenants"]}
+    assert (rows["s1"]["dias_restantes"], rows["s1"]["en_gracia"]) == (3, False)
+    assert (rows["s2"]["dias_restantes"], rows["s2"]["en_gracia"]) == (-2, True)
+    assert (rows["s3"]["dias_restantes"], rows["s3"]["en_gracia"]) == (None, False)
+
+
+def test_roles_cacheados_e_invalidados_al_asignar_y_revocar(client, db_session: Session):
+    from app.models.user_extended import TipoRolUsuario
+    from app.services.users import UserService
+
+    _seed_roles_and_level(db_session)
+    user = _create_verified_user(db_session, email="admin11@example.com", password="StrongPass1!", role_tipo="usuario")
+    login = client.post("/api/v1/auth/login-json", json={"email": user.email, "password": "StrongPass1!"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    assert client.get("/api/v1/admin/users", headers=headers).status_code == 403
+
+    rol_admin = db_session.exec(select(TipoRolUsuario).where(TipoRolUsuario.tipo == "admin")).one()
+    assert UserService.add_role_to_user(db_session, user.id, rol_admin.id) is True
+    assert client.get("/api/v1/admin/users", headers=headers).status_code == 200
+
+    assert UserService.remove_role_from_user(db_session, user.id, rol_admin.id) is True
+    assert client.get("/api/v1/admin/users", headers=headers).status_code == 403
+
+
+def test_usuario_autenticado_cacheado_e_invalidado_al_desactivar(client, contar_sentencias, db_session: Session):
+    _seed_roles_and_level(db_session)
+    admin = _create_verified_user(db_session, email="admin12@example.com", password="StrongPass1!", role_tipo="admin")
+    user = _create_verified_user(db_session, email="user12@example.com", password="StrongPass1!", role_tipo="usuario")
+
+    def headers_de(u):
+        login = client.post("/api/v1/auth/login-json", json={"email": u.email, "password": "StrongPass1!"})
+        return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    admin_headers, user_headers = headers_de(admin), headers_de(user)
+    assert client.get("/api/v1/auth/me", headers=user_headers).status_code == 200
+
+    with contar_sentencias() as sentencias:
+        assert client.get("/api/v1/auth/me", headers=user_headers).status_code == 200
+    assert not any(s.lstrip().startswith("SELECT usuarios.id") for s in sentencias)
+
+    assert client.patch(f"/api/v1/admin/users/{user.id}/active", json={"activo": False}, headers=admin_headers).status_code == 204
+    assert client.get("/api/v1/auth/me", headers=user_headers).status_code == 400
+
+
+def test_usuario_desactivado_por_orm_no_queda_cacheado_tras_commit(client, db_session: Session):
+    from sqlalchemy import event
+
+    from app.services import users as users_service
+    from app.services.users import UserService
+
+    _seed_roles_and_level(db_session)
+    user = _create_verified_user(db_session, email="user14@example.com", password="StrongPass1!", role_tipo="usuario")
+    login = client.post("/api/v1/auth/login-json", json={"email": user.email, "password": "StrongPass1!"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+    fila_vieja = dict(users_service._usuarios_cache.get(user.id))
+
+    # Otro request vuelve a cachear la fila vieja entre el flush y el commit
+    def recachear(session, _flush_context):
+        users_service._usuarios_cache.set(user.id, fila_vieja)
+
+    event.listen(db_session, "after_flush", recachear)
+    try:
+        assert UserService.delete_user(db_session, user.id) is True
+    finally:
+        event.remove(db_session, "after_flush", recachear)
+
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 400
+
+
+def test_usuario_y_roles_en_una_consulta_al_autenticar(client, contar_sentencias, db_session: Session):
+    from app.services import role_cache
+    from app.services.users import UserService
+
+    _seed_roles_and_level(db_session)
+    admin = _create_verified_user(db_session, email="admin13@example.com", password="StrongPass1!", role_tipo="admin")
+    login = client.post("/api/v1/auth/login-json", json={"email": admin.email, "password": "StrongPass1!"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    UserService.invalidate_all_users()
+    role_cache.invalidar()
+
+    with contar_sentencias() as sentencias:
+        assert client.get("/api/v1/admin/tenants", headers=headers).status_code == 200
+    # Sin la consulta de roles aparte: llegaron con el usuario
+    assert not any(s.lstrip().startswith("SELECT tipos_rol_usuario") for s in sentencias)
+    assert any("JOIN usuarios_roles" in s and s.lstrip().startswith("SELECT usuarios.") for s in sentencias)
@@ -57,6 +57,9 @@ def test_login_me_refresh_rotation(client, db_session: Session):
     me = client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {login_data['access_token']}"})
     assert me.status_code == 200
     assert me.json()["email"] == user.email
+    assert me.json()["sexo"] == "M"
+    assert me.json()["id_ext"] == str(user.id_ext)
+    assert me.json()["roles"][0]["tipo_rol_usuario"]["nombre"] == "usuario"
 
     refresh = client.post("/api/v1/auth/refresh", json={"refresh_token": login_data["refresh_token"]})
     assert refresh.status_code == 200
@@ -75,3 +78,69 @@ def test_login_invalid_password_returns_401(client, db_session: Session):
 
     login = client.post("/api/v1/auth/login-json", json={"email": "user2@example.com", "password": "wrong"})
     assert login.status_code == 401
+
+
+def test_role_cache_no_guarda_roles_leidos_antes_de_invalidar(contar_sentencias, db_session: Session):
+    from app.services import role_cache
+
+    _seed_minimal_auth_data(db_session)
+    user = _create_user(db_session, email="gen@example.com", password="StrongPass1!")
+
+    # Revocación concurrente mientras se leen los roles de la base
+    with contar_sentencias(al_ejecutar=lambda: role_cache.invalidar_usuario(user.id)) as sentencias:
+        assert role_cache.get_role_names(db_session, user.id) == frozenset({"usuario"})
+    assert len(sentencias) == 1
+    assert role_cache._cache.get(user.id) is None
+
+    role_cache.get_role_names(db_session, user.id)
+    assert role_cache._cache.get(user.id) == frozenset({"usuario"})
+
+
+def test_verify_token_cached_reutiliza_payload_y_respeta_exp(monkeypatch):
+    from datetime import timedelta
+
+    from app.core import security
+
+    token = security.create_access_token({"sub": "1"}, expires_delta=timedelta(minutes=5))
+    payload = security.verify_token_cached(token, expected_type="access")
+    assert payload["sub"] == "1"
+    assert security._verified_tokens.get(token) is None
+
+    def no_llamar(*args, **kwargs):
+        raise AssertionError("verify_token no debería ejecutarse con el payload en caché")
+
+    monkeypatch.setattr(security, "verify_token", no_llamar)
+    assert security.verify_token_cached(token, expected_type="access") is payload
+    assert security.verify_token_cached(token, expected_type="refresh") is None
+
+    monkeypatch.setattr(security.time, "time", lambda: payload["exp"] + 1)
+    assert security.verify_token_cached(token, expected_type="access") is None
+
+
+def test_token_con_sub_invalido_no_consulta_la_base(client, contar_sentencias):
+    from app.core.security import create_access_token
+
+    with contar_sentencias() as sentencias:
+        for sub in ("abc", "0", "-3"):
+            token = create_access_token({"sub": sub})
+            resp = client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"})
+            assert resp.status_code == 401
+    assert sentencias == []
+
+
+def test_check_user_roles_memoiza_en_el_usuario(db_session: Session, monkeypatch):
+    from app.routers import auth
+    from app.services import role_cache
+
+    _seed_minimal_auth_data(db_session)
+    user = _create_user(db_session, email="memo@example.com", password="StrongPass1!")
+    llamadas = []
+
+    def get_role_names(session, user_id):
+        llamadas.append(user_id)
+        return frozenset({"usuario"})
+
+    monkeypatch.setattr(role_cache, "get_role_names", get_role_names)
+    assert auth._check_user_roles(db_session, user, frozenset({"usuario"})) is True
+    assert auth._check_user_roles(db_session, user, auth.ADMIN_ROLES) is False
+    assert llamadas == [user.id]
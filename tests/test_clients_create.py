@@ -81,6 +81,15 @@ def test_create_client_happy_path(client, db_session: Session):
     assert body["client"]["email"] == "ada@example.com"
     assert body["client"]["name"] == "Ada Lovelace"
 
+    from sqlmodel import select
+
+    from app.models.user_extended import Usuario
+    from app.models.wallet import Wallet
+
+    cliente = db_session.exec(select(Usuario).where(Usuario.email == "ada@example.com")).one()
+    wallets = db_session.exec(select(Wallet).where(Wallet.owner_user_id == cliente.id)).all()
+    assert [(w.tenant_id, w.owner_type, w.balance_cents) for w in wallets] == [(tenant.id, "user", 0)]
+
     listed = client.get("/api/v1/clients/", params={"page": 1, "limit": 20}, headers=headers)
     assert listed.status_code == 200
     list_body = listed.json()
@@ -105,3 +114,55 @@ def test_create_client_invalid_email_returns_422(client, db_session: Session):
     created = client.post("/api/v1/clients/", json=payload, headers=headers)
     assert created.status_code == 422
 
+
+def test_redeem_reward_keeps_premio_snapshot(client, db_session: Session):
+    from sqlmodel import select
+
+    from app.models.rewards import CatalogoPremio
+    from app.models.user_extended import Usuario
+
+    _seed_minimal_auth_data(db_session)
+    socio, tenant = _create_socio_with_tenant(db_session)
+
+    login = client.post("/api/v1/auth/login-json", json={"email": socio.email, "password": "StrongPass1!"})
+    assert login.status_code == 200
+    token = login.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}", "X-Tenant-Slug": tenant.slug}
+
+    created = client.post(
+        "/api/v1/clients/",
+        json={"name": "Grace Hopper", "email": "grace@example.com", "gender": "Femenino", "birthDate": "1990-01-01"},
+        headers=headers,
+    )
+    assert created.status_code == 201
+    client_id = created.json()["client"]["id"]
+
+    user = db_session.exec(select(Usuario).where(Usuario.id_ext == client_id)).one()
+    user.puntaje_cache = 100
+    db_session.add(user)
+    premio = CatalogoPremio(nombre="Pinta gratis", descripcion="Una pinta", puntos_requeridos=40, stock_disponible=1)
+    sin_stock = CatalogoPremio(nombre="Remera", puntos_requeridos=10, stock_disponible=0)
+    db_session.add(premio)
+    db_session.add(sin_stock)
+    db_session.commit()
+    db_session.refresh(premio)
+    db_session.refresh(sin_stock)
+
+    rewards = client.get(f"/api/v1/clients/{client_id}/rewards", headers=headers)
+    assert rewards.status_code == 200
+    assert [r["name"] for r in rewards.json()["available"]] == ["Pinta gratis"]
+
+    redeemed = client.post(f"/api/v1/clients/{client_id}/rewards/{premio.id}/redeem", headers=headers)
+    assert redeemed.status_code == 200, redeemed.text
+    assert redeemed.json()["currentPoints"] == 60
+
+    no_stock = client.post(f"/api/v1/clients/{client_id}/rewards/{sin_stock.id}/redeem", headers=headers)
+    assert no_stock.status_code == 400
+
+    premio.nombre = "Pinta 2x1"
+    db_session.add(premio)
+    db_session.commit()
+
+    history = client.get(f"/api/v1/clients/{client_id}/rewards", headers=headers).json()["history"]
+    assert [h["name"] for h in history] == ["Pinta gratis"]
+    assert history[0]["id"] == premio.id
@@ -98,6 +98,68 @@ def test_register_invalid_sexo_returns_422(client, db_session: Session):
     assert register.status_code == 422
 
 
+def test_register_rejects_duplicate_email_or_username(client, contar_sentencias, db_session: Session):
+    _seed_minimal_auth_data(db_session)
+
+    def registrar(nombre_usuario, email):
+        return client.post(
+            "/api/v1/auth/register",
+            json={
+                "nombre_usuario": nombre_usuario,
+                "email": email,
+                "password": "StrongPass1!",
+                "nombres": "Dup",
+                "apellidos": "User",
+                "sexo": "M",
+                "fecha_nac": date(1990, 1, 1).isoformat(),
+            },
+        )
+
+    assert registrar("dupuser", "dup@example.com").status_code == 201
+
+    with contar_sentencias() as sentencias:
+        por_email = registrar("otro", "DUP@example.com")
+    # El índice único decide: sin volver a buscar el email tras el INSERT fallido
+    assert not any("WHERE usuarios.email" in s for s in sentencias)
+    assert por_email.status_code == 400
+    assert por_email.json()["detail"] == "El email ingresado ya está registrado"
+
+    por_nombre = registrar("dupuser", "otro@example.com")
+    assert por_nombre.status_code == 400
+    assert por_nombre.json()["detail"] == "El nombre de usuario ingresado ya está registrado"
+
+
+def test_register_sends_verification_email_as_background_task(client, db_session: Session, monkeypatch):
+    _seed_minimal_auth_data(db_session)
+    enviados = []
+
+    def enviar(*, to_email, verification_link):
+        enviados.append((to_email, verification_link))
+        return True
+
+    monkeypatch.setattr(settings, "email_backend", "smtp")
+    monkeypatch.setattr(settings, "email_send_in_background", True)
+    monkeypatch.setattr(EmailService, "send_email_verification", staticmethod(enviar))
+
+    register = client.post(
+        "/api/v1/auth/register",
+        json={
+            "nombre_usuario": "bguser",
+            "email": "bguser@example.com",
+            "password": "StrongPass1!",
+            "nombres": "Bg",
+            "apellidos": "User",
+            "sexo": "F",
+            "fecha_nac": date(1990, 1, 1).isoformat(),
+        },
+    )
+    assert register.status_code == 201
+    data = register.json()
+    assert data["message"].startswith("Te registraste correctamente. Te enviamos un email")
+    # TestClient ejecuta las tareas de fondo antes de devolver la respuesta
+    assert enviados == [("bguser@example.com", data["verification_link"])]
+
+
 def test_email_service_sends_smtp_with_brevo_style_config(monkeypatch):
     sent = {}
 
@@ -131,6 +131,16 @@ def test_equipo_codes_backfill_and_lookup_endpoints(client, db_session: Session)
     assert by_code.status_code == 200
     assert by_code.json()["id"] == equipo.id
 
+    listado = client.get("/api/v1/equipos/", headers={"Authorization": f"Bearer {token}"})
+    assert listado.status_code == 200
+    assert listado.headers["content-type"] == "application/json"
+    assert listado.json()["total"] == 1
+    assert listado.json()["equipos"][0]["codigo_equipo"] == equipo.codigo_equipo
+
+    tipos = client.get("/api/v1/equipos/tipos-barril", headers={"Authorization": f"Bearer {token}"})
+    assert tipos.status_code == 200
+    assert tipos.json()[0]["capacidad"] == 30
+
 
 def test_device_session_accepts_equipo_id_ext_or_code(client, db_session: Session):
     from app.models.sales_point import PuntoVenta, Equipo
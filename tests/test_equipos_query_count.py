@@ -0,0 +1,123 @@
+from sqlmodel import Session
+
+
+def _seed_equipos(session: Session, cantidad: int) -> int:
+    from app.models.beer import Cerveza
+    from app.models.sales_point import Equipo, PuntoVenta, TipoBarril, TipoEstadoEquipo
+    from app.models.tenant import Tenant
+
+    session.add(TipoEstadoEquipo(id=1, estado="Activo", permite_ventas=True))
+    session.add(TipoBarril(id=1, capacidad=30, nombre="30L"))
+    tenant = Tenant(nombre="Tenant Q", slug="tenant-q")
+    session.add(tenant)
+    session.commit()
+    session.refresh(tenant)
+
+    pv = PuntoVenta(nombre="PV", calle="Calle", altura=1, localidad="Loc", provincia="Prov", tenant_id=tenant.id)
+    cerveza = Cerveza(nombre="IPA", tipo="IPA", proveedor="Prov", creado_por=1)
+    session.add(pv)
+    session.add(cerveza)
+    session.commit()
+
+    for i in range(cantidad):
+        session.add(
+            Equipo(
+                nombre_equipo=f"Equipo {i}",
+                id_estado_equipo=1,
+                id_barril=1,
+                capacidad_actual=5,
+                id_punto_de_venta=pv.id,
+                id_cerveza=cerveza.id,
+                tenant_id=tenant.id,
+            )
+        )
+    session.commit()
+    return tenant.id
+
+
+def test_listado_equipos_consultas_constantes(contar_sentencias, db_session: Session):
+    from app.services.equipos import EquipoService
+
+    tenant_id = _seed_equipos(db_session, 5)
+    db_session.expunge_all()
+
+    with contar_sentencias() as sentencias:
+        equipos = EquipoService.get_equipos_with_details(db_session, tenant_id=tenant_id)
+        bajo_stock = EquipoService.get_equipos_con_stock_bajo(db_session, 20)
+
+    assert len(equipos) == 5
+    assert all(e.cerveza_actual is not None and e.barril.capacidad == 30 for e in equipos)
+    assert len(bajo_stock) == 5
+    assert len(sentencias) <= 2
+
+
+def test_cambio_de_estado_actualiza_puede_vender(db_session: Session):
+    from sqlmodel import select
+
+    from app.models.sales_point import Equipo, TipoEstadoEquipo
+    from app.services.equipos import EquipoService
+
+    _seed_equipos(db_session, 1)
+    db_session.add(TipoEstadoEquipo(id=2, estado="Mantenimiento", permite_ventas=False))
+    db_session.commit()
+    equipo = db_session.exec(select(Equipo)).one()
+    assert equipo.puede_vender is True
+
+    detalle = EquipoService.toggle_estado_equipo(db_session, equipo.id, 2, user_id=1)
+    assert detalle.puede_vender is False
+    db_session.refresh(equipo)
+    assert equipo.puede_vender is False
+
+    EquipoService.toggle_estado_equipo(db_session, equipo.id, 1, user_id=1)
+    db_session.refresh(equipo)
+    assert equipo.puede_vender is True
+
+
+def test_from_orm_trusted_lee_campos_y_convierte_uuid(db_session: Session):
+    from app.models.sales_point import TipoBarril, TipoBarrilRead
+
+    _seed_equipos(db_session, 0)
+    barril = db_session.get(TipoBarril, 1)
+
+    leido = TipoBarrilRead.from_orm_trusted(barril)
+    assert leido.id == 1
+    assert leido.capacidad == 30
+    assert leido.id_ext == str(barril.id_ext)
+    assert TipoBarrilRead.from_orm_trusted(barril) == leido
+
+
+def test_reference_cache_evita_consultas_repetidas(contar_sentencias, db_session: Session):
+    from app.services import reference_cache
+
+    _seed_equipos(db_session, 0)
+
+    with contar_sentencias() as sentencias:
+        primera = reference_cache.listar_tipos_barril(db_session)
+        segunda = reference_cache.listar_tipos_barril(db_session)
+        assert reference_cache.get_metodo_pago_id(db_session, "Inexistente") is None
+        assert reference_cache.get_metodo_pago_id(db_session, "Inexistente") is None
+
+    assert primera == segunda and primera[0].capacidad == 30
+    # La lista se consulta una vez; los métodos inexistentes no se cachean
+    assert len(sentencias) == 3
+
+
+def test_from_orm_trusted_lee_modelos_pydantic_y_rechaza_origenes_sin_campos():
+    import pytest
+    from pydantic import BaseModel
+
+    from app.models.sales_point import TipoBarrilRead
+
+    class BarrilPlano(BaseModel):
+        id: int
+        id_ext: str
+        capacidad: int
+
+    leido = TipoBarrilRead.from_orm_trusted(BarrilPlano(id=2, id_ext="abc", capacidad=50))
+    assert (leido.id, leido.id_ext, leido.capacidad) == (2, "abc", 50)
+
+    class SinCampos:
+        pass
+
+    with pytest.raises(TypeError):
+        TipoBarrilRead.from_orm_trusted(SinCampos())
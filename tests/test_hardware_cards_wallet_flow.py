@@ -186,7 +186,7 @@ def test_device_session_wallet_creates_sale_and_debits_wallet(client, db_session
     )
     assert bind.status_code == 201
 
-    wallet = Wallet(tenant_id=tenant.id, owner_type="user", owner_user_id=customer.id, balance=Decimal("1000.00"), activo=True)
+    wallet = Wallet(tenant_id=tenant.id, owner_type="user", owner_user_id=customer.id, balance_cents=100000, activo=True)
     db_session.add(wallet)
     db_session.commit()
     db_session.refresh(wallet)
@@ -294,6 +294,8 @@ def test_external_payment_confirm_and_claim_flow(client, db_session: Session):
     pago = db_session.exec(select(Pago).where(Pago.id_transaccion_proveedor == "tx-123")).first()
     assert pago is not None
     assert pago.estado == TipoEstadoPago.APROBADO
+    assert pago.monto_centavos > 0
+    assert pago.monto is None
 
     tx = db_session.exec(select(TransaccionPuntos).where(TransaccionPuntos.id_usuario == customer.id)).first()
     assert tx is not None
@@ -325,3 +327,56 @@ def test_external_payment_confirm_and_claim_flow(client, db_session: Session):
         headers={"Authorization": f"Bearer {token_customer}"},
     )
     assert claim.status_code == 200
+
+
+def test_wallet_txn_bulk_append(db_session: Session):
+    from sqlmodel import func
+
+    from app.models.wallet import Wallet, WalletTxn
+
+    wallet = Wallet(owner_type="card")
+    db_session.add(wallet)
+    db_session.commit()
+    db_session.refresh(wallet)
+
+    txns = [
+        WalletTxn(
+            wallet_id=wallet.id,
+            direction="credit",
+            amount_cents=150,
+            balance_before_cents=150 * i,
+            balance_after_cents=150 * (i + 1),
+            reference_type="import",
+            reference_id=f"lote-{i}",
+        )
+        for i in range(20)
+    ]
+    assert WalletTxn.bulk_append(db_session, txns, use_copy=True) == 20
+    db_session.commit()
+
+    total = db_session.exec(select(func.sum(WalletTxn.amount_cents)).where(WalletTxn.wallet_id == wallet.id)).one()
+    assert total == 3000
+
+
+def test_wallet_idempotency_key_deduplicates_on_insert(db_session: Session):
+    from app.models.wallet import Wallet, WalletTxn
+    from app.services.wallets import WalletService
+
+    wallet = Wallet(owner_type="card", balance_cents=1000)
+    db_session.add(wallet)
+    db_session.commit()
+    db_session.refresh(wallet)
+
+    kwargs = dict(wallet_id=wallet.id, reference_type="test", reference_id="1", created_by=None)
+    first = WalletService.debit(db_session, amount=Decimal("2.00"), idempotency_key="k-1", **kwargs)
+    db_session.commit()
+    retry = WalletService.debit(db_session, amount=Decimal("2.00"), idempotency_key="k-1", **kwargs)
+    db_session.commit()
+    credit = WalletService.credit(db_session, amount=Decimal("1.00"), idempotency_key="k-1", **kwargs)
+    db_session.commit()
+
+    assert retry.id == first.id
+    assert credit.id != first.id
+    db_session.refresh(wallet)
+    assert wallet.balance == Decimal("9.00")
+    assert len(db_session.exec(select(WalletTxn).where(WalletTxn.wallet_id == wallet.id)).all()) == 2
@@ -159,3 +159,51 @@ def test_calcular_precio_not_found_base_price(client):
     resp = client.post("/api/v1/pricing/calcular", json=calc_payload)
     assert resp.status_code == 404
     assert resp.json()["detail"] == "No se encontró un precio aplicable"
+
+
+def test_lote_reglas_aplica_prioridad_y_vigencia():
+    from app.models.base import TipoPrioridadRegla
+    from app.models.pricing import CalculadoraPrecios, LoteReglasPrecio, ReglaDePrecio
+
+    now = datetime.utcnow()
+    fin = now + timedelta(days=1)
+    reglas = [
+        ReglaDePrecio(nombre="Baja", multiplicador=Decimal("0.50"), prioridad=TipoPrioridadRegla.BAJA,
+                      esta_activo=True, fecha_hora_inicio=now - timedelta(hours=1), fecha_hora_fin=fin, creado_por=1),
+        ReglaDePrecio(nombre="Fija", precio=Decimal("80.00"), multiplicador=Decimal("1.00"),
+                      prioridad=TipoPrioridadRegla.ALTA, esta_activo=True,
+                      fecha_hora_inicio=now - timedelta(hours=1), fecha_hora_fin=fin, creado_por=1),
+        ReglaDePrecio(nombre="Inactiva", multiplicador=Decimal("0.10"), prioridad=TipoPrioridadRegla.ALTA,
+                      esta_activo=False, fecha_hora_inicio=now - timedelta(hours=1), fecha_hora_fin=fin, creado_por=1),
+        ReglaDePrecio(nombre="Futura", multiplicador=Decimal("0.10"), prioridad=TipoPrioridadRegla.MEDIA,
+                      esta_activo=True, fecha_hora_inicio=now + timedelta(hours=2), fecha_hora_fin=fin, creado_por=1),
+    ]
+
+    lote = LoteReglasPrecio(reglas)
+    assert len(lote) == 4
+    assert lote.nombres[:2] == ("Fija", "Inactiva")
+
+    calculo = CalculadoraPrecios.aplicar_reglas_lote(Decimal("100.00"), lote, now)
+    assert calculo.reglas_aplicadas == ["Fija", "Baja"]
+    # El multiplicador de menor prioridad se aplica después y reemplaza el precio fijo
+    assert calculo.precio_final == Decimal("50.00")
+    assert calculo.descuento_aplicado == Decimal("50.00")
+    assert CalculadoraPrecios.aplicar_reglas(Decimal("100.00"), reglas, now) == calculo
+
+
+def test_aplicar_reglas_redondeo_entero_coincide_con_decimal():
+    from app.models.base import TipoPrioridadRegla
+    from app.models.pricing import CalculadoraPrecios, ReglaDePrecio
+
+    now = datetime.utcnow()
+    reglas = [
+        ReglaDePrecio(nombre=f"M{i}", multiplicador=Decimal(m), prioridad=TipoPrioridadRegla.MEDIA,
+                      esta_activo=True, fecha_hora_inicio=now - timedelta(hours=1),
+                      fecha_hora_fin=now + timedelta(hours=1), creado_por=1)
+        for i, m in enumerate(["0.85", "1.15", "0.95"])
+    ]
+
+    calculo = CalculadoraPrecios.aplicar_reglas(Decimal("33.33"), reglas, now)
+    esperado = (Decimal("33.33") * Decimal("0.85") * Decimal("1.15") * Decimal("0.95")).quantize(Decimal("0.01"), rounding="ROUND_HALF_UP")
+    assert calculo.precio_final == esperado
+    assert calculo.multiplicador_total == Decimal("0.85") * Decimal("1.15") * Decimal("0.95")
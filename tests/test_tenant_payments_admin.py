@@ -82,6 +82,8 @@ def test_admin_can_register_payment_and_list_payments(client, db_session: Sessio
     payments = listed.json()["payments"]
     assert len(payments) == 1
     assert payments[0]["amount_centavos"] == 10000
+    assert payments[0]["id"] == created.json()["payment_id"]
+    assert created.json()["period_end"] is not None
 
     db_session.expire_all()
     refreshed = db_session.get(Tenant, tenant.id)
@@ -89,3 +91,95 @@ def test_admin_can_register_payment_and_list_payments(client, db_session: Sessio
     assert refreshed.activo is True
     assert refreshed.suscripcion_estado == "activa"
     assert refreshed.suscripcion_hasta is not None
+
+
+def test_admin_list_payments_en_lotes(client, db_session: Session, monkeypatch):
+    from datetime import datetime, timedelta
+
+    from app.models.tenant import Tenant, TenantPayment
+    from app.routers import admin as admin_router
+
+    monkeypatch.setattr(admin_router, "_PAYMENTS_BATCH", 2)
+    _seed_roles_and_level(db_session)
+    admin = _create_verified_user(db_session, email="admin-lotes@example.com", password="StrongPass1!", role_tipo="admin")
+    tenant = Tenant(nombre="T Lotes", slug="t-lotes", creado_por=admin.id)
+    vacio = Tenant(nombre="T Vacio", slug="t-vacio", creado_por=admin.id)
+    db_session.add_all([tenant, vacio])
+    db_session.commit()
+    base = datetime(2026, 1, 1)
+    db_session.add_all([
+        TenantPayment(tenant_id=tenant.id, amount_centavos=100 * i, currency="ARS", status="paid", paid_at=base + timedelta(days=i))
+        for i in range(1, 6)
+    ])
+    db_session.commit()
+
+    login = client.post("/api/v1/auth/login-json", json={"email": admin.email, "password": "StrongPass1!"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    listed = client.get(f"/api/v1/admin/tenants/{tenant.id}/payments", params={"limit": 4}, headers=headers)
+    assert listed.status_code == 200
+    assert [p["amount_centavos"] for p in listed.json()["payments"]] == [500, 400, 300, 200]
+    assert client.get(f"/api/v1/admin/tenants/{vacio.id}/payments", headers=headers).json() == {"payments": []}
+    assert client.get("/api/v1/admin/tenants/999999/payments", headers=headers).status_code == 404
+
+
+def test_admin_update_payment_con_update_returning(client, db_session: Session):
+    from app.models.tenant import Tenant, TenantPayment
+
+    _seed_roles_and_level(db_session)
+    admin = _create_verified_user(db_session, email="admin-patch@example.com", password="StrongPass1!", role_tipo="admin")
+    tenant = Tenant(nombre="T Patch", slug="t-patch", creado_por=admin.id)
+    db_session.add(tenant)
+    db_session.commit()
+    payment = TenantPayment(tenant_id=tenant.id, amount_centavos=100, currency="ARS", status="pending")
+    db_session.add(payment)
+    db_session.commit()
+    db_session.refresh(payment)
+
+    login = client.post("/api/v1/auth/login-json", json={"email": admin.email, "password": "StrongPass1!"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    resp = client.patch(
+        f"/api/v1/admin/payments/{payment.id}",
+        json={"status": " Failed ", "failure_reason": "rechazado"},
+        headers=headers,
+    )
+    assert resp.status_code == 204, resp.text
+    db_session.expire_all()
+    refreshed = db_session.get(TenantPayment, payment.id)
+    assert refreshed.status == "failed"
+    assert refreshed.failure_reason == "rechazado"
+
+    assert client.patch(f"/api/v1/admin/payments/{payment.id}", json={}, headers=headers).status_code == 204
+    assert client.patch("/api/v1/admin/payments/999999", json={"notes": "x"}, headers=headers).status_code == 404
+    assert client.patch("/api/v1/admin/payments/999999", json={}, headers=headers).status_code == 404
+    assert client.patch("/api/v1/admin/users/999999/active", json={"activo": False}, headers=headers).status_code == 404
+    assert client.patch("/api/v1/admin/tenants/999999/active", json={"activo": False}, headers=headers).status_code == 404
+
+
+def test_admin_set_subscription_actualiza_solo_campos_enviados(client, db_session: Session):
+    from app.models.tenant import Tenant
+
+    _seed_roles_and_level(db_session)
+    admin = _create_verified_user(db_session, email="admin-subs@example.com", password="StrongPass1!", role_tipo="admin")
+    tenant = Tenant(nombre="T Subs", slug="t-subs", creado_por=admin.id, suscripcion_plan="mensual", suscripcion_moneda="ARS")
+    db_session.add(tenant)
+    db_session.commit()
+
+    login = client.post("/api/v1/auth/login-json", json={"email": admin.email, "password": "StrongPass1!"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    resp = client.patch(
+        f"/api/v1/admin/tenants/{tenant.id}/subscription",
+        json={"suscripcion_plan": "  ", "suscripcion_moneda": " usd ", "suscripcion_precio_centavos": 2500},
+        headers=headers,
+    )
+    assert resp.status_code == 204, resp.text
+    db_session.expire_all()
+    refreshed = db_session.get(Tenant, tenant.id)
+    assert refreshed.suscripcion_plan == "mensual"
+    assert refreshed.suscripcion_moneda == "USD"
+    assert refreshed.suscripcion_precio_centavos == 2500
+
+    assert client.patch("/api/v1/admin/tenants/999999/subscription", json={"suscripcion_periodo_dias": 15}, headers=headers).status_code == 404
+    assert client.patch("/api/v1/admin/tenants/999999/subscription", json={}, headers=headers).status_code == 404
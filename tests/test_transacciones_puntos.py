@@ -0,0 +1,253 @@
+from sqlmodel import Session
+
+
+def _seed_usuario(session: Session) -> int:
+    from app.models.user_extended import Usuario
+
+    user = Usuario(codigo_cliente="TXPUNTOS000000000001", nombres="Puntos", apellidos="Tester")
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user.id
+
+
+def test_saldo_db_coincide_con_calculo_en_memoria(db_session: Session):
+    from sqlmodel import select
+
+    from app.models.transactions import GestorTransaccionesPuntos, TransaccionPuntos
+
+    user_id = _seed_usuario(db_session)
+    assert GestorTransaccionesPuntos.saldo_db(db_session, user_id) == 0
+
+    saldo = 0
+    for ganados, canjeados in [(50, 0), (30, 0), (0, 45), (10, 0)]:
+        db_session.add(
+            TransaccionPuntos(
+                id_usuario=user_id,
+                puntos_ganados=ganados,
+                puntos_canjeados=canjeados,
+                saldo_anterior=saldo,
+                saldo_posterior=saldo + ganados - canjeados,
+                tipo_transaccion="venta" if ganados else "canje",
+            )
+        )
+        saldo += ganados - canjeados
+    db_session.commit()
+
+    transacciones = db_session.exec(select(TransaccionPuntos).where(TransaccionPuntos.id_usuario == user_id)).all()
+    assert GestorTransaccionesPuntos.calcular_saldo(transacciones) == 45
+    assert GestorTransaccionesPuntos.calcular_saldo(iter(transacciones)) == 45
+    resultado = db_session.exec(select(TransaccionPuntos).where(TransaccionPuntos.id_usuario == user_id))
+    assert GestorTransaccionesPuntos.calcular_saldo(resultado) == 45
+    assert GestorTransaccionesPuntos.saldo_db(db_session, user_id) == 45
+
+
+def test_points_service_actualiza_saldo_cacheado(db_session: Session):
+    from datetime import datetime, timedelta
+    from decimal import Decimal
+
+    from app.models.points import ReglaConversionPuntos
+    from app.models.transactions import GestorTransaccionesPuntos
+    from app.models.user_extended import Usuario
+    from app.services.points import PointsService
+
+    user_id = _seed_usuario(db_session)
+    db_session.add(
+        ReglaConversionPuntos(
+            monto_minimo=Decimal("0"),
+            puntos_por_peso=Decimal("1"),
+            activo=True,
+            fecha_inicio=datetime.utcnow() - timedelta(days=1),
+        )
+    )
+    db_session.commit()
+
+    venta = PointsService.acreditar_venta(db_session, id_usuario=user_id, id_venta=1, monto=Decimal("120"))
+    canje = PointsService.debitar_canje(db_session, id_usuario=user_id, id_canje=1, puntos_canjeados=20)
+    db_session.commit()
+
+    assert (venta.saldo_anterior, venta.saldo_posterior) == (0, 120)
+    assert (canje.saldo_anterior, canje.saldo_posterior) == (120, 100)
+    assert db_session.get(Usuario, user_id).puntaje_cache == 100
+    assert GestorTransaccionesPuntos.saldo_db(db_session, user_id) == 100
+
+
+def test_debitar_canje_sin_saldo_suficiente_no_modifica_nada(db_session: Session):
+    import pytest
+
+    from app.models.user_extended import Usuario
+    from app.services.points import PointsService
+
+    user_id = _seed_usuario(db_session)
+    PointsService.aplicar_delta_saldo(db_session, user_id, 30)
+    db_session.commit()
+
+    with pytest.raises(ValueError, match="Puntos insuficientes"):
+        PointsService.debitar_canje(db_session, id_usuario=user_id, id_canje=1, puntos_canjeados=31)
+    db_session.rollback()
+
+    assert db_session.get(Usuario, user_id).puntaje_cache == 30
+
+
+def test_crear_transacciones_bulk_inserta_todas_las_filas(db_session: Session):
+    from app.models.transactions import GestorTransaccionesPuntos, TransaccionPuntosCreate
+
+    user_id = _seed_usuario(db_session)
+    creates = [
+        TransaccionPuntosCreate(
+            id_usuario=user_id,
+            puntos_ganados=10,
+            saldo_anterior=i * 10,
+            saldo_posterior=(i + 1) * 10,
+            tipo_transaccion="bono",
+        )
+        for i in range(25)
+    ]
+    GestorTransaccionesPuntos.crear_transacciones_bulk(db_session, creates)
+    db_session.commit()
+
+    assert GestorTransaccionesPuntos.saldo_db(db_session, user_id) == 250
+
+
+def test_transacciones_de_usuario_filtra_por_rango(db_session: Session):
+    from datetime import datetime, timedelta
+
+    from app.models.transactions import TransaccionPuntos
+    from app.services.transactions import TransactionService
+
+    user_id = _seed_usuario(db_session)
+    base = datetime(2026, 1, 1)
+    for dias in range(5):
+        db_session.add(
+            TransaccionPuntos(
+                id_usuario=user_id,
+                puntos_ganados=1,
+                saldo_anterior=dias,
+                saldo_posterior=dias + 1,
+                fecha=base + timedelta(days=dias),
+                tipo_transaccion="venta",
+            )
+        )
+    db_session.commit()
+
+    todas = TransactionService.transacciones_de_usuario(db_session, user_id)
+    assert [t.saldo_posterior for t in todas] == [5, 4, 3, 2, 1]
+
+    rango = TransactionService.transacciones_de_usuario(
+        db_session, user_id, fecha_inicio=base + timedelta(days=1), fecha_fin=base + timedelta(days=3)
+    )
+    assert [t.saldo_posterior for t in rango] == [4, 3, 2]
+
+
+def test_particion_transacciones_genera_particiones_mensuales():
+    from datetime import date
+
+    from app.models.transactions import ParticionTransacciones
+
+    sql = ParticionTransacciones.crear_sql_particiones("pagos", date(2026, 11, 20), date(2027, 1, 3))
+    assert sql.splitlines() == [
+        "CREATE TABLE IF NOT EXISTS pagos_2026_11 PARTITION OF pagos FOR VALUES FROM ('2026-11-01') TO ('2026-12-01');",
+        "CREATE TABLE IF NOT EXISTS pagos_2026_12 PARTITION OF pagos FOR VALUES FROM ('2026-12-01') TO ('2027-01-01');",
+        "CREATE TABLE IF NOT EXISTS pagos_2027_01 PARTITION OF pagos FOR VALUES FROM ('2027-01-01') TO ('2027-02-01');",
+    ]
+
+    conversion = ParticionTransacciones.crear_sql_conversion("transacciones_puntos", date(2026, 1, 1), date(2026, 1, 1))
+    assert "PARTITION BY RANGE (fecha);" in conversion
+    assert "ADD PRIMARY KEY (id, fecha);" in conversion
+    assert "ALTER SEQUENCE transacciones_puntos_id_seq OWNED BY transacciones_puntos.id;" in conversion
+    assert (
+        "ALTER TABLE transacciones_puntos ADD CONSTRAINT transacciones_puntos_id_usuario_fkey "
+        "FOREIGN KEY (id_usuario) REFERENCES usuarios (id);"
+    ) in conversion
+    assert "REFERENCES canjes (id);" in conversion
+    assert (
+        "CREATE INDEX IF NOT EXISTS idx_trans_solo_ganados ON transacciones_puntos "
+        "(id_usuario, fecha) WHERE puntos_ganados > 0;"
+    ) in conversion
+
+
+def test_pago_create_acepta_monto_legado_en_centavos():
+    import pytest
+    from pydantic import ValidationError
+
+    from app.models.transactions import PagoCreate
+
+    base = {"id_venta": 1, "fecha_venta": "2026-01-01T00:00:00", "id_metodo_pago": 1}
+    assert PagoCreate.model_validate({**base, "monto_centavos": 1500}).monto_centavos == 1500
+    assert PagoCreate.model_validate({**base, "monto": "12.345"}).monto_centavos == 1235
+    with pytest.raises(ValidationError):
+        PagoCreate.model_validate({**base, "monto_centavos": -1})
+    for monto in ("abc", None, "Infinity", "-Infinity", "NaN"):
+        with pytest.raises(ValidationError, match="monto inválido"):
+            PagoCreate.model_validate({**base, "monto": monto})
+
+
+def test_filtrar_transacciones_solo_ganados_y_canjeados(db_session: Session):
+    from app.models.transactions import TransaccionPuntos, TransaccionPuntosFilter
+    from app.services.transactions import TransactionService
+
+    user_id = _seed_usuario(db_session)
+    for ganados, canjeados in [(10, 0), (0, 5), (20, 0)]:
+        db_session.add(
+            TransaccionPuntos(
+                id_usuario=user_id,
+                puntos_ganados=ganados,
+                puntos_canjeados=canjeados,
+                saldo_anterior=100,
+                saldo_posterior=100 + ganados - canjeados,
+                tipo_transaccion="venta" if ganados else "canje",
+            )
+        )
+    db_session.commit()
+
+    ganados = TransactionService.filtrar_transacciones(db_session, user_id, TransaccionPuntosFilter(solo_ganados=True))
+    canjeados = TransactionService.filtrar_transacciones(db_session, user_id, TransaccionPuntosFilter(solo_canjeados=True))
+    assert sorted(t.puntos_ganados for t in ganados) == [10, 20]
+    assert [t.puntos_canjeados for t in canjeados] == [5]
+
+
+def test_aplicar_delta_saldo_invalida_usuario_cacheado_tras_commit(db_session: Session):
+    from app.services import users as users_service
+    from app.services.points import PointsService
+
+    user_id = _seed_usuario(db_session)
+    users_service.UserService.get_user_cached(db_session, user_id)
+    fila_vieja = dict(users_service._usuarios_cache.get(user_id))
+
+    PointsService.aplicar_delta_saldo(db_session, user_id, 10)
+    # Otro request vuelve a cachear la fila vieja antes del commit
+    users_service._usuarios_cache.set(user_id, fila_vieja)
+    db_session.commit()
+
+    assert users_service._usuarios_cache.get(user_id) is None
+
+
+def test_aplicar_delta_saldo_asigna_nivel_inicial_sin_pisar_el_actual(db_session: Session):
+    from app.models.user_extended import Usuario
+    from app.services.points import PointsService
+
+    user_id = _seed_usuario(db_session)
+    assert db_session.get(Usuario, user_id).id_nivel_actual is None
+
+    PointsService.aplicar_delta_saldo(db_session, user_id, 10)
+    db_session.commit()
+    user = db_session.get(Usuario, user_id)
+    db_session.refresh(user)
+    assert user.id_nivel_actual == 1
+
+    user.id_nivel_actual = 2
+    db_session.add(user)
+    db_session.commit()
+    PointsService.aplicar_delta_saldo(db_session, user_id, 10)
+    db_session.commit()
+    db_session.refresh(user)
+    assert user.id_nivel_actual == 2
+
+
+def test_aplicar_delta_saldo_usuario_inexistente(db_session: Session):
+    import pytest
+
+    from app.services.points import PointsService
+
+    with pytest.raises(ValueError, match="Usuario no encontrado"):
+        PointsService.aplicar_delta_saldo(db_session, 999999, 10)
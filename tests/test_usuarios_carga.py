@@ -0,0 +1,267 @@
+from datetime import date
+
+from sqlmodel import Session, text
+
+
+def _seed_usuarios(session: Session, cantidad: int) -> None:
+    from app.models.user_extended import TipoNivelUsuario, TipoRolUsuario
+    from app.services.users import UserService
+
+    session.add(TipoRolUsuario(id=1, tipo="usuario", descripcion="Usuario básico"))
+    session.add(TipoNivelUsuario(id=1, nivel="Bronce", puntaje_min=0, puntaje_max=999999, beneficios=None))
+    session.commit()
+
+    for i in range(cantidad):
+        UserService.create_user(
+            session=session,
+            nombre_usuario=f"carga{i}",
+            email=f"carga{i}@example.com",
+            password="StrongPass1!",
+            nombre="Carga",
+            apellido=f"Usuario {i}",
+            sexo="M",
+            fecha_nacimiento=date(1990, 1, 1),
+            telefono=None,
+        )
+
+
+def test_listado_usuarios_sin_n_mas_1(contar_sentencias, db_session: Session):
+    from app.services.users import UserService
+
+    _seed_usuarios(db_session, 5)
+    db_session.expunge_all()
+
+    with contar_sentencias() as sentencias:
+        usuarios = UserService.get_users(db_session, limit=10)
+        roles = [ur.rol.tipo for u in usuarios for ur in u.roles]
+        niveles = [u.id_nivel_actual for u in usuarios]
+        metodos = [m for u in usuarios for m in u.metodos_pago]
+
+    assert len(usuarios) == 5
+    assert roles == ["usuario"] * 5
+    assert niveles == [1] * 5
+    assert metodos == []
+    # usuarios, roles y métodos de pago
+    assert len(sentencias) == 3
+
+
+def test_bulk_create_referidos_en_lotes(contar_sentencias, db_session: Session, monkeypatch):
+    from sqlmodel import func, select
+
+    from app.models.user_extended import Referido
+    from app.services import referidos
+    from app.services.referidos import ReferidoService
+
+    monkeypatch.setattr(referidos, "TAMANO_LOTE_REFERIDOS", 4)
+    with contar_sentencias() as sentencias:
+        total = ReferidoService.bulk_create_referidos(
+            db_session,
+            ({"codigo": f"REF-{i:04d}", "puntos_otorgados": 50} for i in range(10)),
+        )
+    db_session.commit()
+
+    assert total == 10
+    assert len([s for s in sentencias if s.startswith("INSERT INTO referidos")]) == 3
+    assert db_session.exec(select(func.count()).select_from(Referido)).one() == 10
+    referido = db_session.exec(select(Referido).where(Referido.codigo == "REF-0003")).one()
+    assert referido.estado == "pendiente" and referido.id_ext is not None
+
+
+def test_listado_usuarios_rapido_por_api(client, db_session: Session):
+    from app.models.user_extended import TipoNivelUsuario, TipoRolUsuario, Usuario
+    from app.services.users import UserService
+
+    db_session.add(TipoRolUsuario(id=1, tipo="administrador", descripcion="Admin"))
+    db_session.add(TipoNivelUsuario(id=1, nivel="Bronce", puntaje_min=0, puntaje_max=999999, beneficios=None))
+    db_session.commit()
+    for i in range(3):
+        user = UserService.create_user(
+            session=db_session,
+            nombre_usuario=f"rapido{i}",
+            email=f"rapido{i}@example.com",
+            password="StrongPass1!",
+            nombre="Rapido",
+            apellido=f"Usuario {i}",
+            sexo="F",
+            fecha_nacimiento=date(1990, 1, 1),
+            telefono=None,
+        )
+        user.verificado = True
+        db_session.add(user)
+    db_session.commit()
+
+    login = client.post("/api/v1/auth/login-json", json={"email": "rapido0@example.com", "password": "StrongPass1!"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    res = client.get("/api/v1/users/?skip=1&limit=5", headers=headers)
+    assert res.status_code == 200
+    data = res.json()
+    assert data["total"] == 3
+    assert [u["nombre_usuario"] for u in data["users"]] == ["rapido1", "rapido2"]
+    esperado = db_session.get(Usuario, data["users"][0]["id"])
+    assert data["users"][0]["id_ext"] == str(esperado.id_ext)
+    assert data["users"][0]["sexo"] == "F"
+
+
+
+def test_historiales_write_only_se_consultan_con_limit(db_session: Session):
+    from sqlmodel import select
+
+    from app.models.transactions import TransaccionPuntos
+    from app.models.user_extended import Usuario
+
+    _seed_usuarios(db_session, 1)
+    usuario = db_session.exec(select(Usuario).where(Usuario.nombre_usuario == "carga0")).one()
+    for i in range(5):
+        db_session.add(
+            TransaccionPuntos(
+                id_usuario=usuario.id,
+                puntos_ganados=10,
+                saldo_anterior=i * 10,
+                saldo_posterior=(i + 1) * 10,
+                tipo_transaccion="bono",
+            )
+        )
+    db_session.commit()
+
+    ultimas = db_session.scalars(usuario.transacciones_puntos.select().limit(2)).all()
+    assert len(ultimas) == 2
+
+
+def test_is_guest_y_can_login_filtran_en_sql(db_session: Session):
+    from sqlmodel import select
+
+    from app.models.user_extended import Usuario
+    from app.services.guests import GuestService
+
+    _seed_usuarios(db_session, 2)
+    guest = GuestService.create_guest_customer(db_session, nombres="Invitado", apellidos="Barra")
+
+    assert guest.is_guest and not guest.can_login
+    guests = db_session.exec(select(Usuario.id).where(Usuario.is_guest)).all()
+    con_login = db_session.exec(select(Usuario.id).where(Usuario.can_login)).all()
+    assert guests == [guest.id]
+    assert len(con_login) == 2 and guest.id not in con_login
+
+
+def test_sync_metodos_pago_upsert_en_una_sentencia(contar_sentencias, db_session: Session):
+    from sqlmodel import select
+
+    from app.models.user_extended import MetodoPagoCreate, TipoMetodoPago, UsuarioMetodoPago
+    from app.services.users import UserService
+
+    _seed_usuarios(db_session, 1)
+    db_session.add(TipoMetodoPago(id=1, metodo_pago="Tarjeta"))
+    db_session.add(TipoMetodoPago(id=2, metodo_pago="Transferencia"))
+    db_session.commit()
+    db_session.add(UsuarioMetodoPago(
+        id_usuario=1, id_metodo_pago=1, proveedor_metodo_pago="mp", token_proveedor="viejo", activo=False
+    ))
+    db_session.commit()
+
+    metodos = [
+        MetodoPagoCreate(id_usuario=1, id_metodo_pago=1, proveedor_metodo_pago="mp", token_proveedor="nuevo"),
+        MetodoPagoCreate(id_usuario=1, id_metodo_pago=2, proveedor_metodo_pago="mp", token_proveedor="repetido"),
+        # Repetido en la misma entrada: queda una sola fila con el último token
+        MetodoPagoCreate(id_usuario=1, id_metodo_pago=2, proveedor_metodo_pago="mp", token_proveedor="otro"),
+    ]
+    with contar_sentencias() as sentencias:
+        assert UserService.sync_payment_methods(db_session, 1, metodos) == 2
+
+    assert len(sentencias) == 1
+    db_session.expire_all()
+    filas = db_session.exec(select(UsuarioMetodoPago).order_by(UsuarioMetodoPago.id_metodo_pago)).all()
+    assert [(f.token_proveedor, f.activo) for f in filas] == [("nuevo", True), ("otro", True)]
+
+
+def test_credenciales_en_tabla_aparte(db_session: Session):
+    from sqlmodel import select
+
+    from app.core.security import verify_password
+    from app.models.user_extended import Usuario, UsuarioCredenciales
+    from app.services.users import UserService
+
+    _seed_usuarios(db_session, 1)
+    usuario = db_session.exec(select(Usuario)).one()
+
+    assert "password_hash" not in Usuario.__table__.c
+    credenciales = db_session.get(UsuarioCredenciales, usuario.id)
+    assert verify_password("StrongPass1!", credenciales.password_hash)
+    assert UserService.authenticate_user(db_session, "carga0", "StrongPass1!") is not None
+    assert db_session.exec(select(Usuario.id).where(Usuario.can_login)).all() == [usuario.id]
+
+
+def test_wallets_de_usuarios_en_una_sentencia(db_session: Session):
+    from sqlmodel import select
+
+    from app.models.tenant import Tenant
+    from app.models.wallet import Wallet
+    from app.services.wallets import WalletService
+
+    _seed_usuarios(db_session, 3)
+    tenant = Tenant(nombre="T1", slug="t1", creado_por=1, activo=True)
+    db_session.add(tenant)
+    db_session.commit()
+    WalletService.get_or_create_user_wallet(db_session, tenant_id=tenant.id, user_id=1)
+
+    assert WalletService.create_user_wallets(db_session, tenant_id=tenant.id, user_ids=[1, 2, 3]) == 2
+    assert WalletService.create_user_wallets(db_session, tenant_id=tenant.id, user_ids=[1, 2, 3]) == 0
+
+    wallets = db_session.exec(select(Wallet).order_by(Wallet.owner_user_id)).all()
+    assert [w.owner_user_id for w in wallets] == [1, 2, 3]
+    assert all(w.balance_cents == 0 and w.activo for w in wallets)
+    assert len({w.id_ext for w in wallets}) == 3
+
+
+def test_auth_context_usuario_y_roles_en_una_consulta(contar_sentencias, db_session: Session):
+    from app.services import role_cache
+    from app.services.users import UserService
+
+    _seed_usuarios(db_session, 1)
+    user_id = UserService.get_user_by_email(db_session, "carga0@example.com").id
+    db_session.expunge_all()
+    UserService.invalidate_all_users()
+    role_cache.invalidar()
+
+    with contar_sentencias() as sentencias:
+        user, roles = UserService.get_auth_context(db_session, user_id)
+        assert (user.id, roles) == (user_id, frozenset({"usuario"}))
+        # Segunda vez: todo desde caché
+        assert UserService.get_auth_context(db_session, user_id)[1] == roles
+    assert len(sentencias) == 1
+    assert UserService.get_auth_context(db_session, 999999) is None
+
+
+def test_hard_delete_usuario_con_referidos_y_ventas(db_session: Session):
+    from decimal import Decimal
+
+    from sqlmodel import select
+
+    from app.models.sales import Venta
+    from app.models.transactions import TransaccionPuntos
+    from app.models.user_extended import Referido, Usuario
+    from app.services.users import UserService
+
+    db_session.exec(text("PRAGMA foreign_keys=ON"))
+    generador = Usuario(codigo_cliente="BORRADO0000000000001", nombres="Genera", apellidos="Dor")
+    referido = Usuario(codigo_cliente="BORRADO0000000000002", nombres="Refe", apellidos="Rido")
+    db_session.add_all([generador, referido])
+    db_session.commit()
+    db_session.add(Referido(
+        id_usuario_generador=generador.id, id_usuario_referido=referido.id, codigo="REF0000001", puntos_otorgados=0
+    ))
+    db_session.add(Venta(
+        id_ext="venta-borrado", cantidad_ml=500, monto_total=Decimal("10"), id_usuario=generador.id
+    ))
+    db_session.add(TransaccionPuntos(
+        id_usuario=generador.id, puntos_ganados=10, saldo_anterior=0, saldo_posterior=10, tipo_transaccion="bono"
+    ))
+    db_session.commit()
+
+    assert UserService.hard_delete_user(db_session, generador.id) is True
+
+    db_session.expire_all()
+    assert db_session.get(Usuario, generador.id) is None
+    assert db_session.exec(select(Referido.id_usuario_generador)).one() is None
+    assert db_session.exec(select(Venta.id_usuario)).one() is None
+    assert db_session.exec(select(TransaccionPuntos)).all() == []